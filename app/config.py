@@ -15,8 +15,3 @@ S3_BUCKET = os.getenv("S3_BUCKET")
 AWS_REGION = os.getenv("AWS_REGION")
 AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
 AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
-
-print("AWS_ACCESS_KEY_ID:", AWS_ACCESS_KEY_ID)
-print("AWS_SECRET_ACCESS_KEY:", AWS_SECRET_ACCESS_KEY)
-print("S3_BUCKET:", S3_BUCKET)
-print("AWS_REGION:", AWS_REGION)
\ No newline at end of file
@@ -7,6 +7,15 @@ class Settings(BaseSettings):
     RAZORPAY_KEY_SECRET: str
     RAZORPAY_WEBHOOK_SECRET: str
 
+    # argon2 (defaults = passlib defaults, so existing hashes don't need a rehash)
+    ARGON2_TIME_COST: int = 2
+    ARGON2_MEMORY_COST: int = 512   # KiB
+    ARGON2_PARALLELISM: int = 2
+
+    # password hashing process pool
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 16     # queued + running
+
     class Config:
         env_file = ".env"
         extra = "ignore"
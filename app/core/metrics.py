@@ -0,0 +1,277 @@
+"""
+Per-request timing, SQL and S3 instrumentation.
+
+MetricsMiddleware opens a RequestStats for every HTTP request (via a
+context variable, which FastAPI copies into the threadpool that runs sync
+endpoints). SQLAlchemy cursor events and botocore hooks add to the
+current request's stats. Each response gets a Server-Timing header and
+the totals are folded into process-wide counters and latency histograms,
+rendered in Prometheus text format by /metrics.
+
+Counters are per worker process; Prometheus sums them across workers.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event
+
+
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+EXCLUDED_PATHS = {"/metrics"}
+
+
+class RequestStats:
+    __slots__ = ("db_queries", "db_ms", "s3_calls", "s3_bytes", "s3_ms")
+
+    def __init__(self):
+        self.db_queries = 0
+        self.db_ms = 0.0
+        self.s3_calls = 0
+        self.s3_bytes = 0
+        self.s3_ms = 0.0
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+# -----------------------------
+# PROCESS-WIDE COUNTERS
+# -----------------------------
+class Registry:
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # (method, route) -> [bucket counts..., +Inf], sum_ms, count
+        self.latency: Dict[Tuple[str, str], list] = {}
+        self.requests: Dict[Tuple[str, str, str], int] = {}
+        self.db_queries: Dict[Tuple[str, str], int] = {}
+        self.db_ms: Dict[Tuple[str, str], float] = {}
+        self.response_bytes: Dict[Tuple[str, str], int] = {}
+        self.s3_calls: Dict[str, int] = {}
+        self.s3_bytes: Dict[str, int] = {}
+
+    def observe(self, method: str, route: str, status: int, elapsed_ms: float,
+                stats: RequestStats, body_bytes: int) -> None:
+        key = (method, route)
+
+        with self.lock:
+            hist = self.latency.get(key)
+            if hist is None:
+                hist = self.latency[key] = [[0] * (len(LATENCY_BUCKETS_MS) + 1), 0.0, 0]
+            hist[0][bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+            hist[1] += elapsed_ms
+            hist[2] += 1
+
+            rkey = (method, route, str(status))
+            self.requests[rkey] = self.requests.get(rkey, 0) + 1
+            self.db_queries[key] = self.db_queries.get(key, 0) + stats.db_queries
+            self.db_ms[key] = self.db_ms.get(key, 0.0) + stats.db_ms
+            self.response_bytes[key] = self.response_bytes.get(key, 0) + body_bytes
+
+    def observe_s3(self, operation: str, nbytes: int) -> None:
+        with self.lock:
+            self.s3_calls[operation] = self.s3_calls.get(operation, 0) + 1
+            self.s3_bytes[operation] = self.s3_bytes.get(operation, 0) + nbytes
+
+
+REGISTRY = Registry()
+
+
+# -----------------------------
+# SQLALCHEMY
+# -----------------------------
+def _finish_query(conn, cursor) -> None:
+    start = conn.info.get("query_start", {}).pop(id(cursor), None)
+    stats = _current.get()
+    if start is not None and stats is not None:
+        stats.db_queries += 1
+        stats.db_ms += (time.perf_counter() - start) * 1000
+
+
+def instrument_engine(engine) -> None:
+
+    # Start times are kept per cursor; a statement that raises never
+    # reaches after_cursor_execute, so handle_error clears its entry.
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", {})[id(cursor)] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        _finish_query(conn, cursor)
+
+    @event.listens_for(engine, "handle_error")
+    def _error(exception_context):
+        cursor = getattr(exception_context.execution_context, "cursor", None)
+        if exception_context.connection is not None and cursor is not None:
+            _finish_query(exception_context.connection, cursor)
+
+
+# -----------------------------
+# S3 (botocore event hooks)
+# -----------------------------
+def _body_size(body) -> int:
+    if isinstance(body, (bytes, bytearray)):
+        return len(body)
+
+    # upload bodies arrive as seekable file objects
+    try:
+        pos = body.tell()
+        end = body.seek(0, 2)
+        body.seek(pos)
+        return end - pos
+    except Exception:
+        return 0
+
+
+def instrument_s3(client) -> None:
+
+    def _before_call(params, context, **kwargs):
+        context["metrics_start"] = time.perf_counter()
+        context["metrics_sent"] = _body_size(params.get("body"))
+
+    def _after_call(parsed, model, context, **kwargs):
+        received = (parsed.get("ContentLength") or 0) if isinstance(parsed, dict) else 0
+        nbytes = received + context.get("metrics_sent", 0)
+
+        REGISTRY.observe_s3(model.name, nbytes)
+
+        stats = _current.get()
+        if stats is not None:
+            stats.s3_calls += 1
+            stats.s3_bytes += nbytes
+            stats.s3_ms += (time.perf_counter() - context.get("metrics_start", time.perf_counter())) * 1000
+
+    client.meta.events.register("before-call.s3", _before_call)
+    client.meta.events.register("after-call.s3", _after_call)
+
+
+# -----------------------------
+# MIDDLEWARE
+# -----------------------------
+def _app_path(scope) -> str:
+    path, root = scope["path"], scope.get("root_path", "")
+    return path[len(root):] if root and path.startswith(root) else path
+
+
+def route_label(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+def server_timing(elapsed_ms: float, stats: RequestStats) -> bytes:
+    parts = [
+        f"app;dur={elapsed_ms:.1f}",
+        f'db;dur={stats.db_ms:.1f};desc="{stats.db_queries} queries"',
+    ]
+    if stats.s3_calls:
+        parts.append(f's3;dur={stats.s3_ms:.1f};desc="{stats.s3_calls} calls"')
+    return ", ".join(parts).encode("latin-1")
+
+
+class MetricsMiddleware:
+    """Pure ASGI, so streaming responses are not buffered."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or _app_path(scope) in EXCLUDED_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        start = time.perf_counter()
+        status = 500
+        body_bytes = 0
+
+        async def send_wrapper(message):
+            nonlocal status, body_bytes
+
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                elapsed = (time.perf_counter() - start) * 1000
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", server_timing(elapsed, stats)))
+                message = {**message, "headers": headers}
+
+            elif message["type"] == "http.response.body":
+                body_bytes += len(message.get("body", b""))
+
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            REGISTRY.observe(
+                scope["method"],
+                route_label(scope),
+                status,
+                (time.perf_counter() - start) * 1000,
+                stats,
+                body_bytes,
+            )
+
+
+# -----------------------------
+# PROMETHEUS TEXT
+# -----------------------------
+def _labels(**labels) -> str:
+    inner = ",".join(
+        f'{k}="{str(v).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+        for k, v in labels.items()
+    )
+    return "{" + inner + "}"
+
+
+def render(extra_gauges: Optional[Dict[str, float]] = None) -> str:
+    r = REGISTRY
+    out = []
+
+    with r.lock:
+        out.append("# HELP http_request_duration_ms Request latency in milliseconds")
+        out.append("# TYPE http_request_duration_ms histogram")
+        for (method, route), (buckets, total, count) in sorted(r.latency.items()):
+            cumulative = 0
+            for bound, n in zip(LATENCY_BUCKETS_MS + ("+Inf",), buckets):
+                cumulative += n
+                out.append(f"http_request_duration_ms_bucket{_labels(method=method, route=route, le=bound)} {cumulative}")
+            out.append(f"http_request_duration_ms_sum{_labels(method=method, route=route)} {total:.3f}")
+            out.append(f"http_request_duration_ms_count{_labels(method=method, route=route)} {count}")
+
+        out.append("# TYPE http_requests_total counter")
+        for (method, route, status), n in sorted(r.requests.items()):
+            out.append(f"http_requests_total{_labels(method=method, route=route, status=status)} {n}")
+
+        out.append("# HELP db_queries_total SQL statements executed, by route")
+        out.append("# TYPE db_queries_total counter")
+        for (method, route), n in sorted(r.db_queries.items()):
+            out.append(f"db_queries_total{_labels(method=method, route=route)} {n}")
+
+        out.append("# TYPE db_query_duration_ms_total counter")
+        for (method, route), ms in sorted(r.db_ms.items()):
+            out.append(f"db_query_duration_ms_total{_labels(method=method, route=route)} {ms:.3f}")
+
+        out.append("# TYPE http_response_bytes_total counter")
+        for (method, route), n in sorted(r.response_bytes.items()):
+            out.append(f"http_response_bytes_total{_labels(method=method, route=route)} {n}")
+
+        out.append("# TYPE s3_calls_total counter")
+        for op, n in sorted(r.s3_calls.items()):
+            out.append(f"s3_calls_total{_labels(operation=op)} {n}")
+
+        out.append("# TYPE s3_bytes_total counter")
+        for op, n in sorted(r.s3_bytes.items()):
+            out.append(f"s3_bytes_total{_labels(operation=op)} {n}")
+
+    for name, value in (extra_gauges or {}).items():
+        out.append(f"# TYPE {name} gauge")
+        out.append(f"{name} {value}")
+
+    return "\n".join(out) + "\n"
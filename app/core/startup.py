@@ -0,0 +1,79 @@
+"""
+Router registration and startup profiling.
+
+Routers are listed by module path and imported when the app is built, so
+each import can be timed. The heavy libraries they use (pandas, numpy,
+PyMuPDF, boto3, razorpay, requests) are lazy modules, see
+app.utils.lazy; once the worker is serving they are warmed in a
+background thread so the first upload does not pay for them.
+"""
+import importlib
+import os
+import sys
+import threading
+import time
+from typing import Dict, List
+
+from app.utils.lazy import is_loaded, load
+
+
+HEAVY_MODULES = [
+    "numpy",
+    "pandas",
+    "fitz",
+    "boto3",
+    "razorpay",
+    "requests",
+]
+
+PRELOAD_HEAVY_MODULES = os.getenv("PRELOAD_HEAVY_MODULES", "1") == "1"
+
+_started = time.perf_counter()
+
+PROFILE: Dict[str, object] = {
+    "routers_ms": {},
+    "preload_ms": {},
+}
+
+
+def include_routers(app, modules: List[str]) -> None:
+    timings = PROFILE["routers_ms"]
+
+    for path in modules:
+        start = time.perf_counter()
+        module = importlib.import_module(path)
+        app.include_router(module.router)
+        timings[path] = round((time.perf_counter() - start) * 1000, 2)
+
+
+def mark_ready() -> None:
+    PROFILE["boot_ms"] = round((time.perf_counter() - _started) * 1000, 2)
+    PROFILE["heavy_loaded_at_boot"] = [m for m in HEAVY_MODULES if is_loaded(m)]
+
+    if PRELOAD_HEAVY_MODULES:
+        threading.Thread(target=_preload, name="preload-heavy-modules", daemon=True).start()
+
+
+def _preload() -> None:
+    for name in HEAVY_MODULES:
+        start = time.perf_counter()
+        try:
+            load(name)
+        except Exception as e:
+            print("PRELOAD ERROR:", name, str(e))
+            continue
+        PROFILE["preload_ms"][name] = round((time.perf_counter() - start) * 1000, 2)
+
+
+def profile_report() -> dict:
+    routers = PROFILE["routers_ms"]
+
+    return {
+        "boot_ms": PROFILE.get("boot_ms"),
+        "routers_total_ms": round(sum(routers.values()), 2),
+        "routers_ms": dict(sorted(routers.items(), key=lambda kv: kv[1], reverse=True)),
+        "heavy_loaded_at_boot": PROFILE.get("heavy_loaded_at_boot", []),
+        "heavy_loaded_now": [m for m in HEAVY_MODULES if is_loaded(m)],
+        "preload_ms": PROFILE["preload_ms"],
+        "modules_loaded": len(sys.modules),
+    }
@@ -21,25 +21,16 @@ def get_current_user(
     db: Session = Depends(get_db)
 ):
 
-    print("AUTH HEADER:", credentials)
-
     token = credentials.credentials
 
-    print("TOKEN:", token)
-
-
     payload = verify_access_token(token)
 
-    print("PAYLOAD:", payload)
-
 
     user = db.query(User).filter(
         User.userid == payload["user_id"]
     ).first()
 
 
-    print("USER FOUND:", user)
-
 
     if not user:
         raise HTTPException(
@@ -48,4 +39,22 @@ def get_current_user(
         )
 
 
-    return user
\ No newline at end of file
+    return user
+
+optional_security = HTTPBearer(auto_error=False)
+
+def get_optional_user_id(
+    credentials: HTTPAuthorizationCredentials = Depends(optional_security)
+):
+    # Public endpoints that only personalise their response: a missing or
+    # bad token means "anonymous", not 401. The id comes straight from the
+    # token; these endpoints never need the User row.
+    if credentials is None:
+        return None
+
+    try:
+        payload = verify_access_token(credentials.credentials)
+    except HTTPException:
+        return None
+
+    return payload["user_id"]
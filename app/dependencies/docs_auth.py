@@ -0,0 +1,25 @@
+import os
+import secrets
+
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPBasic, HTTPBasicCredentials
+
+
+# Basic auth for the API docs and the operational endpoints
+# (/api/startup-profile, /api/metrics, /api/auth/hash-pool).
+security = HTTPBasic()
+
+DOCS_USERNAME = os.getenv("DOCS_USERNAME", "invest")
+DOCS_PASSWORD = os.getenv("DOCS_PASSWORD", "investlive.in")
+
+
+def verify_docs(credentials: HTTPBasicCredentials = Depends(security)):
+    correct_username = secrets.compare_digest(credentials.username, DOCS_USERNAME)
+    correct_password = secrets.compare_digest(credentials.password, DOCS_PASSWORD)
+
+    if not (correct_username and correct_password):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Unauthorized",
+            headers={"WWW-Authenticate": "Basic"},
+        )
@@ -1,6 +1,8 @@
+from sqlalchemy import inspect, text
+
 from app.database import Base, engine
 from app.models.marketdate import MarketDate
-from app.models.marketind import StockData,MarketIndicatorUpload 
+from app.models.marketind import StockData,MarketIndicatorUpload,MarketIndicatorTree
 from app.models.marketindgraph import MktGraph, MktGraphUploads
 from app.models.auth import User
 from app.models.instocktrend import InstockTrendData,Indstocktrendupload
@@ -20,7 +22,7 @@ from app.models.news import News,MarketNews,Company
 from app.models.announcement import Announcement
 from app.models.stockpulse import StockPulseData, StockPulseUpload
 from app.models.stocktrack import StockTrack,StockTrackUpload
-from app.models.heatmap import Company,House,Industry,Sector,CompanyUpload,HouseUpload,IndustryUpload,SectorUpload
+from app.models.heatmap import Company,House,Industry,Sector,CompanyUpload,HouseUpload,IndustryUpload,SectorUpload,HeatmapTree
 from app.models.portfolio import Stocks_Movements,PortfolioStocs,Stock_MovementsUploadHistory
 from app.models.corpdiary import Bonus,BonusUpload,Split,SplitUpload,Div,DivUpload
 from app.models.newhighlow import FiftyTwoWeekHighLow, MultiYearHighLow
@@ -61,9 +63,83 @@ from app.models.ipotrack import IpoTrack,IpoTrackUpload
 from app.models.action import CorporateActionData, CorporateActionUpload,ResultData, ResultUpload,ManualEntryUpload
 from app.models.cart import Cart
 from app.models.file import CompanyFile
-from app.models.purchase import PurchaseOrder, PurchasedDocument,PurchaseOrderItem
+from app.models.purchase import PurchaseOrder, PurchasedDocument,PurchaseOrderItem,WebhookEvent
+from app.services import partitions
+
+# Daily snapshot tables that used to be wiped on every upload are now
+# range-partitioned by day; convert existing plain tables in place,
+# dating old rows from their upload records.
+partitions.migrate(engine, Company, "(SELECT max(u.data_date) FROM company_upload u)")
+partitions.migrate(engine, StockTrack, "COALESCE(t.mkt_date, (SELECT max(u.mkt_date) FROM stock_track_uploads u))")
+for DataModel, UploadModel in (
+    (McapGainersLosers, McapGainersLosersUpload),
+    (Upward_DownwardMobile, Upward_DownwardMobileUpload),
+    (Up_DownTrend, Up_DownTrendUpload),
+):
+    partitions.migrate(
+        engine, DataModel,
+        f"(SELECT max(u.data_date) FROM {UploadModel.__tablename__} u WHERE u.group_id = t.group_id)"
+    )
+
 # Base.metadata.drop_all(bind=engine)
 # This creates all tables based on your models
 Base.metadata.create_all(bind=engine)
 
+# ---------------- Changes to existing tables ----------------
+# create_all only creates missing tables; columns and indexes added to a
+# model after its table exists are applied here. Every step is idempotent.
+def add_column(conn, table: str, column: str, ddl: str) -> bool:
+    """Adds the column unless present; True when it was added now."""
+    if column in {c["name"] for c in inspect(conn).get_columns(table)}:
+        return False
+    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {ddl}"))
+    return True
+
+
+def create_indexes(conn, *models):
+    for Model in models:
+        for index in Model.__table__.indexes:
+            index.create(bind=conn, checkfirst=True)
+
+
+with engine.begin() as conn:
+    # Corporate-action / result uploads diff on a hash of each CSV row.
+    # Rows loaded before the column existed get a placeholder hash no file
+    # row can produce, so the first upload replaces them (a one-off full
+    # reload); manual actions (MANUAL_ENTRY_ID set) keep NULL and survive.
+    if add_column(conn, "corporate_actions", "ROW_HASH", '"ROW_HASH" VARCHAR(32)'):
+        conn.execute(text(
+            'UPDATE corporate_actions SET "ROW_HASH" = md5(\'legacy:\' || "ID") '
+            'WHERE "MANUAL_ENTRY_ID" IS NULL'
+        ))
+    if add_column(conn, "corporate_action_results", "row_hash", "row_hash VARCHAR(32)"):
+        conn.execute(text(
+            "UPDATE corporate_action_results SET row_hash = md5('legacy:' || id)"
+        ))
+
+    # the unique hash indexes cannot be built over duplicates; keep the oldest
+    conn.execute(text(
+        'DELETE FROM corporate_actions a USING corporate_actions b '
+        'WHERE a."ROW_HASH" = b."ROW_HASH" AND a."ID" > b."ID"'
+    ))
+    conn.execute(text(
+        "DELETE FROM corporate_action_results a USING corporate_action_results b "
+        "WHERE a.row_hash = b.row_hash AND a.id > b.id"
+    ))
+
+    # The stock-movements upload upserts on isin. The per-row loop it
+    # replaced could insert an ISIN twice; keep the oldest row.
+    conn.execute(text(
+        "DELETE FROM stocks_movements a USING stocks_movements b "
+        "WHERE a.isin = b.isin AND a.id > b.id"
+    ))
+
+    create_indexes(
+        conn,
+        CorporateActionData, ResultData, Stocks_Movements, IPOHeatmapData,
+        PurchasedDocument,
+        PortfolioStocs, Company, StockTrack,
+        User, StockData,
+    )
+
 print("Database initialized successfully in PostgreSQL!")
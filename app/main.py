@@ -1,52 +1,18 @@
-from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.security import HTTPBasic, HTTPBasicCredentials
+from fastapi.security import HTTPBasicCredentials
 from fastapi.openapi.docs import get_swagger_ui_html, get_redoc_html
 from fastapi.staticfiles import StaticFiles
-import secrets
 import os
 
-# =========================
-# IMPORT ROUTERS
-# =========================
-from app.routes.auth import router as auth_router
-from app.routes.ads import router as ads_router
-from app.routes.marketdate import router as marketdate_router
-from app.routes.marketind import router as marketind_router
-from app.routes.marketindgraph import router as marketindgraph_router
-from app.routes.instocktrend import router as indstocktrend_router
-from app.routes.mostvalued import router as mostvaluedhouse_router
-from app.routes.volumetrade import router as volumetrade_router 
-from app.routes.ipo import router as ipo_router
-from app.routes.ipoevents import router as ipo_events_router
-from app.routes.ipotrack import router as ipo_track_router
-from app.routes.snapshot import router as snapshot_router
-from app.routes.curtainraiser import router as curtaonraiser_router
-from app.routes.primarymusings import router as primarymusings_router
-from app.routes.reit import router as reit_router
-from app.routes.ipoheatmap import router as ipo_heatmap_router
-from app.routes.news import router as news_router
-from app.routes.announcement import router as announcement_router
-from app.routes.stockpulse import router as stockpulse_router
-from app.routes.marketpulse import router as marketpulse_route
-from app.routes.stocktrack import router as stocktrack_router
-from app.routes.heatmap import router as heatmap_router
-from app.routes.portfolio import router as stocks_movement_router
-from app.routes.corpdiary import router as corpdiary_router
-from app.routes.newhighlow import router as newhighlow_router
-from app.routes.mcapgainerloser import router as mcapgainerloser_router
-from app.routes.indstocksnapshot_graph import router as indstockgraph_router
-from app.routes.managerrank import router as managerrank_router
-from app.routes.mostvaluedcharts import router as mostvaluedcharts_router
-from app.routes.pricemoving import router as pricemoving_router
-from app.routes.volumemoving import router as volumemoving_router
-from app.routes.actions import router as corporate_action_router
-from app.routes.news_api import router as livenews_router
-from app.routes.files import router as files_router
-from app.routes.cart import router as cart_router
-from app.routes.purchase import router as purchase_router
-from app.routes.webhook import router as webhook_router
+from fastapi.responses import PlainTextResponse
+from app.core.startup import include_routers, mark_ready, profile_report
+from app.core.metrics import MetricsMiddleware, instrument_engine, render
+from app.dependencies.docs_auth import verify_docs
+from app.database import engine
 from fastapi.middleware.gzip import GZipMiddleware
+from app.services import presence
+from app.utils.security import shutdown_pool, pool_stats
 
 # =========================
 # APP INIT (DISABLE DEFAULT DOCS)
@@ -87,24 +53,10 @@ app.add_middleware(
 )
 
 # =========================
-# BASIC AUTH FOR DOCS
+# METRICS (outermost: sees final, compressed response size)
 # =========================
-security = HTTPBasic()
-
-DOCS_USERNAME = os.getenv("DOCS_USERNAME", "invest")
-DOCS_PASSWORD = os.getenv("DOCS_PASSWORD", "investlive.in")
-
-
-def verify_docs(credentials: HTTPBasicCredentials = Depends(security)):
-    correct_username = secrets.compare_digest(credentials.username, DOCS_USERNAME)
-    correct_password = secrets.compare_digest(credentials.password, DOCS_PASSWORD)
-
-    if not (correct_username and correct_password):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Unauthorized",
-            headers={"WWW-Authenticate": "Basic"},
-        )
+instrument_engine(engine)
+app.add_middleware(MetricsMiddleware)
 
 # =========================
 # PROTECTED DOCS
@@ -124,6 +76,48 @@ def custom_redoc(credentials: HTTPBasicCredentials = Depends(verify_docs)):
         title="Investlive ReDoc"
     )
 
+# =========================
+# STARTUP / SHUTDOWN
+# =========================
+@app.on_event("startup")
+async def start_presence_flusher():
+    presence.start()
+
+@app.on_event("startup")
+def startup_profile():
+    mark_ready()
+
+@app.on_event("shutdown")
+async def flush_presence():
+    await presence.stop()
+
+@app.on_event("shutdown")
+def stop_password_hash_pool():
+    shutdown_pool()
+
+# =========================
+# STARTUP PROFILE
+# =========================
+@app.get("/api/startup-profile", include_in_schema=False)
+def startup_profile_report(credentials: HTTPBasicCredentials = Depends(verify_docs)):
+    return profile_report()
+
+# =========================
+# PROMETHEUS METRICS (scrape with the docs basic auth)
+# =========================
+@app.get("/metrics", include_in_schema=False)
+def metrics(credentials: HTTPBasicCredentials = Depends(verify_docs)):
+    hash_pool = pool_stats()
+    return PlainTextResponse(
+        render({
+            "password_hash_pending": hash_pool["pending"],
+            "password_hash_peak_pending": hash_pool["peak_pending"],
+            "password_hash_rejected_total": hash_pool["rejected"],
+            "presence_pending_users": presence.pending_count(),
+        }),
+        media_type="text/plain; version=0.0.4"
+    )
+
 # =========================
 # ROOT
 # =========================
@@ -134,40 +128,47 @@ def read_root():
 # =========================
 # ROUTERS
 # =========================
-app.include_router(auth_router)
-app.include_router(ads_router)
-app.include_router(marketdate_router)
-app.include_router(news_router)
-app.include_router(livenews_router)
-app.include_router(announcement_router)
-app.include_router(marketind_router)
-app.include_router(marketindgraph_router)
-app.include_router(stockpulse_router)
-app.include_router(marketpulse_route)
-app.include_router(stocktrack_router)
-app.include_router(indstocktrend_router)
-app.include_router(indstockgraph_router)
-app.include_router(mostvaluedhouse_router)
-app.include_router(mostvaluedcharts_router)
-app.include_router(newhighlow_router)
-app.include_router(mcapgainerloser_router)
-app.include_router(volumetrade_router)
-app.include_router(heatmap_router)
-app.include_router(stocks_movement_router)
-app.include_router(ipo_router)
-app.include_router(ipo_events_router)
-app.include_router(ipo_track_router)
-app.include_router(snapshot_router)
-app.include_router(curtaonraiser_router)
-app.include_router(primarymusings_router)
-app.include_router(reit_router)
-app.include_router(ipo_heatmap_router)
-app.include_router(managerrank_router)
-app.include_router(corpdiary_router)
-app.include_router(corporate_action_router)
-app.include_router(pricemoving_router)
-app.include_router(volumemoving_router)
-app.include_router(files_router)
-app.include_router(cart_router)
-app.include_router(purchase_router)
-app.include_router(webhook_router)
\ No newline at end of file
+# Imported (and timed) in this order; see /api/startup-profile
+ROUTERS = [
+    "app.routes.auth",
+    "app.routes.ads",
+    "app.routes.marketdate",
+    "app.routes.news",
+    "app.routes.news_api",
+    "app.routes.announcement",
+    "app.routes.marketind",
+    "app.routes.marketindgraph",
+    "app.routes.stockpulse",
+    "app.routes.marketpulse",
+    "app.routes.stocktrack",
+    "app.routes.instocktrend",
+    "app.routes.indstocksnapshot_graph",
+    "app.routes.mostvalued",
+    "app.routes.mostvaluedcharts",
+    "app.routes.newhighlow",
+    "app.routes.mcapgainerloser",
+    "app.routes.volumetrade",
+    "app.routes.heatmap",
+    "app.routes.portfolio",
+    "app.routes.ipo",
+    "app.routes.ipoevents",
+    "app.routes.ipotrack",
+    "app.routes.snapshot",
+    "app.routes.curtainraiser",
+    "app.routes.primarymusings",
+    "app.routes.reit",
+    "app.routes.ipoheatmap",
+    "app.routes.managerrank",
+    "app.routes.corpdiary",
+    "app.routes.actions",
+    "app.routes.pricemoving",
+    "app.routes.volumemoving",
+    "app.routes.files",
+    "app.routes.search",
+    "app.routes.cart",
+    "app.routes.purchase",
+    "app.routes.webhook",
+    "app.routes.dashboard",
+]
+
+include_routers(app, ROUTERS)
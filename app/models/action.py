@@ -8,6 +8,9 @@ class CorporateActionData(Base):
     ID = Column(Integer, primary_key=True, index=True)
     MANUAL_ENTRY_ID = Column(Integer, nullable=True)
 
+    # md5 of the source CSV row; NULL for manual entries
+    ROW_HASH = Column(String(32), unique=True, index=True, nullable=True)
+
     SCRIP_CODE_SYMBOL = Column(String, nullable=False)
     SECURITY_NAME = Column(String, nullable=True)
     COMPANY = Column(String, nullable=False)
@@ -48,6 +51,9 @@ class ResultData(Base):
     scrip_code_symbol = Column(String, nullable=False)
     company = Column(String, nullable=False)
     Result_date = Column(Date)
+
+    # md5 of the source CSV row; NULL for manual entries
+    row_hash = Column(String(32), unique=True, index=True, nullable=True)
    
 class ResultUpload(Base):
     __tablename__ = "result_uploads"
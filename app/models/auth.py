@@ -1,12 +1,18 @@
 # models/auth.py
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Index
 from app.database import Base
 from datetime import datetime
 from sqlalchemy.orm import relationship
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # admin directory: online filter / last-seen window, and the
+        # newest-first keyset ordering
+        Index("ix_users_is_online_last_seen", "is_online", "last_seen"),
+        Index("ix_users_created_at_userid", "created_at", "userid"),
+    )
 
     userid = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), nullable=False)
@@ -1,4 +1,6 @@
-from sqlalchemy import Column, Integer, Numeric, String, SmallInteger, Date, BigInteger
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, Numeric, String, SmallInteger, Date, DateTime, BigInteger, LargeBinary
 from app.database import Base
 
 
@@ -7,8 +9,11 @@ from app.database import Base
 # =========================
 class Company(Base):
     __tablename__ = "company"
+    # one partition per uploaded day, see app.services.partitions
+    __table_args__ = ({"postgresql_partition_by": "RANGE (data_date)"},)
 
     pk_id = Column(BigInteger, primary_key=True, autoincrement=True)
+    data_date = Column(Date, primary_key=True, index=True)
 
     ID = Column(Integer, index=True)
     RANK = Column(Integer, index=True)
@@ -52,7 +57,7 @@ class Company(Base):
 
     TRADE = Column(BigInteger)  # ✅ FIXED
 
-    ISIN = Column(String(45))
+    ISIN = Column(String(45), index=True)
     SEC_ID = Column(String(45))
     ISCCODE = Column(String(45))
 
@@ -252,4 +257,15 @@ class SectorUpload(Base):
     data_date = Column(Date)
     data_type = Column(String(100))
     file_name = Column(String(255))
-    file_path = Column(String(500))
\ No newline at end of file
+    file_path = Column(String(500))
+
+# =========================
+# PRECOMPUTED TREEMAP
+# =========================
+class HeatmapTree(Base):
+    __tablename__ = "heatmap_tree"
+
+    id = Column(Integer, primary_key=True, index=True)
+    built_at = Column(DateTime, default=datetime.utcnow)
+    etag = Column(String(40))
+    payload = Column(LargeBinary)  # orjson bytes, served as-is
@@ -4,6 +4,7 @@ from app.database import Base
 
 # ------------------------------
 # Yearly IPO Summary
+# (rebuilt from IPOHeatmapData on every data upload)
 # ------------------------------
 class IPOHeatmapYear(Base):
     __tablename__ = "ipo_heatmap_yearwise"
@@ -37,7 +38,7 @@ class IPOHeatmapData(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     company = Column(String(255), index=True)
-    iss_open = Column(Date)
+    iss_open = Column(Date, index=True)  # year filters are ranges on this
     offer_price = Column(Float)
     cmp = Column(Float)
     ipo_value = Column(Float)
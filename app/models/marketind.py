@@ -1,8 +1,15 @@
-from sqlalchemy import Column, Integer, String, Float, Date, Numeric
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, Numeric, Index, LargeBinary
 from app.database import Base  
 
 class StockData(Base):
     __tablename__ = "mkt_tbl"
+    __table_args__ = (
+        # latest-date tab listing (ordered by H_ID, ID) and /idx/{idx_id}
+        Index("ix_mkt_tbl_mkt_date_h_id_id", "mkt_date", "H_ID", "ID"),
+        Index("ix_mkt_tbl_idx_id_mkt_date", "IDX_ID", "mkt_date"),
+    )
 
     unique_id = Column(Integer, primary_key=True, index=True)
     name = Column(String(25), nullable=False)
@@ -24,4 +31,14 @@ class MarketIndicatorUpload(Base):
     mkt_date = Column(Date, nullable=False)
 
     file_name = Column(String(255), nullable=False)
-    file_path = Column(String(500), nullable=False)  # stored path or URL   
+    file_path = Column(String(500), nullable=False)  # stored path or URL
+
+
+class MarketIndicatorTree(Base):
+    """/marketindicator/latest/ response for one mkt_date, built at upload."""
+    __tablename__ = "market_indicator_tree"
+
+    mkt_date = Column(Date, primary_key=True)
+    version = Column(Integer, nullable=False)  # upload id that built it
+    built_at = Column(DateTime, default=datetime.utcnow)
+    payload = Column(LargeBinary, nullable=False)  # orjson bytes
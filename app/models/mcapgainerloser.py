@@ -3,6 +3,8 @@ from app.database import Base
 
 class McapGainersLosers(Base):
     __tablename__ = "mcap_gainers_losers"
+    # one partition per data_date, see app.services.partitions
+    __table_args__ = ({"postgresql_partition_by": "RANGE (data_date)"},)
 
     COMPANY = Column(String(25), nullable=True)
     ISIN = Column(String(25), primary_key=True, index=True)
@@ -21,6 +23,7 @@ class McapGainersLosers(Base):
     WKH_52 = Column("52WKH", Numeric(20, 2), nullable=False)
     WKL_52 = Column("52WKL", Numeric(20, 2), nullable=False)
     group_id = Column(String(36), nullable=False, index=True)  # Added group_id
+    data_date = Column(Date, primary_key=True, index=True)
 
 class McapGainersLosersUpload(Base):
     __tablename__ = "mcap_gainers_losers_upload"
@@ -34,6 +37,8 @@ class McapGainersLosersUpload(Base):
     
 class Upward_DownwardMobile(Base):
     __tablename__ = "upward_downward_mobile"
+    # one partition per data_date, see app.services.partitions
+    __table_args__ = ({"postgresql_partition_by": "RANGE (data_date)"},)
 
     COMPANY = Column(String(25), nullable=True)
     ISIN = Column(String(25), primary_key=True, index=True)
@@ -43,6 +48,7 @@ class Upward_DownwardMobile(Base):
     CH_PER = Column(Numeric(20, 2), nullable=False)
     PERDAY = Column(Numeric(20, 2), nullable=False)
     group_id = Column(String(36), nullable=False, index=True)  # Added group_id
+    data_date = Column(Date, primary_key=True, index=True)
 
 class Upward_DownwardMobileUpload(Base):
     __tablename__ = "upward_downward_mobile_upload"
@@ -56,6 +62,8 @@ class Upward_DownwardMobileUpload(Base):
 
 class Up_DownTrend(Base):
     __tablename__ = "up_down_trend"
+    # one partition per data_date, see app.services.partitions
+    __table_args__ = ({"postgresql_partition_by": "RANGE (data_date)"},)
 
     COMPANY = Column(String(25), nullable=True)
     ISIN = Column(String(25), primary_key=True, index=True)
@@ -66,6 +74,7 @@ class Up_DownTrend(Base):
     DMA_245 = Column("245DMA", Numeric(20, 2), nullable=False)
     CH_PER= Column(Numeric(20, 1), nullable=False)
     group_id = Column(String(36), nullable=False, index=True)  # Added group_id
+    data_date = Column(Date, primary_key=True, index=True)
 
 class Up_DownTrendUpload(Base):
     __tablename__ = "up_down_trend_upload"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime,Numeric,Date
+from sqlalchemy import Column, Integer, String, Text, DateTime,Numeric,Date,Index
 from app.database import Base
 from datetime import datetime
 
@@ -8,7 +8,7 @@ class Stocks_Movements(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     company = Column(String(255), nullable=False)
-    isin=Column(String,nullable=False)
+    isin=Column(String,nullable=False,unique=True,index=True)
     Day_1=Column(Numeric(20, 1), nullable=True)
     Day_2=Column(Numeric(20, 1), nullable=True)
     Day_3=Column(Numeric(20, 1), nullable=True)
@@ -22,9 +22,13 @@ class PortfolioStocs(Base):
     id = Column(Integer, primary_key=True, index=True)
     userid = Column(Integer,nullable=False)
     company = Column(String(255), nullable=False)
-    isin=Column(String,nullable=False)
+    isin=Column(String,nullable=False,index=True)
     added_at=Column(DateTime, default=datetime.utcnow, nullable=False)
 
+    __table_args__ = (
+        Index("ix_portfolio_stocks_userid_isin", "userid", "isin"),
+    )
+
 class Stock_MovementsUploadHistory(Base):
     __tablename__ = "stocks_movements_history"
 
@@ -6,6 +6,7 @@ from sqlalchemy import (
     Float,
     DateTime,
     ForeignKey,
+    Index,
     Text
 )
 
@@ -89,6 +90,9 @@ class PurchaseOrder(Base):
     
 class PurchasedDocument(Base):
     __tablename__ = "purchased_documents"
+    __table_args__ = (
+        Index("ix_purchased_documents_user_document", "user_id", "document_id"),
+    )
 
     id = Column(
         Integer,
@@ -192,4 +196,38 @@ class PurchaseOrderItem(Base):
         "PurchaseOrder",
         back_populates="items"
     )
-    
\ No newline at end of file
+    
+
+class WebhookEvent(Base):
+    __tablename__ = "webhook_events"
+
+    id = Column(
+        Integer,
+        primary_key=True,
+        index=True
+    )
+
+    # X-Razorpay-Event-Id (sha256 of the body when the header is missing);
+    # retries of the same event conflict here and are dropped
+    event_id = Column(
+        String(100),
+        unique=True,
+        nullable=False
+    )
+
+    event = Column(String(50), nullable=False)
+
+    razorpay_order_id = Column(
+        String(100),
+        nullable=True,
+        index=True
+    )
+
+    razorpay_payment_id = Column(String(100), nullable=True)
+
+    payload = Column(Text, nullable=True)
+
+    received_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now()
+    )
@@ -3,10 +3,12 @@ from app.database import Base
 
 class StockTrack(Base):
     __tablename__ = "stock_track"
+    # one partition per market date, see app.services.partitions
+    __table_args__ = ({"postgresql_partition_by": "RANGE (mkt_date)"},)
 
-    id = Column("ID", Integer, primary_key=True, index=True)
-    mkt_date = Column(Date, nullable=True)
-    isin = Column("ISIN", String(12), nullable=False)
+    id = Column("ID", Integer, primary_key=True, autoincrement=True, index=True)
+    mkt_date = Column(Date, primary_key=True, index=True)
+    isin = Column("ISIN", String(12), nullable=False, index=True)
 
     # adjust lengths based on real CSV data
     wk52 = Column("WK52", String(12), nullable=True)
@@ -1,14 +1,23 @@
-from typing import Optional
+from typing import List, Optional
 
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException,Form
+from fastapi import APIRouter, UploadFile, File, Depends, HTTPException,Form, Query
 from sqlalchemy.orm import Session
-from datetime import date, datetime
+from datetime import date
 import csv
+import hashlib
 import io
-import re
 from app.database import SessionLocal
 from app.models.action import CorporateActionData, CorporateActionUpload, ResultData, ResultUpload,    ManualEntryUpload
 from sqlalchemy import func, text
+from sqlalchemy.dialects.postgresql import insert
+from app.utils.batch import parse_keys, any_of, group_rows
+from app.services.purpose_parser import (
+    split_purpose_and_value,
+    normalize_purpose,
+    normalize_purpose_value,
+    normalize_company,
+    parse_date
+)
 
 from app.s3_utils import (
     upload_file_to_s3,
@@ -34,63 +43,6 @@ def get_db():
         
         
         
-def normalize_purpose(purpose):
-    purpose = (purpose or "").strip().lower()
-
-    if "bonus" in purpose:
-        return "bonus"
-
-    if "split" in purpose:
-        return "stock split"
-
-    if "dividend" in purpose:
-        return "dividend"
-
-    if "buy back" in purpose or "buyback" in purpose:
-        return "share buyback"
-
-    return purpose
-# -----------------------------
-# DATE PARSER
-# -----------------------------
-def parse_date(date_value):
-
-    if not date_value or str(date_value).strip() in ["", "-"]:
-        return None
-
-    formats = [
-        "%d-%b-%y",
-        "%Y-%m-%d",
-        "%d-%m-%Y",
-        "%d/%m/%Y",
-    ]
-
-    for fmt in formats:
-        try:
-            return datetime.strptime(str(date_value).strip(), fmt).date()
-        except:
-            pass
-
-    return None
-
-
-# -----------------------------
-# COMPANY NORMALIZE
-# -----------------------------
-def normalize_company(name: str):
-
-    if not name:
-        return None
-
-    name = name.strip().lower()
-
-    name = re.sub(r'\b(ltd\.?|limited)\b', '', name)
-
-    name = re.sub(r'\s+', ' ', name).strip()
-
-    return name
-
-
 # -----------------------------
 # GOVERNMENT SKIP RULE
 # -----------------------------
@@ -123,109 +75,29 @@ def normalize_float(value):
 
 
 # -----------------------------
-# PURPOSE SPLITTER
-# -----------------------------
+# ROW HASH (change detection)
 # -----------------------------
-# PURPOSE SPLITTER
-# -----------------------------
-def split_purpose_and_value(text):
-
-    if not text:
-        return None, None, None
-
-    text = str(text)
-    text = re.sub(r"\s+", " ", text).strip()
-
-    # Rights 1:9 @ Premium 91
-    rights_ratio = re.search(
-        r'Rights?\s+(\d+\s*:\s*\d+)\s*@\s*Premium\s+([\d.]+)',
-        text,
-        re.IGNORECASE
-    )
-
-    if rights_ratio:
-        return (
-            "Rights",
-            rights_ratio.group(1).replace(" ", ""),
-            rights_ratio.group(2)
-        )
-
-    # Right Issue of Equity Shares
-    if re.search(
-        r'Right\s+Issue\s+of\s+Equity\s+Shares',
-        text,
-        re.IGNORECASE
-    ):
-        return (
-            "Rights",
-            None,
-            None
-        )
-
-    # Stock Split
-    split_match = re.search(
-        r"From\s+R(?:s|e)\.?\s*([\d.]+).*?To\s+R(?:s|e)\.?\s*([\d.]+)",
-        text,
-        re.IGNORECASE
-    )
-
-    if split_match:
-        return (
-            "Stock Split",
-            f"{split_match.group(1)} to {split_match.group(2)}",
-            None
-        )
-
-    # Bonus only
-    if text.lower() == "bonus":
-        return (
-            "Bonus",
-            None,
-            None
-        )
-
-    # Bonus Ratio
-    bonus_match = re.search(r"(\d+\s*:\s*\d+)", text)
-
-    if bonus_match:
-        return (
-            "Bonus",
-            bonus_match.group(1).replace(" ", ""),
-            None
-        )
-
-    # Dividend / Final Dividend / Special Dividend
-    div_match = re.search(
-        r"^(Final Dividend|Special Dividend|Interim Dividend|Dividend)\s*-\s*R(?:s|e)\.?\s*-?\s*([\d.]+)(?:\s*Per\s*Share)?",
-        text,
-        re.IGNORECASE
-    )
-
-    if div_match:
-        return (
-            div_match.group(1).strip(),
-            div_match.group(2).strip(),
-            None
-        )
-
-    return text.strip(), None, None
-
-def normalize_purpose_value(value):
-
-    if not value:
-        return ""
-
-    value = str(value).strip().lower()
-
-    ratio = re.search(r"(\d+\s*:\s*\d+)", value)
-    if ratio:
-        return ratio.group(1).replace(" ", "")
-
-    number = re.search(r"(\d+(?:\.\d+)?)", value)
-    if number:
-        return str(float(number.group(1)))
-
-    return value
+UPSERT_CHUNK = 1000
+
+def row_hash(row: dict) -> str:
+    raw = "\x1f".join("" if v is None else str(v).strip() for v in row.values())
+    return hashlib.md5(raw.encode("utf-8")).hexdigest()
+
+def hash_rows(rows) -> dict:
+    """
+    hash -> row. Identical rows are all kept (as the full reload did):
+    the n-th repeat is hashed with its ordinal, so it keeps the same hash
+    across uploads.
+    """
+    out = {}
+    seen = {}
+    for row in rows:
+        h = row_hash(row)
+        n = seen[h] = seen.get(h, 0) + 1
+        if n > 1:
+            h = hashlib.md5(f"{h}:{n}".encode("utf-8")).hexdigest()
+        out[h] = row
+    return out
 
 def to_camel_case(text):
     if not text:
@@ -274,22 +146,33 @@ async def upload_csv(
         db.add(upload_record)
 
         # -----------------------------
-        # 4. DELETE OLD DATA ONCE
+        # 4. HASH ROWS, DIFF AGAINST DB
         # -----------------------------
-        db.query(CorporateActionData).delete()
-        db.commit()
+        reader = csv.DictReader(io.StringIO(csv_data))
+
+        file_rows = hash_rows(row for row in reader if any(row.values()))
+
+        existing = {
+            h for (h,) in db.query(CorporateActionData.ROW_HASH)
+            .filter(CorporateActionData.ROW_HASH.isnot(None))
+        }
+
+        # rows gone from (or changed in) today's file; manual entries have no hash
+        removed = existing - file_rows.keys()
+        if removed:
+            db.query(CorporateActionData).filter(
+                CorporateActionData.ROW_HASH.in_(removed)
+            ).delete(synchronize_session=False)
 
         # -----------------------------
-        # 5. PARSE CSV
+        # 5. PARSE ONLY NEW / CHANGED ROWS
         # -----------------------------
-        reader = csv.DictReader(io.StringIO(csv_data))
-
-        inserted = 0
+        records = []
         skipped = 0
 
-        for row in reader:
+        for h, row in file_rows.items():
 
-            if not any(row.values()):
+            if h in existing:
                 continue
 
             # COMPANY
@@ -312,8 +195,9 @@ async def upload_csv(
             purpose_text = row.get("Purpose", "").strip()
             purpose, purpose_value, premium = split_purpose_and_value(purpose_text)
 
-            # INSERT
-            data = CorporateActionData(
+            records.append(dict(
+                ROW_HASH=h,
+
                 SCRIP_CODE_SYMBOL=code,
                 SECURITY_NAME=name,
                 COMPANY=company,
@@ -334,19 +218,28 @@ async def upload_csv(
                 ND_START_DATE=parse_date(row.get("ND Start Date")),
                 ND_END_DATE=parse_date(row.get("ND End Date")),
 
-                ACTUAL_PAYMENT_DATE=parse_date(
-                    row.get("Actual Payment Date")
-                )
-            )
+                ACTUAL_PAYMENT_DATE=parse_date(row.get("Actual Payment Date"))
+            ))
 
-            db.add(data)
-            inserted += 1
+        # -----------------------------
+        # 6. UPSERT
+        # -----------------------------
+        for i in range(0, len(records), UPSERT_CHUNK):
+            db.execute(
+                insert(CorporateActionData)
+                .values(records[i:i + UPSERT_CHUNK])
+                .on_conflict_do_nothing(index_elements=["ROW_HASH"])
+            )
 
         db.commit()
 
+        inserted = len(records)
+
         return {
             "message": "Upload successful",
             "inserted": inserted,
+            "unchanged": len(file_rows) - inserted - skipped,
+            "removed": len(removed),
             "skipped": skipped,
             "s3_url": s3_url
         }
@@ -396,39 +289,57 @@ async def upload_results(
         db.add(upload_record)
 
         # -----------------------------
-        # 3. DELETE OLD DATA
-        # -----------------------------
-        db.query(ResultData).delete()
-        db.commit()
-
-        # -----------------------------
-        # 4. PARSE CSV AGAIN
+        # 3. HASH ROWS, DIFF AGAINST DB
         # -----------------------------
         csv_data = file_bytes.decode("utf-8", errors="ignore")
         reader = csv.DictReader(io.StringIO(csv_data))
 
-        inserted = 0
+        file_rows = hash_rows(reader)
+
+        existing = {
+            h for (h,) in db.query(ResultData.row_hash)
+            .filter(ResultData.row_hash.isnot(None))
+        }
 
-        for row in reader:
+        removed = existing - file_rows.keys()
+        if removed:
+            db.query(ResultData).filter(
+                ResultData.row_hash.in_(removed)
+            ).delete(synchronize_session=False)
 
-            data = ResultData(
+        # -----------------------------
+        # 4. UPSERT NEW / CHANGED ROWS
+        # -----------------------------
+        records = [
+            dict(
+                row_hash=h,
 
                 scrip_code_symbol=clean(row.get("Security Code")),
                 company=clean(row.get("Company name")),
 
                 Result_date=parse_date(row.get("Result Date")),
-
             )
-
-            db.add(data)
-            inserted += 1
+            for h, row in file_rows.items()
+            if h not in existing
+        ]
+
+        for i in range(0, len(records), UPSERT_CHUNK):
+            db.execute(
+                insert(ResultData)
+                .values(records[i:i + UPSERT_CHUNK])
+                .on_conflict_do_nothing(index_elements=["row_hash"])
+            )
 
         db.commit()
 
+        inserted = len(records)
+
         return {
             "message": "Upload results successful",
             "s3_url": s3_url,
-            "inserted": inserted
+            "inserted": inserted,
+            "unchanged": len(file_rows) - inserted,
+            "removed": len(removed)
         }
 
     except Exception as e:
@@ -806,6 +717,21 @@ def get_grouped_by_purpose(db: Session = Depends(get_db)):
 
 
 
+@router.get("/data/company/batch")
+def get_by_companies(companies: List[str] = Query(...), db: Session = Depends(get_db)):
+
+    requested = parse_keys(companies, "companies")
+    keys = list(dict.fromkeys(c.lower() for c in requested))
+
+    results = db.query(CorporateActionData).filter(
+        any_of(CorporateActionData.COMPANY, keys)
+    ).all()
+
+    # stored names are lowercase; answer under the names as sent
+    grouped = group_rows(results, lambda r: r.COMPANY, keys)
+    return {c: grouped[c.lower()] for c in requested}
+
+
 @router.get("/data/company/{company_name}")
 def get_by_company(company_name: str, db: Session = Depends(get_db)):
 
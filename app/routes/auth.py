@@ -1,17 +1,25 @@
 # routes/auth.py
 
-from fastapi import APIRouter, Depends, HTTPException, Body
+from fastapi import APIRouter, Depends, HTTPException, Body, Query
+from fastapi.security import HTTPBasicCredentials
+from sqlalchemy import and_, func, not_, select, tuple_
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
+import base64
 import random
-from typing import Optional
+from typing import Literal, Optional
+
+import orjson
 
 from app.models.auth import User
 from app.database import SessionLocal
+from app.dependencies.docs_auth import verify_docs
 from app.utils.jwt import create_access_token,create_transfer_token
-from app.utils.security import hash_password, verify_password
+from app.utils.security import hash_password, verify_password, pool_stats
 from datetime import datetime
 from app.utils.jwt import verify_transfer_token
+from app.services import presence
+from app.services.fastread import json_response
 
 # -----------------------
 # DB Dependency
@@ -23,6 +31,9 @@ def get_db():
     finally:
         db.close()
 
+def iso_z(value):
+    return value.isoformat() + "Z" if value else None
+
 # -----------------------
 # Auth Router
 # -----------------------
@@ -164,6 +175,8 @@ def logout(
 
     db.commit()
 
+    presence.forget(userid)
+
     return {
         "message": "Logged out successfully"
     }
@@ -182,37 +195,134 @@ def get_user(userid: int, db: Session = Depends(get_db)):
         "email": user.email,
         "profession": user.profession,
         "phone": user.phone,
-         "status": "Online" if user.is_online else "Offline",
+         "status": "Online" if presence.is_online(user) else "Offline",
 
   "last_login": user.last_login.isoformat() + "Z" if user.last_login else None,
         "last_logout": user.last_logout.isoformat() + "Z" if user.last_logout else None,
-        "last_seen": user.last_seen.isoformat() + "Z" if user.last_seen else None,
+        "last_seen": iso_z(presence.last_seen(user)),
         "registered_at": user.created_at.isoformat() + "Z" if user.created_at else None,
     }
 # -----------------------
-# Get All Users
+# Get All Users (admin directory)
 # -----------------------
+USERS_PAGE_SIZE = 50
+USERS_MAX_PAGE_SIZE = 500
+
+# naive UTC datetimes -> "...Z", same format as user.x.isoformat() + "Z"
+ISO_Z = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+
+USER_COLUMNS = (
+    User.userid,
+    User.name,
+    User.email,
+    User.profession,
+    User.phone,
+    User.is_online,
+    User.last_login,
+    User.last_logout,
+    User.last_seen,
+    User.created_at,
+)
+
+
+def encode_cursor(created_at: datetime, userid: int) -> str:
+    raw = f"{created_at.isoformat()}|{userid}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor: str):
+    try:
+        created_at, userid = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), int(userid)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def online_clause(now: datetime):
+    return and_(
+        User.is_online.is_(True),
+        User.last_seen >= now - presence.ONLINE_WINDOW
+    )
+
+
 @router.get("/users")
-def get_all_users(db: Session = Depends(get_db)):
-    users = db.query(User).all()
+def get_all_users(
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(USERS_PAGE_SIZE, ge=1, le=USERS_MAX_PAGE_SIZE),
+    status: Optional[Literal["online", "offline"]] = Query(None),
+    seen_within: Optional[int] = Query(None, ge=1, description="minutes"),
+    profession: Optional[str] = Query(None),
+    db: Session = Depends(get_db)
+):
+    now = datetime.utcnow()
 
-    return [
-        {
-            "userid": user.userid,
-            "name": user.name,
-            "email": user.email,
-            "profession": user.profession,
-            "phone": user.phone,
-            "status": "Online" if user.is_online else "Offline",
+    filters = []
 
-            "last_login": user.last_login.isoformat() + "Z" if user.last_login else None,
-            "last_logout": user.last_logout.isoformat() + "Z" if user.last_logout else None,
-            "last_seen": user.last_seen.isoformat() + "Z" if user.last_seen else None,
-            "registered_at": user.created_at.isoformat() + "Z" if user.created_at else None,
+    if status == "online":
+        filters.append(online_clause(now))
+    elif status == "offline":
+        filters.append(not_(online_clause(now)))
+
+    if seen_within:
+        filters.append(User.last_seen >= now - timedelta(minutes=seen_within))
+
+    if profession:
+        filters.append(User.profession == profession)
+
+    # counts for the whole filtered set, in one aggregate
+    total, online = db.execute(
+        select(
+            func.count(),
+            func.count().filter(online_clause(now))
+        )
+        .select_from(User)
+        .where(*filters)
+    ).one()
+
+    page_filters = list(filters)
+    if cursor:
+        page_filters.append(
+            tuple_(User.created_at, User.userid) < tuple_(*decode_cursor(cursor))
+        )
+
+    rows = db.execute(
+        select(*USER_COLUMNS)
+        .where(*page_filters)
+        .order_by(User.created_at.desc(), User.userid.desc())
+        .limit(limit + 1)
+    ).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    users = [
+        {
+            "userid": row.userid,
+            "name": row.name,
+            "email": row.email,
+            "profession": row.profession,
+            "phone": row.phone,
+            "status": "Online" if presence.is_online(row, now) else "Offline",
+
+            "last_login": row.last_login,
+            "last_logout": row.last_logout,
+            "last_seen": presence.last_seen(row),
+            "registered_at": row.created_at,
         }
-        for user in users
+        for row in rows
     ]
 
+    return json_response(
+        {
+            "users": users,
+            "count": len(users),
+            "total": total,
+            "online": online,
+            "next_cursor": encode_cursor(rows[-1].created_at, rows[-1].userid) if has_more else None,
+        },
+        option=ISO_Z
+    )
+
 @router.post("/consume-transfer-token")
 def consume_transfer_token(
     transfer_token: str = Body(..., embed=True)
@@ -238,23 +348,24 @@ def consume_transfer_token(
     }   
 @router.put("/update-last-seen")
 def update_last_seen(
-    userid: int = Body(...),
-    db: Session = Depends(get_db)
+    userid: int = Body(...)
 ):
 
-    user = db.query(User).filter(User.userid == userid).first()
-
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-
-    user.last_seen = datetime.utcnow()
-
-    db.commit()
+    # Heartbeat: buffered in memory, written in bulk by presence.flush().
+    # Unknown userids simply match no row at flush time.
+    presence.touch(userid)
 
     return {
         "success": True
     }
 # -----------------------
+# Password Hash Pool Stats
+# -----------------------
+@router.get("/hash-pool", include_in_schema=False)
+def hash_pool_stats(credentials: HTTPBasicCredentials = Depends(verify_docs)):
+    return pool_stats()
+
+# -----------------------
 # Forgot Password
 # -----------------------
 @router.put("/forgot-password")
@@ -3,7 +3,8 @@ import uuid
 from datetime import datetime
 from typing import List
 
-import pandas as pd
+from app.utils.lazy import lazy_import
+pd = lazy_import("pandas")
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends, Path
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
@@ -15,6 +16,7 @@ from app.models.corpdiary import (
 )
 from app.schemas.heatmap import UploadBase
 from app.s3_utils import upload_file_to_s3, get_file_stream_from_s3, delete_file_from_s3, get_s3_file_url
+from app.services.csv_reader import read_csv
 
 router = APIRouter(prefix="/corpdiary", tags=["corpdiary"])
 
@@ -78,10 +80,7 @@ async def upload_file(
             s3_keys.append(s3_key)
 
             # Read CSV
-            try:
-                df = pd.read_csv(io.BytesIO(content), header=None, encoding="utf-8")
-            except UnicodeDecodeError:
-                df = pd.read_csv(io.BytesIO(content), header=None, encoding="latin1")
+            df = read_csv(content)
 
             if df.shape[1] != len(expected_columns):
                 raise HTTPException(
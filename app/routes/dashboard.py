@@ -0,0 +1,109 @@
+import asyncio
+
+from fastapi import APIRouter, HTTPException, Query, Response
+from fastapi.concurrency import run_in_threadpool
+
+from app.routes import (
+    marketdate,
+    mcapgainerloser,
+    mostvalued,
+    newhighlow,
+    news_api,
+    stockpulse,
+    volumetrade,
+)
+from app.services import dashboard, marketind_tree
+
+router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
+
+NEWHIGHLOW_CATEGORIES = ("52-week", "circuit", "multi-year")
+
+
+# ---------------- Sections ----------------
+# name -> loader(db, params); each returns what its own endpoint returns
+def _market_indicator(db, params):
+    tree = marketind_tree.latest(db)
+    if tree is None:
+        raise HTTPException(404, "No stock data found")
+    return Response(content=tree[2], media_type="application/json")
+
+
+SECTIONS = {
+    # GET /market-date/
+    "market_date": lambda db, p: marketdate.get_market_date(db=db),
+    # GET /marketindicator/latest/
+    "marketindicator": _market_indicator,
+    # GET /mostvalued/latest
+    "mostvalued": lambda db, p: mostvalued.get_latest(db=db),
+    # GET /stockpulse/latest
+    "stockpulse": lambda db, p: stockpulse.latest_stockpulse(db=db),
+    # GET /gainloss/latest/{category}
+    "gainloss": lambda db, p: mcapgainerloser.get_latest_data(p["gainloss"], db=db),
+    # GET /NewHighLow/{category}/high-low/count
+    "newhighlow": lambda db, p: newhighlow.get_high_low_count(p["newhighlow"], db=db),
+    # GET /VolumeTrade/latest?tab=
+    "volumetrade": lambda db, p: volumetrade.get_latest(tab=p["volume_tab"], db=db),
+    # GET /live-news/market-news
+    "news": lambda db, p: news_api.get_market_news(db=db),
+}
+
+# which request parameter (if any) a section's content depends on
+SECTION_PARAMS = {
+    "gainloss": "gainloss",
+    "newhighlow": "newhighlow",
+    "volumetrade": "volume_tab",
+}
+
+
+def _pairs(raw: str | None) -> dict:
+    """'news:ab12,stockpulse:cd34' -> {'news': 'ab12', 'stockpulse': 'cd34'}"""
+    out = {}
+    for item in (raw or "").split(","):
+        name, _, version = item.strip().partition(":")
+        if name and version:
+            out[name] = version
+    return out
+
+
+# ---------------- Bootstrap ----------------
+@router.get("/bootstrap")
+async def bootstrap(
+    sections: str | None = Query(None, description="comma separated; default all"),
+    known: str | None = Query(None, description="name:version pairs the client already has"),
+    gainloss: str = "mcap_movers",
+    newhighlow: str = "52-week",
+    volume_tab: str = "volume",
+):
+    """
+    Every landing-page section in one response. Sections are built
+    concurrently, cached per section, and carry a version; sections whose
+    version matches `known` come back as {"version", "unchanged": true}.
+    """
+    names = [s.strip() for s in sections.split(",") if s.strip()] if sections else list(SECTIONS)
+
+    unknown = [n for n in names if n not in SECTIONS]
+    if unknown:
+        raise HTTPException(400, f"Unknown sections: {', '.join(unknown)}")
+
+    if gainloss not in mcapgainerloser.CATEGORIES:
+        raise HTTPException(400, "Invalid gainloss category")
+    if newhighlow not in NEWHIGHLOW_CATEGORIES:
+        raise HTTPException(400, "Invalid newhighlow category")
+    if volume_tab not in volumetrade.TAB_MODEL_MAPPING:
+        raise HTTPException(400, "Invalid volume_tab")
+
+    params = {"gainloss": gainloss, "newhighlow": newhighlow, "volume_tab": volume_tab}
+
+    def fetch(name):
+        param = SECTION_PARAMS.get(name)
+        key = (name, params[param] if param else None)
+        loader = SECTIONS[name]
+        return dashboard.get(key, lambda db: loader(db, params))
+
+    results = await asyncio.gather(*(run_in_threadpool(fetch, n) for n in names))
+
+    return Response(
+        content=dashboard.assemble(dict(zip(names, results)), _pairs(known)),
+        media_type="application/json",
+        headers={"Cache-Control": "no-cache"},
+    )
@@ -5,6 +5,7 @@ from fastapi import (
     File,
     Form,
     HTTPException,
+    Query,
 )
 
 from sqlalchemy.orm import Session
@@ -12,12 +13,17 @@ from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
 from io import BytesIO
 
-import fitz  # PyMuPDF
+from app.utils.lazy import lazy_import
+
+fitz = lazy_import("fitz")  # PyMuPDF
 
 from fastapi.responses import StreamingResponse
 
 from app.database import SessionLocal
 from app.models.file import CompanyFile
+from app.dependencies.auth import get_optional_user_id
+from app.services.entitlements import annotate
+from app.services import search_index
 
 from app.schemas.files import (
     ReportCreate,
@@ -31,6 +37,7 @@ from app.s3_utils import (
     get_s3_file_url,
     get_file_stream_from_s3,
 )
+from app.utils.batch import parse_keys, any_of, group_rows
 
 
 router = APIRouter(
@@ -206,6 +213,8 @@ async def upload_report(
 
     db.refresh(report)
 
+    search_index.invalidate()
+
     return report
 
 
@@ -218,10 +227,11 @@ async def upload_report(
     response_model=list[ReportResponse]
 )
 def get_reports(
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    user_id: int | None = Depends(get_optional_user_id)
 ):
 
-    return (
+    reports = (
         db.query(CompanyFile)
         .order_by(
             CompanyFile.uploaded_at.desc()
@@ -229,6 +239,8 @@ def get_reports(
         .all()
     )
 
+    return annotate(db, user_id, reports)
+
 
 # ============================================================
 # GET TREASURE REPORTS
@@ -239,7 +251,8 @@ def get_reports(
     response_model=list[ReportResponse]
 )
 def get_treasure_reports(
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    user_id: int | None = Depends(get_optional_user_id)
 ):
 
     reports = (
@@ -253,7 +266,7 @@ def get_treasure_reports(
         .all()
     )
 
-    return reports
+    return annotate(db, user_id, reports)
 
 
 # ============================================================
@@ -265,10 +278,11 @@ def get_treasure_reports(
     response_model=list[ReportResponse]
 )
 def get_latest_uploads(
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    user_id: int | None = Depends(get_optional_user_id)
 ):
 
-    return (
+    reports = (
         db.query(CompanyFile)
         .order_by(
             CompanyFile.uploaded_at.desc(),
@@ -277,6 +291,8 @@ def get_latest_uploads(
         .all()
     )
 
+    return annotate(db, user_id, reports)
+
 
 # ============================================================
 # LATEST 24 HOURS
@@ -287,7 +303,8 @@ def get_latest_uploads(
     response_model=list[ReportResponse]
 )
 def get_latest_24_hours_reports(
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    user_id: int | None = Depends(get_optional_user_id)
 ):
 
     last_24_hours = (
@@ -305,7 +322,7 @@ def get_latest_24_hours_reports(
         .all()
     )
 
-    return reports
+    return annotate(db, user_id, reports)
 
 
 # ============================================================
@@ -770,6 +787,35 @@ def delete_report(
     }
 
 
+# ============================================================
+# GET REPORTS BY MANY ISINS
+# ============================================================
+
+@router.get(
+    "/isin/batch",
+    response_model=dict[str, list[ReportResponse]]
+)
+def get_reports_by_isins(
+    isins: list[str] = Query(...),
+    db: Session = Depends(get_db),
+    user_id: int | None = Depends(get_optional_user_id)
+):
+
+    keys = parse_keys(isins)
+
+    reports = (
+        db.query(CompanyFile)
+        .filter(
+            any_of(CompanyFile.isin, keys)
+        )
+        .all()
+    )
+
+    reports = annotate(db, user_id, reports)
+
+    return group_rows(reports, lambda r: r.isin, keys)
+
+
 # ============================================================
 # GET REPORTS BY ISIN
 # ============================================================
@@ -780,10 +826,11 @@ def delete_report(
 )
 def get_reports_by_isin(
     isin: str,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    user_id: int | None = Depends(get_optional_user_id)
 ):
 
-    return (
+    reports = (
         db.query(CompanyFile)
         .filter(
             CompanyFile.isin == isin
@@ -791,6 +838,8 @@ def get_reports_by_isin(
         .all()
     )
 
+    return annotate(db, user_id, reports)
+
 
 # ============================================================
 # GET REPORTS BY COMPANY
@@ -802,10 +851,11 @@ def get_reports_by_isin(
 )
 def get_reports_by_company(
     company: str,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    user_id: int | None = Depends(get_optional_user_id)
 ):
 
-    return (
+    reports = (
         db.query(CompanyFile)
         .filter(
             CompanyFile.company.ilike(
@@ -815,6 +865,8 @@ def get_reports_by_company(
         .all()
     )
 
+    return annotate(db, user_id, reports)
+
 
 # ============================================================
 # GET REPORTS BY YEAR
@@ -826,10 +878,11 @@ def get_reports_by_company(
 )
 def get_reports_by_year(
     year: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    user_id: int | None = Depends(get_optional_user_id)
 ):
 
-    return (
+    reports = (
         db.query(CompanyFile)
         .filter(
             CompanyFile.year == year
@@ -837,6 +890,8 @@ def get_reports_by_year(
         .all()
     )
 
+    return annotate(db, user_id, reports)
+
 
 # ============================================================
 # GET REPORTS BY DOCUMENT TYPE
@@ -848,10 +903,11 @@ def get_reports_by_year(
 )
 def get_reports_by_document_type(
     document_type: str,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    user_id: int | None = Depends(get_optional_user_id)
 ):
 
-    return (
+    reports = (
         db.query(CompanyFile)
         .filter(
             CompanyFile.document_type
@@ -860,3 +916,5 @@ def get_reports_by_document_type(
         .all()
     )
 
+    return annotate(db, user_id, reports)
+
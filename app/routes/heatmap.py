@@ -1,13 +1,15 @@
 import io
 import uuid
-from datetime import datetime
+from datetime import date, datetime
 from typing import List
 import math
 from fastapi import Query
 from sqlalchemy import or_
-from sqlalchemy import func
-import pandas as pd
+from sqlalchemy import func, select
+from app.utils.lazy import lazy_import
+pd = lazy_import("pandas")
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends
+from fastapi import Request, Response
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
@@ -18,6 +20,11 @@ from app.models.heatmap import (
 )
 from app.schemas.heatmap import UploadBase
 from app.s3_utils import upload_file_to_s3, delete_file_from_s3, get_file_stream_from_s3, get_s3_file_url
+from app.services.datasets import get_dataset
+from app.services.ingest import read_frame, parse_frame, replace_rows
+from app.services.fastread import fetch_rows, json_response
+from app.services import heatmap_tree, partitions, screener, search_index, universe
+from app.utils.batch import parse_keys, group_rows
 
 router = APIRouter(prefix="/heatmap", tags=["heatmap"])
 
@@ -37,27 +44,16 @@ UPLOAD_TABLES = {
 }
 
 # ---------------- CSV column order (NO HEADERS) ----------------
-COMPANY_COLUMNS = [
-    "ID","RANK", "COMPANY", "MCAP", "DAYCHCR", "CH", "FFLOAT", "FFRNK",
-    "WKCHCR", "WKCH", "MTHCHCR", "MTHCH", "QTRCHCR", "QTRCH",
-    "HYCHCR", "HYCH", "YRCHCR", "YRCH", "CMP", "PCL", "CH_RS",
-    "CH_PER", "OPEN", "HIGH", "LOW", "CLOSE", "VOL", "VALUE",
-    "TRADE", "ISIN", "SEC_ID", "ISCCODE", "INDUSTRY", "IND_RNK",
-    "IH_MCODE", "IH_MNAME", "HOU_RNK", "COMPANY_NAME", "BSE",
-    "NSE", "INDEX_STK", "RONW", "ROCE", "EPS", "CEPS", "P_E",
-    "P_CE", "DIV", "YLD", "DEBT_EQ",
-]
-HOUSE_COLUMNS = ["ID", "RNK", "IH_PR", "IH_AF", "HOUSE", "COS", "MCAP","DAYCHCR","CH","FFLOAT","FFRNK","WKCHCR","WKCH","MTHCHCR","MTHCH","QTRCHCR","QTRCH","HYCHCR","HYCH","YRCHCR","YRCH"]
-INDUSTRY_COLUMNS = ["ID","RNK","INDUSTRY","COS","MCAP","DAYCHCR","CH","FFLOAT","FFRNK","WKCHCR","WKCH","MTHCHCR","MTHCH","QTRCHCR","QTRCH","HYCHCR","HYCH","YRCHCR","YRCH","SECID","ISCCODE"]
-SECTOR_COLUMNS = ["ID","RNK","SECTOR","COS","MCAP","DAYCHCR","CH","FFLOAT","FFRNK","WKCHCR","WKCH","MTHCHCR","MTHCH","QTRCHCR","QTRCH","HYCHCR","HYCH","YRCHCR","YRCH","SECID"]
-
-COLUMN_MAP = {
-    "company": COMPANY_COLUMNS,
-    "house": HOUSE_COLUMNS,
-    "industry": INDUSTRY_COLUMNS,
-    "sector": SECTOR_COLUMNS,
+# Declared once in app/services/datasets.py
+DATASET_MAP = {
+    "company": get_dataset("heatmap.company"),
+    "house": get_dataset("heatmap.house"),
+    "industry": get_dataset("heatmap.industry"),
+    "sector": get_dataset("heatmap.sector"),
 }
 
+COLUMN_MAP = {k: d.columns for k, d in DATASET_MAP.items()}
+
 # ---------------- DB Dependency ----------------
 def get_db():
     db = SessionLocal()
@@ -66,34 +62,6 @@ def get_db():
     finally:
         db.close()
 
-# ---------------- CSV Reader Helper ----------------
-# ---------------- CSV Reader ----------------
-def read_csv_safe(file_stream, expected_columns=None):
-    file_stream.seek(0)
-    contents = file_stream.read()
-    if not contents or len(contents.strip()) == 0:
-        raise HTTPException(status_code=404, detail="CSV file is empty")
-
-    file_stream.seek(0)
-    try:
-        df = pd.read_csv(file_stream, header=None, encoding="utf-8")
-    except UnicodeDecodeError:
-        file_stream.seek(0)
-        df = pd.read_csv(file_stream, header=None, encoding="latin1")
-    except pd.errors.EmptyDataError:
-        raise HTTPException(status_code=404, detail="CSV has no data")
-
-    if expected_columns:
-        if len(df.columns) >= len(expected_columns):
-            df = df.iloc[:, :len(expected_columns)]
-            df.columns = expected_columns
-        else:
-            raise HTTPException(status_code=400, detail="CSV column mismatch")
-
-    return df
-
-from sqlalchemy.exc import SQLAlchemyError
-
 # ---------------- Upload API ----------------
 @router.post("/upload/")
 async def upload_file(
@@ -107,24 +75,23 @@ async def upload_file(
         raise HTTPException(status_code=400, detail="Invalid data_type")
 
     Model, UploadModel = TABLE_MAP[data_type]
-    expected_columns = COLUMN_MAP[data_type]
+    dataset = DATASET_MAP[data_type]
 
     contents = await file.read()
     if not contents:
         raise HTTPException(status_code=400, detail="Uploaded file is empty")
 
-    file_like = io.BytesIO(contents)
-
-    df = read_csv_safe(file_like, expected_columns)
+    # Parse before touching S3 / DB so a bad file leaves both untouched
+    df = read_frame(contents, dataset)
+    records = parse_frame(df, dataset)
 
-    # 🔥 Fix NaN
-    df = df.astype(object).where(pd.notnull(df), None)
+    if not records:
+        raise HTTPException(status_code=400, detail="No valid rows")
 
     # Upload to S3
-    file_like.seek(0)
     try:
         s3_key = upload_file_to_s3(
-            file_obj=file_like,
+            file_obj=io.BytesIO(contents),
             folder=f"heatmap/{data_type}",
             filename=file.filename
         )
@@ -139,49 +106,24 @@ async def upload_file(
         file_path=s3_key,
     )
 
-    model_columns = set(Model.__table__.columns.keys())
-    objects = []
-
-    # ---------- Prepare data ----------
-    for _, row in df.iterrows():
-        record = {}
-
-        for col in expected_columns:
-            if col not in model_columns or col == "pk_id":
-                continue
-
-            val = row[col]
-
-            if pd.isna(val):
-                val = None
-            elif isinstance(val, float):
-                if math.isnan(val):
-                    val = None
-                elif val.is_integer():
-                    val = int(val)
-            elif isinstance(val, str):
-                val = val.strip()
-
-            record[col] = val
-
-        objects.append(Model(**record))
-
-    if not objects:
-        delete_file_from_s3(s3_key)
-        raise HTTPException(status_code=400, detail="No valid rows")
-
     try:
-        # 🔥🔥🔥 IMPORTANT CHANGE 🔥🔥🔥
-        # DELETE ALL OLD DATA
-        db.query(Model).delete(synchronize_session=False)
-
-        # Insert new data
+        # one transaction: companies replace only this day's partition,
+        # house / industry / sector are replaced whole
         db.add(upload_entry)
         db.flush()
-        db.bulk_save_objects(objects)
+        if data_type == "company":
+            partitions.replace_day(db, Model, upload_entry.data_date, records)
+        else:
+            replace_rows(db, dataset, records)
+        heatmap_tree.rebuild(db)
 
         db.commit()
 
+        if data_type == "company":
+            universe.invalidate()
+            search_index.invalidate()
+        heatmap_tree.invalidate()
+
     except SQLAlchemyError as e:
         db.rollback()
         delete_file_from_s3(s3_key)
@@ -189,7 +131,7 @@ async def upload_file(
 
     return {
         "status": "success",
-        "rows_inserted": len(objects),
+        "rows_inserted": len(records),
         "file_url": get_s3_file_url(s3_key)
     }
 # ---------------- Get All Uploads ----------------
@@ -230,18 +172,53 @@ def get_latest_upload_data_file(
     if not file_stream:
         raise HTTPException(status_code=404, detail="File not found in S3")
 
-    df = read_csv_safe(file_stream, COLUMN_MAP[data_type])
-    
+    dataset = DATASET_MAP[data_type]
+    df = read_frame(file_stream.read(), dataset)
+
     # Limit rows
     df = df.head(limit)
 
-    records = df.to_dict(orient="records")
+    records = parse_frame(df, dataset)
     s3_url = get_s3_file_url(latest_upload.file_path)
     for record in records:
         record["_s3_url"] = s3_url
 
     return records
 
+# ---------------- Latest Upload by many ISINs ----------------
+@router.get("/{data_type}/latest-data-file/batch", response_model=dict)
+def get_latest_upload_data_file_by_isins(
+    data_type: str,
+    isins: List[str] = Query(...),
+    db: Session = Depends(get_db)
+):
+    data_type = data_type.lower()
+    if data_type not in UPLOAD_TABLES:
+        raise HTTPException(status_code=400, detail="Invalid data_type")
+
+    keys = parse_keys(isins)
+
+    UploadModel = UPLOAD_TABLES[data_type]
+    latest_upload = db.query(UploadModel).order_by(UploadModel.data_date.desc()).first()
+    if not latest_upload:
+        raise HTTPException(status_code=404, detail="No uploads found")
+
+    file_stream = get_file_stream_from_s3(latest_upload.file_path)
+    if not file_stream:
+        raise HTTPException(status_code=404, detail="File not found in S3")
+
+    dataset = DATASET_MAP[data_type]
+    df = read_frame(file_stream.read(), dataset)
+    isin_col = "ISIN" if "ISIN" in df.columns else df.columns[0]
+    df[isin_col] = df[isin_col].astype(str).str.strip()
+
+    records = parse_frame(df[df[isin_col].isin(keys)], dataset)
+    s3_url = get_s3_file_url(latest_upload.file_path)
+    for record in records:
+        record["_s3_url"] = s3_url
+
+    return group_rows(records, lambda r: str(r[isin_col]).strip(), keys)
+
 # ---------------- Latest Upload by ISIN ----------------
 @router.get("/{data_type}/latest-data-file/{isin}", response_model=list)
 def get_latest_upload_data_file_by_isin(
@@ -263,7 +240,8 @@ def get_latest_upload_data_file_by_isin(
     if not file_stream:
         raise HTTPException(status_code=404, detail="File not found in S3")
 
-    df = read_csv_safe(file_stream, COLUMN_MAP[data_type])
+    dataset = DATASET_MAP[data_type]
+    df = read_frame(file_stream.read(), dataset)
     isin_col = "ISIN" if "ISIN" in df.columns else df.columns[0]
     df[isin_col] = df[isin_col].astype(str).str.strip()
 
@@ -274,7 +252,7 @@ def get_latest_upload_data_file_by_isin(
     # Limit rows
     filtered_df = filtered_df.head(limit)
 
-    records = filtered_df.to_dict(orient="records")
+    records = parse_frame(filtered_df, dataset)
     s3_url = get_s3_file_url(latest_upload.file_path)
     for record in records:
         record["_s3_url"] = s3_url
@@ -308,9 +286,10 @@ def get_latest_upload_all_data(
     if not file_stream:
         raise HTTPException(status_code=404, detail="File not found in S3")
 
-    df = read_csv_safe(file_stream, COLUMN_MAP[data_type])
+    dataset = DATASET_MAP[data_type]
+    df = read_frame(file_stream.read(), dataset)
 
-    return df.to_dict(orient="records")
+    return parse_frame(df, dataset)
 
 
 @router.get("/latest-data-file/")
@@ -322,22 +301,16 @@ def get_companies(
 
     offset = (page - 1) * limit
 
-    total = db.query(Company).count()
+    companies = universe.get_universe(db)
+    total = companies.size
 
-    companies = (
-        db.query(Company)
-        .offset(offset)
-        .limit(limit)
-        .all()
-    )
-
-    return {
+    return json_response({
         "total": total,
         "page": page,
         "limit": limit,
         "pages": math.ceil(total / limit),
-        "data": companies
-    }
+        "data": companies.rows[offset:offset + limit]
+    })
 
 @router.get("/{data_type}/data/")
 def get_data(
@@ -358,12 +331,28 @@ def get_data(
 
     Model, _ = TABLE_MAP[data_type]
 
-    query = db.query(Model)
+    # Company: answered from the in-memory columnar snapshot
+    if data_type == "company" and year is None:
+        companies = universe.get_universe(db)
+        positions = companies.mask(search, sector, house, index).nonzero()[0]
+        total = len(positions)
+        data = companies.take(positions[(page - 1) * limit:page * limit])
+
+        return json_response({
+            "total": total,
+            "page": page,
+            "limit": limit,
+            "pages": math.ceil(total / limit),
+            "count": len(data),
+            "data": data,
+        })
+
+    criteria = []
 
     # Search
     if search:
         search = f"%{search.strip()}%"
-        query = query.filter(
+        criteria.append(
             or_(
                 Model.COMPANY.ilike(search),
                 Model.COMPANY_NAME.ilike(search),
@@ -375,54 +364,52 @@ def get_data(
 
     # Sector
     if sector:
-        query = query.filter(Model.SEC_ID == sector)
+        criteria.append(Model.SEC_ID == sector)
     if house:
-        query = query.filter(
+        criteria.append(
         func.lower(func.trim(Model.IH_MNAME))
         == house.strip().lower()
     )
     # Index
     if index is not None:
-        query = query.filter(Model.INDEX_STK == index)
+        criteria.append(Model.INDEX_STK == index)
 
     # Year (only if your table has YEAR)
     if year is not None and hasattr(Model, "YEAR"):
-        query = query.filter(Model.YEAR == year)
+        criteria.append(Model.YEAR == year)
+
+    # Company keeps history; serve the latest day
+    if Model is Company:
+        criteria.append(partitions.is_latest(Company))
 
-    total = query.count()
+    total = db.scalar(select(func.count()).select_from(Model).where(*criteria))
 
-    data = (
-        query
-        .offset((page - 1) * limit)
-        .limit(limit)
-        .all()
+    data = fetch_rows(
+        db, Model, *criteria,
+        offset=(page - 1) * limit,
+        limit=limit,
     )
 
-    return {
+    return json_response({
         "total": total,
         "page": page,
         "limit": limit,
         "pages": math.ceil(total / limit),
         "count": len(data),
         "data": data,
-    }
+    })
 @router.get("/company/top-mcap")
 def get_top_mcap_companies(
     limit: int = 20,
     db: Session = Depends(get_db),
 ):
-    companies = (
-        db.query(Company)
-        .filter(Company.MCAP.isnot(None))
-        .order_by(Company.MCAP.desc())
-        .limit(limit)
-        .all()
-    )
+    companies = universe.get_universe(db)
+    data = companies.take(companies.order("MCAP", limit=limit))
 
-    return {
-        "count": len(companies),
-        "data": companies,
-    }
+    return json_response({
+        "count": len(data),
+        "data": data,
+    })
     
 @router.get("/company/sector-peers/{sec_id}")
 def get_sector_peers(
@@ -431,18 +418,112 @@ def get_sector_peers(
     limit: int = 10,
     db: Session = Depends(get_db),
 ):
-    query = db.query(Company).filter(Company.SEC_ID == sec_id)
+    companies = universe.get_universe(db)
 
+    mask = companies.mask(sector=sec_id)
     if exclude_isin:
-        query = query.filter(Company.ISIN != exclude_isin)
+        mask &= companies.text["ISIN"] != exclude_isin
+
+    peers = companies.order("MCAP", mask=mask, limit=limit, nulls=True)
+
+    return json_response(companies.take(peers))
+# ---------------- Screener ----------------
+@router.get("/screener")
+def screen_companies(
+    q: str = Query(..., description="e.g. P_E<20 AND ROCE>15 AND MCAP>5000"),
+    sort: str = Query("-MCAP", description="column, '-' prefix for descending"),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=1000),
+    db: Session = Depends(get_db),
+):
+    try:
+        total, data = screener.screen(universe.get_universe(db), q, sort, offset, limit)
+    except screener.ScreenerError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return json_response({
+        "total": total,
+        "offset": offset,
+        "limit": limit,
+        "count": len(data),
+        "data": data,
+    })
+
+# ---------------- Treemap ----------------
+@router.get("/tree")
+def get_tree(request: Request, db: Session = Depends(get_db)):
+    """
+    Sector -> industry -> company and house -> company treemap, built at
+    upload time. Revalidate with If-None-Match; unchanged trees get a 304.
+    """
+    etag, payload = heatmap_tree.get_tree(db)
+    headers = {"ETag": f'"{etag}"', "Cache-Control": "no-cache"}
+
+    if_none_match = request.headers.get("if-none-match", "")
+    tags = {t.strip().removeprefix("W/").strip('"') for t in if_none_match.split(",")}
+    if etag in tags or "*" in tags:
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=payload, media_type="application/json", headers=headers)
+
+# ---------------- Company history ----------------
+@router.get("/company/dates")
+def get_company_dates(db: Session = Depends(get_db)):
+    """Days with stored company data, newest first."""
+    return json_response({"dates": partitions.days(db, Company)})
+
 
-    peers = (
-        query.order_by(Company.MCAP.desc())
-        .limit(limit)
-        .all()
+@router.get("/company/on/{data_date}")
+def get_companies_on(
+    data_date: date,
+    page: int = Query(1, ge=1),
+    limit: int = Query(100, ge=1),
+    db: Session = Depends(get_db),
+):
+    """The company table as uploaded for one day (reads that day's partition only)."""
+    day = partitions.on_day(Company, data_date)
+
+    total = db.scalar(select(func.count()).select_from(Company).where(day))
+    if not total:
+        raise HTTPException(status_code=404, detail=f"No company data for {data_date}")
+
+    data = fetch_rows(
+        db, Company, day,
+        order_by=Company.pk_id,
+        offset=(page - 1) * limit,
+        limit=limit,
+    )
+
+    return json_response({
+        "data_date": data_date,
+        "total": total,
+        "page": page,
+        "limit": limit,
+        "pages": math.ceil(total / limit),
+        "count": len(data),
+        "data": data,
+    })
+
+
+@router.get("/company/history/{isin}")
+def get_company_history(
+    isin: str,
+    start: date | None = None,
+    end: date | None = None,
+    db: Session = Depends(get_db),
+):
+    """One company's metrics per day, oldest first; start / end prune partitions."""
+    rows = fetch_rows(
+        db, Company,
+        Company.ISIN == isin.strip(),
+        *partitions.between(Company, start, end),
+        order_by=Company.data_date,
     )
+    if not rows:
+        raise HTTPException(status_code=404, detail=f"No records found for ISIN {isin}")
+
+    return json_response({"isin": isin.strip(), "count": len(rows), "data": rows})
 
-    return peers
 # ---------------- Download File ----------------
 @router.get("/{data_type}/files/{upload_id}/")
 def download_file(data_type: str, upload_id: int, db: Session = Depends(get_db)):
@@ -477,7 +558,26 @@ def delete_upload(data_type: str, upload_id: int, db: Session = Depends(get_db))
     if not upload:
         raise HTTPException(status_code=404, detail="Upload not found")
 
-    delete_file_from_s3(upload.file_path)
     db.delete(upload)
+
+    # company rows live in the day's partition; drop it with its upload
+    # (unless a re-upload of the same day still owns it), so a mis-dated
+    # upload does not stay "latest"
+    if data_type == "company":
+        db.flush()
+        day_kept = db.query(UploadModel.id).filter(
+            UploadModel.data_date == upload.data_date
+        ).first()
+        if not day_kept:
+            partitions.drop_day(db, Company, upload.data_date)
+            heatmap_tree.rebuild(db)
+
     db.commit()
+    delete_file_from_s3(upload.file_path)
+
+    if data_type == "company":
+        universe.invalidate()
+        search_index.invalidate()
+        heatmap_tree.invalidate()
+
     return {"status": "deleted", "id": upload_id}
\ No newline at end of file
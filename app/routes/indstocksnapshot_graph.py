@@ -2,7 +2,8 @@ from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Form
 from sqlalchemy.orm import Session
 from datetime import date
 from uuid import uuid4
-import pandas as pd
+from app.utils.lazy import lazy_import
+pd = lazy_import("pandas")
 from fastapi.responses import StreamingResponse
 from urllib.parse import quote
 from fastapi.responses import StreamingResponse
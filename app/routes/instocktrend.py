@@ -2,7 +2,8 @@ import io
 from datetime import date
 from typing import List, Dict, Any
 
-import pandas as pd
+from app.utils.lazy import lazy_import
+pd = lazy_import("pandas")
 from fastapi import (
     APIRouter,
     Depends,
@@ -18,6 +19,7 @@ from sqlalchemy import desc
 from app.database import SessionLocal
 from app.models.instocktrend import InstockTrendData, Indstocktrendupload
 from app.s3_utils import upload_file_to_s3, delete_file_from_s3, get_file_stream_from_s3
+from app.services.excel_reader import is_excel, read_excel
 
 router = APIRouter(
     prefix="/indstocktrend",
@@ -69,8 +71,8 @@ async def upload_multiple_data(
 
             # Read file
             try:
-                if file.filename.endswith((".xlsx", ".xls")):
-                    df = pd.read_excel(file_stream, header=None)
+                if is_excel(contents):
+                    df = read_excel(contents)
                 elif file.filename.endswith(".csv"):
                     df = pd.read_csv(file_stream, header=None)
                 else:
@@ -285,8 +287,8 @@ async def update_upload(
 
         file_like.seek(0)
 
-        if file.filename.endswith((".xlsx", ".xls")):
-            df = pd.read_excel(file_like, header=None)
+        if is_excel(contents):
+            df = read_excel(contents)
         else:
             df = pd.read_csv(file_like, header=None)
 
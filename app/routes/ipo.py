@@ -2,7 +2,8 @@ from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Form
 from sqlalchemy.orm import Session
 from datetime import datetime, date
 from sqlalchemy import func
-import pandas as pd
+from app.utils.lazy import lazy_import
+pd = lazy_import("pandas")
 from typing import List
 import math
 import io
@@ -14,6 +15,8 @@ from app.database import SessionLocal
 from app.models.ipo import DataUpload, IPOUpload
 from app.schemas.ipo import UploadSummaryResponse
 from app.s3_utils import upload_file_to_s3, delete_file_from_s3, get_file_stream_from_s3,get_s3_file_url
+from app.services.fastread import fetch_rows, json_response
+from app.services import search_index
 
 
 router = APIRouter(prefix="/IPO", tags=["IPO Data"])
@@ -271,6 +274,8 @@ async def upload_multiple_data(
             )
         )
 
+    search_index.invalidate()
+
     return response_list
 # -------------------- Get Uploads --------------------
 @router.get("/uploads", response_model=List[UploadSummaryResponse])
@@ -302,14 +307,16 @@ def get_latest_all(db: Session = Depends(get_db)):
     if not latest_upload:
         raise HTTPException(404, "No data found")
 
-    rows = db.query(DataUpload).filter(
+    rows = fetch_rows(
+        db, DataUpload,
         DataUpload.upload_date == latest_upload.upload_date,
-    ).order_by(DataUpload.isin).all()
+        order_by=DataUpload.isin,
+    )
 
-    return {
+    return json_response({
         "upload_date": latest_upload.upload_date,
-        "data": clean_objs(rows)
-    }
+        "data": rows
+    })
 
 
 # -------------------- Download File --------------------
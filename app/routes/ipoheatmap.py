@@ -2,9 +2,10 @@ from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Q
 from sqlalchemy.orm import Session
 from typing import List
 from datetime import date
-import pandas as pd
+from app.utils.lazy import lazy_import
+pd = lazy_import("pandas")
 import io
-from sqlalchemy import extract
+from sqlalchemy import extract, func, select
 from fastapi.responses import StreamingResponse
 
 from app.database import SessionLocal
@@ -26,6 +27,7 @@ from app.s3_utils import (
     get_file_stream_from_s3,
     get_s3_file_url
 )
+from app.services.excel_reader import is_excel, read_excel
 
 router = APIRouter(
     prefix="/ipoheatmap",
@@ -41,9 +43,62 @@ def get_db():
         db.close()
 
 
+# ---------------- HELPERS ---------------- #
+def year_range(year: int):
+    """[Jan 1, next Jan 1) on iss_open: a range the iss_open index can serve."""
+    return (
+        IPOHeatmapData.iss_open >= date(year, 1, 1),
+        IPOHeatmapData.iss_open < date(year + 1, 1, 1),
+    )
+
+
+def rebuild_year_summary(db: Session) -> int:
+    """
+    Replace IPOHeatmapYear with per-year aggregates of IPOHeatmapData, one
+    GROUP BY in the caller's transaction, so the year tabs always match
+    the detail rows.
+    """
+    year = extract("year", IPOHeatmapData.iss_open)
+    rows = db.execute(
+        select(
+            year.label("year"),
+            func.count().label("cos"),
+            func.sum(IPOHeatmapData.ipo_value).label("ipo_value"),
+            func.sum(IPOHeatmapData.cur_value).label("market_value"),
+        )
+        .where(IPOHeatmapData.iss_open.isnot(None))
+        .group_by(year)
+        .order_by(year)
+    ).all()
+
+    db.query(IPOHeatmapYear).delete()
+
+    records = []
+    for r in rows:
+        ipo_value = float(r.ipo_value) if r.ipo_value is not None else None
+        market_value = float(r.market_value) if r.market_value is not None else None
+        ch_per = (
+            round((market_value - ipo_value) / ipo_value * 100, 2)
+            if ipo_value and market_value is not None else None
+        )
+        records.append({
+            "year": int(r.year),
+            "cos": r.cos,
+            "ipo_value": round(ipo_value, 2) if ipo_value is not None else None,
+            "market_value": round(market_value, 2) if market_value is not None else None,
+            "ch_per": ch_per,
+        })
+
+    if records:
+        db.bulk_insert_mappings(IPOHeatmapYear, records)
+    return len(records)
+
+
 # =========================================================
 # YEAR ROUTES
 # =========================================================
+# The year table is derived from the IPO data upload; a year file upload
+# still replaces it until the next data upload (manual override).
 
 @router.post("/year/upload-file", response_model=IPOHeatmapYearUploadRead)
 async def upload_year_file(
@@ -61,10 +116,10 @@ async def upload_year_file(
     s3_key = upload_file_to_s3(s3_stream, "ipoheatmap/year")
 
     # Read dataframe
-    if file.filename.endswith(".csv"):
-        df = pd.read_csv(io.BytesIO(contents), header=None)
+    if is_excel(contents):
+        df = read_excel(contents)
     else:
-        df = pd.read_excel(io.BytesIO(contents), header=None)
+        df = pd.read_csv(io.BytesIO(contents), header=None)
 
     df = df.iloc[:, 1:]
     df.columns = ["year", "cos", "ipo_value", "market_value", "ch_per"]
@@ -214,10 +269,10 @@ async def upload_data_file(
     s3_stream = io.BytesIO(contents)
     s3_key = upload_file_to_s3(s3_stream, "ipoheatmap/data")
 
-    if file.filename.endswith(".csv"):
-        df = pd.read_csv(io.BytesIO(contents), header=None)
+    if is_excel(contents):
+        df = read_excel(contents)
     else:
-        df = pd.read_excel(io.BytesIO(contents), header=None)
+        df = pd.read_csv(io.BytesIO(contents), header=None)
 
     df = df.iloc[:, 1:]
     df.columns = ["company", "iss_open", "offer_price", "cmp", "ipo_value", "cur_value", "gain_per"]
@@ -237,6 +292,8 @@ async def upload_data_file(
             for _, row in df.iterrows()
         ]
         db.bulk_save_objects(records)
+        db.flush()
+        rebuild_year_summary(db)
         db.commit()
     except Exception as e:
         db.rollback()
@@ -268,8 +325,8 @@ def get_latest_data(db: Session = Depends(get_db)):
 
 
 @router.get("/data/yearwise", response_model=List[IPOHeatmapDataRead])
-def get_data_by_year(year: int = Query(..., description="Year filter"), db: Session = Depends(get_db)):
-    data = db.query(IPOHeatmapData).filter(extract("year", IPOHeatmapData.iss_open) == year).all()
+def get_data_by_year(year: int = Query(..., ge=1, le=9998, description="Year filter"), db: Session = Depends(get_db)):
+    data = db.query(IPOHeatmapData).filter(*year_range(year)).all()
     if not data:
         raise HTTPException(status_code=404, detail=f"No IPO data found for year {year}")
     return data
@@ -7,11 +7,14 @@ from uuid import uuid4
 from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-import pandas as pd
+from app.utils.lazy import lazy_import
+pd = lazy_import("pandas")
 
 from app.database import SessionLocal
 from app.models.ipotrack import IpoTrack,IpoTrackUpload
 from app.s3_utils import upload_file_to_s3, delete_file_from_s3, get_file_stream_from_s3
+from app.services import search_index
+from app.services.excel_reader import is_excel, read_excel
 
 router = APIRouter(prefix="/ipotrack", tags=["IPO Track"])
 
@@ -71,12 +74,12 @@ async def upload_ipotrack(
 
     # Read file
     try:
-        df = pd.read_excel(io.BytesIO(file_bytes), header=None)
-    except Exception:
-        try:
+        if is_excel(file_bytes):
+            df = read_excel(file_bytes)
+        else:
             df = pd.read_csv(io.StringIO(file_bytes.decode("utf-8")), header=None)
-        except Exception:
-            raise HTTPException(400, "Invalid file format (only Excel/CSV supported)")
+    except Exception:
+        raise HTTPException(400, "Invalid file format (only Excel/CSV supported)")
 
     headers = [
         "ID","INDIC","COCODE","CO_NAME","ISS_OPEN","ISS_CLOSE",
@@ -175,6 +178,8 @@ async def upload_ipotrack(
     db.add(upload_row)
     db.commit()
 
+    search_index.invalidate()
+
     return {
         "message": "Uploaded successfully",
         "inserted_records": len(records),
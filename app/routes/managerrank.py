@@ -2,7 +2,8 @@ from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Form
 from sqlalchemy.orm import Session
 from datetime import date
 from uuid import uuid4
-import pandas as pd
+from app.utils.lazy import lazy_import
+pd = lazy_import("pandas")
 import io
 import math
 
@@ -14,6 +15,7 @@ from app.s3_utils import (
     get_file_stream_from_s3,
     get_s3_file_url
 )
+from app.services.fastread import fetch_rows, json_response
 from fastapi.responses import StreamingResponse
 
 router = APIRouter(prefix="/manager-rank", tags=["Manager Rank"])
@@ -209,9 +211,9 @@ def get_latest_data(category: str, db: Session = Depends(get_db)):
     if not latest_upload:
         raise HTTPException(404, "No upload found")
 
-    data = db.query(DataModel).filter(DataModel.group_id == latest_upload.group_id).all()
+    data = fetch_rows(db, DataModel, DataModel.group_id == latest_upload.group_id)
 
-    return data
+    return json_response(data)
 
 # ==========================================================
 # Get by LM_CODE
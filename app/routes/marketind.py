@@ -1,15 +1,16 @@
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Form
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Form, Request, Response
 from sqlalchemy import func
 from sqlalchemy.orm import Session
-from typing import List, Dict, Any
 from datetime import date
-import pandas as pd
+from app.utils.lazy import lazy_import
+pd = lazy_import("pandas")
 import io
 import math
 from fastapi.responses import StreamingResponse
 from mimetypes import guess_type
 
-from app.models.marketind import StockData, MarketIndicatorUpload
+from app.models.marketind import StockData, MarketIndicatorUpload, MarketIndicatorTree
+from app.services import marketind_tree
 from app.database import SessionLocal
 from app.s3_utils import (
     upload_file_to_s3,
@@ -47,11 +48,6 @@ def safe_float(value, default=0.0):
         return default
 
 
-def is_header_row(stock: StockData):
-    numeric_fields = [stock.yr_ago, stock.curnt, stock.ch, stock.S_ID, stock.IDX_ID]
-    return all(f is None or f == 0 for f in numeric_fields)
-
-
 # ======================================================
 # Upload Single File
 # ======================================================
@@ -151,6 +147,9 @@ async def upload_single_data(
 
         db.bulk_save_objects(records)
 
+        # Homepage tree for this date, stored with the data
+        marketind_tree.store(db, mkt_date, upload_record.id)
+
         # Commit everything together
         db.commit()
 
@@ -213,70 +212,20 @@ def download_file(upload_id: int, db: Session = Depends(get_db)):
 # Latest Market Indicator Data
 # ======================================================
 @router.get("/latest/")
-def get_latest_marketindicator(db: Session = Depends(get_db)):
-
-    latest_date = db.query(func.max(StockData.mkt_date)).scalar()
-    if not latest_date:
+def get_latest_marketindicator(request: Request, db: Session = Depends(get_db)):
+    """Served from the tree stored at upload time, see app.services.marketind_tree."""
+    tree = marketind_tree.latest(db)
+    if tree is None:
         raise HTTPException(404, "No stock data found")
 
-    stocks = db.query(StockData).filter(StockData.mkt_date == latest_date).order_by(StockData.H_ID, StockData.ID).all()
+    mkt_date, version, payload = tree
+    etag = f'"{mkt_date.isoformat()}-{version}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
 
-    uploads = db.query(MarketIndicatorUpload).filter(MarketIndicatorUpload.mkt_date == latest_date).all()
-    uploaded_files = [
-        {
-            "id": u.id,
-            "file_name": u.file_name,
-            "file_path": ("/" + u.file_path.replace("\\", "/")) if u.file_path else None
-        } for u in uploads
-    ]
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
 
-    tab_map = {1: "Returns", 2: "Indices", 3: "Currencies", 4: "World P/E Ratio", 5: "Commodities"}
-    tab_sections = {
-        1: ["India  Stocks", "Bullion", "Forex vs INR", "Crude"],
-        2: ["BRICS", "Asia/Pacific", "America/Europe"],
-        3: ["INR vs.", "USD vs."],
-        4: ["Country"],
-        5: ["Metals (Kg)", "Agro-Cons (100 Kg)", "Agro-Indu (100 Kg)", "Energy (Rs)"]
-    }
-
-    result: Dict[str, List[Dict[str, Any]]] = {}
-    current_section_per_tab: Dict[str, Dict[str, Any]] = {}
-
-    for stock in stocks:
-        tab_name = tab_map.get(stock.H_ID, f"Unknown H_ID {stock.H_ID}")
-        if tab_name not in result:
-            result[tab_name] = []
-
-        stock_name = (stock.name or "").strip()
-        sections_for_tab = tab_sections.get(stock.H_ID, [])
-        is_header = stock_name in sections_for_tab or is_header_row(stock)
-
-        if is_header:
-            section = {"title": stock_name, "rows": []}
-            result[tab_name].append(section)
-            current_section_per_tab[tab_name] = section
-        else:
-            current_section = current_section_per_tab.get(tab_name)
-            if not current_section:
-                current_section = {"title": "(No Title)", "rows": []}
-                result[tab_name].append(current_section)
-                current_section_per_tab[tab_name] = current_section
-            current_section["rows"].append([
-                stock.name,
-                stock.yr_ago,
-                stock.curnt,
-                stock.ch,
-                stock.H_ID,
-                stock.S_ID,
-                stock.IDX_ID
-            ])
-
-    return {
-        "latest_mkt_date": latest_date,
-        "total_records": len(stocks),
-        "stocks_by_tab": result,
-        "uploaded_files": uploaded_files
-    }
+    return Response(content=payload, media_type="application/json", headers=headers)
 
 
 # ======================================================
@@ -308,6 +257,7 @@ def delete_upload(upload_id: int, db: Session = Depends(get_db)):
         raise HTTPException(404, "Upload not found")
 
     deleted_rows = db.query(StockData).filter(StockData.mkt_date == upload.mkt_date).delete()
+    db.query(MarketIndicatorTree).filter(MarketIndicatorTree.mkt_date == upload.mkt_date).delete()
     delete_file_from_s3(upload.file_path)
     db.delete(upload)
     db.commit()
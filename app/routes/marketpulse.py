@@ -2,7 +2,8 @@ import io
 from datetime import date
 import uuid
 
-import pandas as pd
+from app.utils.lazy import lazy_import
+pd = lazy_import("pandas")
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
@@ -13,40 +14,24 @@ from app.models.marketpulse import (
     StockPulseIndex, StockPulseIndexUpload
 )
 from app.s3_utils import upload_file_to_s3, delete_file_from_s3, get_s3_file_url
+from app.services.datasets import get_dataset
+from app.services.ingest import read_frame, parse_frame, replace_rows
 
 router = APIRouter(prefix="/marketpulse", tags=["marketpulse"])
 
-# ---------------- CSV column order ----------------
-STOCKPULSETABLE_COLUMNS = [
-    "TYPE", "MCAP", "DMA_5", "DMA_21", "DMA_60", "DMA_245",
-    "WK52H_MCAP", "WK52HDT", "WK52L_MCAP", "WK52LDT",
-    "VOL", "DVMA_5", "DVMA_21", "DVMA_60", "DVMA_245",
-    "WK52H_VOL", "WK52HVDT", "WK52L_VOL", "WK52LVDT"
-]
-
-STOCKPULSEINDEX_COLUMNS = [
-    "ID", "TYPE", "TRN_DATE", "MCAP", "FFLT",
-    "DMA_5", "DMA_21", "DMA_60", "DMA_245",
-    "STOCKS", "ADV", "DEC", "UNCHG", "VOL"
-]
-
-NUMERIC_COLUMNS = [
-    "MCAP", "FFLT", "DMA_5", "DMA_21", "DMA_60", "DMA_245",
-    "STOCKS", "ADV", "DEC", "UNCHG", "VOL",
-    "WK52H_MCAP", "WK52L_MCAP", "WK52H_VOL", "WK52L_VOL",
-    "DVMA_5", "DVMA_21", "DVMA_60", "DVMA_245"
-]
-
 TABLE_MAP = {
     "stockpulse_tbl": (StockPulseTable, StockPulseTableUpload),
     "stockpulse_index": (StockPulseIndex, StockPulseIndexUpload),
 }
 
-COLUMN_MAP = {
-    "stockpulse_tbl": STOCKPULSETABLE_COLUMNS,
-    "stockpulse_index": STOCKPULSEINDEX_COLUMNS,
+# ---------------- Dataset declarations (app/services/datasets.py) ----------------
+DATASET_MAP = {
+    "stockpulse_tbl": get_dataset("marketpulse.stockpulse_tbl"),
+    "stockpulse_index": get_dataset("marketpulse.stockpulse_index"),
 }
 
+COLUMN_MAP = {k: d.columns for k, d in DATASET_MAP.items()}
+
 # ---------------- DB Dependency ----------------
 def get_db():
     db = SessionLocal()
@@ -55,36 +40,6 @@ def get_db():
     finally:
         db.close()
 
-# ---------------- CSV Reader ----------------
-def read_csv_safe(file_stream, expected_columns=None):
-    file_stream.seek(0)
-    contents = file_stream.read()
-    if not contents or len(contents.strip()) == 0:
-        raise HTTPException(status_code=404, detail="CSV file is empty or missing")
-
-    file_stream.seek(0)
-    try:
-        df = pd.read_csv(file_stream, header=None, encoding="utf-8")
-    except UnicodeDecodeError:
-        file_stream.seek(0)
-        df = pd.read_csv(file_stream, header=None, encoding="latin1")
-    except pd.errors.EmptyDataError:
-        raise HTTPException(status_code=404, detail="CSV file contains no data")
-
-    df = df.where(pd.notnull(df), None)
-
-    if expected_columns:
-        if len(df.columns) > len(expected_columns):
-            extra = len(df.columns) - len(expected_columns)
-            df.columns = expected_columns + [f"extra_{i}" for i in range(extra)]
-        elif len(df.columns) < len(expected_columns):
-            missing = len(expected_columns) - len(df.columns)
-            df.columns = df.columns.tolist() + [f"col_{i}" for i in range(missing)]
-        else:
-            df.columns = expected_columns
-
-    return df
-
 # ---------------- Upload API ----------------
 @router.post("/upload/")
 async def upload_file(
@@ -102,20 +57,22 @@ async def upload_file(
         raise HTTPException(status_code=400, detail="Only CSV files allowed")
 
     Model, UploadModel = TABLE_MAP[data_type]
-    expected_columns = COLUMN_MAP[data_type]
+    dataset = DATASET_MAP[data_type]
 
     contents = await file.read()
     if not contents:
         raise HTTPException(status_code=400, detail="Uploaded file is empty")
 
-    file_like = io.BytesIO(contents)
-    df = read_csv_safe(file_like, expected_columns)
-    file_like.seek(0)
+    df = read_frame(contents, dataset)
+    records = parse_frame(df, dataset)
+
+    if not records:
+        raise HTTPException(status_code=400, detail="No valid rows found in CSV")
 
     # Upload CSV to S3
     try:
         s3_key = upload_file_to_s3(
-            file_obj=file_like,
+            file_obj=io.BytesIO(contents),
             folder=f"heatmap/{data_type}",
             filename=file.filename
         )
@@ -130,37 +87,12 @@ async def upload_file(
         file_path=s3_key,
     )
 
-    # Prepare database objects for main table
-    model_columns = set(Model.__table__.columns.keys())
-    objects = []
-
-    for _, row in df.iterrows():
-        record = {}
-        for col in expected_columns:
-            if col in model_columns and col != "ID":
-                val = row[col]
-                if col in NUMERIC_COLUMNS:
-                    try:
-                        val = int(float(val)) if val not in (None, "") else 0
-                    except ValueError:
-                        val = 0
-                record[col] = val
-        objects.append(Model(**record))
-
-    if not objects:
-        delete_file_from_s3(s3_key)
-        raise HTTPException(status_code=400, detail="No valid rows found in CSV")
-
     # Insert into DB
     try:
-        # 1️⃣ Delete existing data for this table
-        db.query(Model).delete()
-        db.flush()
-
-        # 2️⃣ Add new data
-        db.bulk_save_objects(objects)
+        # Delete existing data for this table and add the new rows
+        replace_rows(db, dataset, records)
 
-        # 3️⃣ Save upload record
+        # Save upload record
         db.add(upload_entry)
         db.commit()
     except SQLAlchemyError as e:
@@ -175,7 +107,7 @@ async def upload_file(
         "data_type": data_type,
         "file": file.filename,
         "s3_key": s3_key,
-        "rows_inserted": len(objects),
+        "rows_inserted": len(records),
         "file_url": get_s3_file_url(s3_key)
     }
     
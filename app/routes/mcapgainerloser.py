@@ -2,7 +2,8 @@ from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Form
 from sqlalchemy.orm import Session
 from datetime import date
 from uuid import uuid4
-import pandas as pd
+from app.utils.lazy import lazy_import
+pd = lazy_import("pandas")
 import math
 from fastapi.responses import StreamingResponse
 import io 
@@ -23,6 +24,9 @@ from app.s3_utils import (
     get_file_stream_from_s3,
     get_s3_file_url
 )
+from app.services import partitions
+from app.services.datasets import get_dataset
+from app.services.ingest import read_frame, parse_frame, replace_rows
 
 router = APIRouter(prefix="/gainloss", tags=["Gainers / Losers"])
 
@@ -57,30 +61,65 @@ CATEGORIES = {
     "mcap_movers": {
         "data": McapGainersLosers,
         "upload": McapGainersLosersUpload,
-        "cols": [
-            "COMPANY","ISIN","CMP","MCAP_CR","CH_CR","CH_PER",
-            "VOL_NOS","VOL_CH_PER","DAY_HIGH","DAY_LOW",
-            "60DMA","60DMA_PER","245DMA","245DMA_PER","52WKH","52WKL"
-        ]
+        "dataset": get_dataset("gainloss.mcap_movers"),
     },
 
     "up_down_mobile": {
         "data": Upward_DownwardMobile,
         "upload": Upward_DownwardMobileUpload,
-        "cols": [
-            "COMPANY","ISIN","CMP","START","DAYS","CH_PER","PERDAY"
-        ]
+        "dataset": get_dataset("gainloss.up_down_mobile"),
     },
 
     "up_down_trend": {
         "data": Up_DownTrend,
         "upload": Up_DownTrendUpload,
-        "cols": [
-            "COMPANY","ISIN","CMP","5DMA","21DMA","60DMA","245DMA","CH_PER"
-        ]
+        "dataset": get_dataset("gainloss.up_down_trend"),
     }
 }
 
+for _cat in CATEGORIES.values():
+    _cat["cols"] = _cat["dataset"].columns
+
+
+def latest_upload(db: Session, category: str, data_date: date = None):
+    """Newest upload (optionally of one day); a re-upload of a day wins."""
+    UploadModel = CATEGORIES[category]["upload"]
+
+    query = db.query(UploadModel)
+    if data_date is not None:
+        query = query.filter(UploadModel.data_date == data_date)
+
+    return query.order_by(UploadModel.data_date.desc(), UploadModel.id.desc()).first()
+
+
+def upload_rows(db: Session, category: str, upload):
+    """An upload's rows; the data_date filter keeps the read to one partition."""
+    DataModel = CATEGORIES[category]["data"]
+
+    return db.query(DataModel).filter(
+        partitions.on_day(DataModel, upload.data_date),
+        DataModel.group_id == upload.group_id
+    ).all()
+
+
+def rows_to_dicts(rows):
+    records = []
+
+    for r in rows:
+        row = r.__dict__.copy()
+        row.pop("_sa_instance_state", None)
+        records.append(row)
+
+    return records
+
+
+def read_category_file(category: str, filename: str, contents: bytes):
+    if not filename.endswith((".xlsx", ".xls", ".csv")):
+        raise HTTPException(400, "Invalid file type")
+
+    dataset = CATEGORIES[category]["dataset"]
+    return parse_frame(read_frame(contents, dataset), dataset)
+
 
 @router.post("/upload/{category}")
 async def upload_file(
@@ -98,44 +137,14 @@ async def upload_file(
 
     contents = await file.read()
 
+    # parse first: a bad file must not wipe the current data
+    records = read_category_file(category, file.filename, contents)
+
     # upload to S3
     s3_key = upload_file_to_s3(io.BytesIO(contents), f"gainloss/{category}")
 
-    # select models
-    if category == "mcap_movers":
-        DataModel = McapGainersLosers
-        UploadModel = McapGainersLosersUpload
-
-        expected_cols = 16
-        columns = [
-            "COMPANY","ISIN","CMP","MCAP_CR","CH_CR","CH_PER",
-            "VOL_NOS","VOL_CH_PER","DAY_HIGH","DAY_LOW",
-            "60DMA","60DMA_PER","245DMA","245DMA_PER","52WKH","52WKL"
-        ]
-
-    elif category == "up_down_mobile":
-        DataModel = Upward_DownwardMobile
-        UploadModel = Upward_DownwardMobileUpload
-
-        expected_cols = 7
-        columns = [
-            "COMPANY","ISIN","CMP","START","DAYS","CH_PER","PERDAY"
-        ]
-
-    else:
-        DataModel = Up_DownTrend
-        UploadModel = Up_DownTrendUpload
-
-        expected_cols = 8
-        columns = [
-            "COMPANY","ISIN","CMP","5DMA","21DMA","60DMA","245DMA","CH_PER"
-        ]
-
-    # ==============================
-    # 🔥 FULL DELETE (NO CONDITIONS)
-    # ==============================
-    db.query(DataModel).delete(synchronize_session=False)
-    db.commit()
+    DataModel = CATEGORIES[category]["data"]
+    UploadModel = CATEGORIES[category]["upload"]
 
     # save upload record
     upload_record = UploadModel(
@@ -149,92 +158,17 @@ async def upload_file(
     db.add(upload_record)
     db.flush()  # safer than commit here
 
-    # read dataframe
-    try:
-        if file.filename.endswith((".xlsx", ".xls")):
-            df = pd.read_excel(io.BytesIO(contents), header=None)
-        elif file.filename.endswith(".csv"):
-            df = pd.read_csv(io.StringIO(contents.decode("utf-8")), header=None)
-        else:
-            raise HTTPException(400, "Invalid file type")
-    except Exception as e:
-        raise HTTPException(400, f"Failed to read file: {e}")
-
-    if df.shape[1] != expected_cols:
-        raise HTTPException(
-            400,
-            f"{category} file must have exactly {expected_cols} columns"
-        )
-
-    df.columns = columns
-
-    records = []
-
-    for _, r in df.iterrows():
-
-        if category == "mcap_movers":
-
-            records.append(
-                DataModel(
-                    COMPANY=r["COMPANY"],
-                    ISIN=r["ISIN"],
-                    CMP=r["CMP"],
-                    MCAP_CR=r["MCAP_CR"],
-                    CH_CR=r["CH_CR"],
-                    CH_PER=r["CH_PER"],
-                    VOL_NOS=r["VOL_NOS"],
-                    VOL_CH_PER=r["VOL_CH_PER"],
-                    DAY_HIGH=r["DAY_HIGH"],
-                    DAY_LOW=r["DAY_LOW"],
-                    DMA_60=r["60DMA"],
-                    DMA_PER_60=r["60DMA_PER"],
-                    DMA_245=r["245DMA"],
-                    DMA_PER_245=r["245DMA_PER"],
-                    WKH_52=r["52WKH"],
-                    WKL_52=r["52WKL"],
-                    group_id=upload_record.group_id
-                )
-            )
-
-        elif category == "up_down_mobile":
-
-            records.append(
-                DataModel(
-                    COMPANY=r["COMPANY"],
-                    ISIN=r["ISIN"],
-                    CMP=r["CMP"],
-                    START=r["START"],
-                    DAYS=r["DAYS"],
-                    CH_PER=r["CH_PER"],
-                    PERDAY=r["PERDAY"],
-                    group_id=upload_record.group_id
-                )
-            )
-
-        else:
-
-            records.append(
-                DataModel(
-                    COMPANY=r["COMPANY"],
-                    ISIN=r["ISIN"],
-                    CMP=r["CMP"],
-                    DMA_5=r["5DMA"],
-                    DMA_21=r["21DMA"],
-                    DMA_60=r["60DMA"],
-                    DMA_245=r["245DMA"],
-                    CH_PER=r["CH_PER"],
-                    group_id=upload_record.group_id
-                )
-            )
-
     # ==============================
-    # INSERT FRESH DATA
+    # 🔥 REPLACE THIS DAY'S PARTITION, EARLIER DAYS STAY AS HISTORY
     # ==============================
-    db.bulk_save_objects(records)
+    partitions.replace_day(
+        db, DataModel, data_date, records,
+        group_id=upload_record.group_id
+    )
     db.commit()
 
     return {
-        "message": f"{category} uploaded successfully (old data cleared)",
+        "message": f"{category} uploaded successfully (data for {data_date} replaced)",
         "records_inserted": len(records),
         "upload_id": upload_record.id
     }
@@ -271,31 +205,36 @@ def get_latest_data(category: str, db: Session = Depends(get_db)):
 
     validate_category(category)
 
-    UploadModel = CATEGORIES[category]["upload"]
-    DataModel = CATEGORIES[category]["data"]
-
-    latest_upload = (
-        db.query(UploadModel)
-        .order_by(UploadModel.data_date.desc())
-        .first()
-    )
+    upload = latest_upload(db, category)
 
-    if not latest_upload:
+    if not upload:
         return {"latest_data_date": None, "records": [], "count": 0}
 
-    rows = db.query(DataModel).filter(
-        DataModel.group_id == latest_upload.group_id
-    ).all()
+    records = rows_to_dicts(upload_rows(db, category, upload))
 
-    records = []
+    return {
+        "latest_data_date": upload.data_date,
+        "records": records,
+        "count": len(records)
+    }
 
-    for r in rows:
-        row = r.__dict__.copy()
-        row.pop("_sa_instance_state", None)
-        records.append(row)
+
+# ---------------- Data On A Date ----------------
+
+@router.get("/date/{category}/{data_date}")
+def get_data_on(category: str, data_date: date, db: Session = Depends(get_db)):
+
+    validate_category(category)
+
+    upload = latest_upload(db, category, data_date)
+
+    if not upload:
+        raise HTTPException(404, f"No {category} data for {data_date}")
+
+    records = rows_to_dicts(upload_rows(db, category, upload))
 
     return {
-        "latest_data_date": latest_upload.data_date,
+        "data_date": upload.data_date,
         "records": records,
         "count": len(records)
     }
@@ -308,16 +247,9 @@ def get_counts_by_ch_per(category: str, db: Session = Depends(get_db)):
             "Category must be 'up_down_mobile' or 'up_down_trend'"
         )
 
-    UploadModel = CATEGORIES[category]["upload"]
-    DataModel = CATEGORIES[category]["data"]
-
-    latest_upload = (
-        db.query(UploadModel)
-        .order_by(UploadModel.data_date.desc())
-        .first()
-    )
+    upload = latest_upload(db, category)
 
-    if not latest_upload:
+    if not upload:
         return {
             "latest_data_date": None,
             "total_count": 0,
@@ -325,9 +257,7 @@ def get_counts_by_ch_per(category: str, db: Session = Depends(get_db)):
             "down_count": 0
         }
 
-    rows = db.query(DataModel).filter(
-        DataModel.group_id == latest_upload.group_id
-    ).all()
+    rows = upload_rows(db, category, upload)
 
     # count based on CH_PER
     up_count = len([r for r in rows if getattr(r, "CH_PER", 0) > 0])
@@ -342,7 +272,7 @@ def get_counts_by_ch_per(category: str, db: Session = Depends(get_db)):
         down_label = "down_trend"
 
     return {
-        "latest_data_date": latest_upload.data_date,
+        "latest_data_date": upload.data_date,
         "total_count": len(rows),
         up_label: up_count,
         down_label: down_count
@@ -387,28 +317,8 @@ async def update_upload(
             "Category must be 'mcap_movers', 'up_down_mobile', or 'up_down_trend'"
         )
 
-    # select models
-    if category == "mcap_movers":
-        DataModel = McapGainersLosers
-        UploadModel = McapGainersLosersUpload
-        expected_cols = 16
-        columns = [
-            "COMPANY","ISIN","CMP","MCAP_CR","CH_CR","CH_PER",
-            "VOL_NOS","VOL_CH_PER","DAY_HIGH","DAY_LOW",
-            "60DMA","60DMA_PER","245DMA","245DMA_PER","52WKH","52WKL"
-        ]
-
-    elif category == "up_down_mobile":
-        DataModel = Upward_DownwardMobile
-        UploadModel = Upward_DownwardMobileUpload
-        expected_cols = 7
-        columns = ["COMPANY","ISIN","CMP","START","DAYS","CH_PER","PERDAY"]
-
-    else:
-        DataModel = Up_DownTrend
-        UploadModel = Up_DownTrendUpload
-        expected_cols = 8
-        columns = ["COMPANY","ISIN","CMP","5DMA","21DMA","60DMA","245DMA","CH_PER"]
+    DataModel = CATEGORIES[category]["data"]
+    UploadModel = CATEGORIES[category]["upload"]
 
     upload = db.query(UploadModel).filter(
         UploadModel.group_id == group_id
@@ -419,13 +329,33 @@ async def update_upload(
 
     # update metadata
 
+    old_date = upload.data_date
 
-    if data_date:
+    if data_date and data_date != old_date:
+        # rows are keyed (ISIN, data_date): a day that already holds
+        # another upload's rows cannot take this one
+        taken = db.query(DataModel.group_id).filter(
+            partitions.on_day(DataModel, data_date),
+            DataModel.group_id != group_id
+        ).first()
+        if taken:
+            raise HTTPException(
+                409,
+                f"{data_date} already has {category} data; delete that upload first"
+            )
+
+        # the upload's rows move to the new day's partition
+        partitions.ensure_partition(db, DataModel, data_date)
+        db.query(DataModel).filter(
+            partitions.on_day(DataModel, old_date),
+            DataModel.group_id == group_id
+        ).update({DataModel.data_date: data_date}, synchronize_session=False)
         upload.data_date = data_date
 
     if file:
 
         contents = await file.read()
+        records = read_category_file(category, file.filename, contents)
 
         # delete old S3 file
         if upload.file_path:
@@ -437,83 +367,14 @@ async def update_upload(
         upload.file_name = file.filename
         upload.file_path = s3_key
 
-        # read dataframe
-        try:
-            if file.filename.endswith((".xlsx", ".xls")):
-                df = pd.read_excel(io.BytesIO(contents), header=None)
-            elif file.filename.endswith(".csv"):
-                df = pd.read_csv(io.StringIO(contents.decode("utf-8")), header=None)
-            else:
-                raise HTTPException(400, "Invalid file type")
-        except Exception as e:
-            raise HTTPException(400, f"Failed to read file: {e}")
-
-        if df.shape[1] != expected_cols:
-            raise HTTPException(
-                400,
-                f"{category} file must have exactly {expected_cols} columns"
-            )
-
-        df.columns = columns
-
-        # delete old records for this upload
-        db.query(DataModel).filter(
-            DataModel.group_id == group_id
-        ).delete(synchronize_session=False)
-
-        records = []
-
-        for _, r in df.iterrows():
-
-            if category == "mcap_movers":
-                record = DataModel(
-                    COMPANY=r["COMPANY"],
-                    ISIN=r["ISIN"],
-                    CMP=r["CMP"],
-                    MCAP_CR=r["MCAP_CR"],
-                    CH_CR=r["CH_CR"],
-                    CH_PER=r["CH_PER"],
-                    VOL_NOS=r["VOL_NOS"],
-                    VOL_CH_PER=r["VOL_CH_PER"],
-                    DAY_HIGH=r["DAY_HIGH"],
-                    DAY_LOW=r["DAY_LOW"],
-                    DMA_60=r["60DMA"],
-                    DMA_PER_60=r["60DMA_PER"],
-                    DMA_245=r["245DMA"],
-                    DMA_PER_245=r["245DMA_PER"],
-                    WKH_52=r["52WKH"],
-                    WKL_52=r["52WKL"],
-                    group_id=group_id
-                )
-
-            elif category == "up_down_mobile":
-                record = DataModel(
-                    COMPANY=r["COMPANY"],
-                    ISIN=r["ISIN"],
-                    CMP=r["CMP"],
-                    START=r["START"],
-                    DAYS=r["DAYS"],
-                    CH_PER=r["CH_PER"],
-                    PERDAY=r["PERDAY"],
-                    group_id=group_id
-                )
-
-            else:
-                record = DataModel(
-                    COMPANY=r["COMPANY"],
-                    ISIN=r["ISIN"],
-                    CMP=r["CMP"],
-                    DMA_5=r["5DMA"],
-                    DMA_21=r["21DMA"],
-                    DMA_60=r["60DMA"],
-                    DMA_245=r["245DMA"],
-                    CH_PER=r["CH_PER"],
-                    group_id=group_id
-                )
-
-            records.append(record)
-
-        db.bulk_save_objects(records)
+        # replace old records for this upload
+        replace_rows(
+            db, CATEGORIES[category]["dataset"], records,
+            partitions.on_day(DataModel, upload.data_date),
+            DataModel.group_id == group_id,
+            group_id=group_id,
+            data_date=upload.data_date
+        )
 
     db.commit()
 
@@ -543,6 +404,7 @@ def delete_file_upload(
         raise HTTPException(404, "Upload not found")
 
     db.query(DataModel).filter(
+        partitions.on_day(DataModel, upload.data_date),
         DataModel.group_id == group_id
     ).delete(synchronize_session=False)
 
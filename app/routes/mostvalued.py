@@ -3,7 +3,8 @@ from datetime import date
 from uuid import uuid4
 from typing import List, Dict, Any
 
-import pandas as pd
+from app.utils.lazy import lazy_import
+pd = lazy_import("pandas")
 from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException
 from sqlalchemy.orm import Session
 from sqlalchemy import desc
@@ -23,6 +24,7 @@ from app.s3_utils import (
     get_s3_file_url,
     get_file_stream_from_s3
 )
+from app.services.excel_reader import is_excel, read_excel
 
 router = APIRouter(prefix="/mostvalued", tags=["Most Valued"])
 
@@ -47,9 +49,9 @@ def get_models(category: str):
 
 
 def read_file(file_bytes: bytes, expected_cols: int, columns: list):
-    try:
-        df = pd.read_excel(io.BytesIO(file_bytes), header=None)
-    except Exception:
+    if is_excel(file_bytes):
+        df = read_excel(file_bytes)
+    else:
         df = pd.read_csv(io.StringIO(file_bytes.decode("utf-8")), header=None)
 
     if df.shape[1] != expected_cols:
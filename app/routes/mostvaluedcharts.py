@@ -3,7 +3,8 @@ from datetime import date
 from typing import List, Dict, Any
 from uuid import uuid4
 
-import pandas as pd
+from app.utils.lazy import lazy_import
+pd = lazy_import("pandas")
 from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
@@ -22,6 +23,7 @@ from app.s3_utils import (
     get_file_stream_from_s3,
     get_s3_file_url
 )
+from app.services.excel_reader import is_excel, read_excel
 
 router = APIRouter(prefix="/mostvaluedcharts", tags=["Most Valued Charts"])
 
@@ -43,14 +45,14 @@ def get_models(category: str):
         raise HTTPException(400, "Invalid category. Use 'company' or 'house'.")
 
 def read_file_from_bytes(file_bytes: bytes, required_columns: list, category: str):
-    # Read Excel first, fallback to CSV
+    # Excel or CSV, told apart by content
     try:
-        df = pd.read_excel(io.BytesIO(file_bytes), header=None)
-    except Exception:
-        try:
+        if is_excel(file_bytes):
+            df = read_excel(file_bytes)
+        else:
             df = pd.read_csv(io.StringIO(file_bytes.decode("utf-8")), header=None)
-        except Exception:
-            raise HTTPException(400, f"Failed to read {category} file as CSV or Excel.")
+    except Exception:
+        raise HTTPException(400, f"Failed to read {category} file as CSV or Excel.")
 
     df = df.dropna(axis=1, how="all")  # remove empty columns
     df = df.iloc[:, 1:1+len(required_columns)]  # ignore first column
@@ -3,7 +3,8 @@ from datetime import date
 from typing import List, Dict, Any
 from uuid import uuid4
 import math
-import pandas as pd
+from app.utils.lazy import lazy_import
+pd = lazy_import("pandas")
 from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Form
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
@@ -23,6 +24,8 @@ from app.s3_utils import (
     get_file_stream_from_s3,
     get_s3_file_url
 )
+from app.services.excel_reader import is_excel, read_excel
+from app.services.fastread import fetch_rows, json_response
 
 router = APIRouter(prefix="/NewHighLow", tags=["New High / Low"])
 
@@ -68,12 +71,12 @@ def get_models(category: str):
 
 def read_file_bytes(file_bytes: bytes, expected_cols: int, columns: list, category: str):
     try:
-        df = pd.read_excel(io.BytesIO(file_bytes), header=None)
-    except Exception:
-        try:
+        if is_excel(file_bytes):
+            df = read_excel(file_bytes)
+        else:
             df = pd.read_csv(io.StringIO(file_bytes.decode("utf-8")), header=None)
-        except Exception:
-            raise HTTPException(400, f"Failed to read {category} file as CSV or Excel")
+    except Exception:
+        raise HTTPException(400, f"Failed to read {category} file as CSV or Excel")
     if df.shape[1] != expected_cols:
         raise HTTPException(400, f"{category} file must have exactly {expected_cols} columns")
     df.columns = columns
@@ -210,11 +213,8 @@ def get_latest_data_new_high_low(category: str, db: Session = Depends(get_db)):
     if not latest_upload:
         return {"message": "No uploads found", "records": []}
 
-    data_rows = db.query(DataModel).filter(DataModel.group_id == latest_upload.group_id).all()
-    result = [row.__dict__ for row in data_rows]
-    for r in result:
-        r.pop("_sa_instance_state", None)
-    return {"latest_data_date": latest_upload.data_date, "records": result, "count": len(result)}
+    result = fetch_rows(db, DataModel, DataModel.group_id == latest_upload.group_id)
+    return json_response({"latest_data_date": latest_upload.data_date, "records": result, "count": len(result)})
 # -------------------- HIGH / LOW COUNT (fixed for all categories including multi-year TYPE) --------------------
 @router.get("/{category}/high-low/count")
 def get_high_low_count(category: str, db: Session = Depends(get_db)):
@@ -1,12 +1,14 @@
 from fastapi import APIRouter, HTTPException, Depends
 from sqlalchemy.orm import Session
 from dotenv import load_dotenv
-import requests
 import os
 from datetime import datetime, timedelta
 
 from app.database import SessionLocal
 from app.models.news import MarketNews
+from app.utils.lazy import lazy_import
+
+requests = lazy_import("requests")
 
 load_dotenv()
 
@@ -1,8 +1,9 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Form
+from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Form, Query
 from sqlalchemy.orm import Session
 from datetime import datetime, date
 from typing import List
-import pandas as pd
+from app.utils.lazy import lazy_import
+pd = lazy_import("pandas")
 import math
 import io
 
@@ -12,7 +13,12 @@ from app.models.portfolio import (
     PortfolioStocs,
     Stock_MovementsUploadHistory
 )
+from app.models.heatmap import Company as HeatmapCompany
+from app.models.stocktrack import StockTrack
 from app.s3_utils import upload_file_to_s3, get_s3_file_url,delete_file_from_s3,get_file_stream_from_s3
+from app.services import partitions
+from app.services.fastread import json_response
+from app.utils.batch import parse_keys, any_of
 from fastapi.responses import StreamingResponse
 
 from pydantic import BaseModel
@@ -76,7 +82,18 @@ def clean_val(val):
         return f
     except:
         return None
-from sqlalchemy import text
+from sqlalchemy import text, select, cast, Float, true
+
+DAY_COLUMNS = ["Day_1", "Day_2", "Day_3", "Day_4", "Day_5"]
+
+TRACK_COLUMNS = [
+    StockTrack.mkt_date.label("track_date"),
+    *[
+        getattr(StockTrack, c).label(c)
+        for c in ("wk52", "multi_yr", "circuit", "mobility", "trend",
+                  "wk_bust", "mth_bust", "qtr_bust", "yr_bust")
+    ],
+]
 
 # ------------------------
 # Upload CSV and reset stock movements
@@ -118,59 +135,57 @@ async def upload_stock_csv(
     isin_col = 29
     ch_col = 5
 
-    inserted = 0
-    updated = 0
-
-    for _, row in df.iterrows():
-
-        company = str(row[company_col]).strip()
-        isin = str(row[isin_col]).strip()
-
-        if not company or not isin:
-            continue
-
-        try:
-            ch_val = float(row[ch_col])
-
-            if math.isnan(ch_val) or math.isinf(ch_val):
-                continue
-
-            ch = round(ch_val, 2)
-
-        except:
-            continue
-
-        # Check existing stock
-        stock = db.query(Stocks_Movements).filter(
-            Stocks_Movements.isin == isin
-        ).first()
-
-        if stock:
-            # Shift previous days
-            stock.Day_5 = stock.Day_4
-            stock.Day_4 = stock.Day_3
-            stock.Day_3 = stock.Day_2
-            stock.Day_2 = stock.Day_1
-            stock.Day_1 = ch
-
-            stock.company = company
-
-            updated += 1
-
-        else:
-            # New stock entry
-            new_stock = Stocks_Movements(
-                company=company,
-                isin=isin,
-                Day_1=ch,
-                Day_2=None,
-                Day_3=None,
-                Day_4=None,
-                Day_5=None
-            )
+    # ------------------------
+    # Today's changes, one row per ISIN
+    # ------------------------
+    stage = pd.DataFrame({
+        "company": df[company_col].astype(str).str.strip(),
+        "isin": df[isin_col].where(df[isin_col].notna(), "").astype(str).str.strip(),
+        "ch": pd.to_numeric(df[ch_col], errors="coerce").round(2),
+    })
+
+    stage = stage[
+        (stage["company"] != "")
+        & (stage["isin"] != "")
+        & stage["ch"].notna()
+        & ~stage["ch"].isin([math.inf, -math.inf])
+    ].drop_duplicates("isin", keep="last")
+
+    # ------------------------
+    # Set-based shift: stage -> UPDATE ... FROM -> INSERT ... ON CONFLICT
+    # ------------------------
+    db.execute(text("""
+        CREATE TEMP TABLE stocks_movements_stage (
+            isin    VARCHAR PRIMARY KEY,
+            company VARCHAR(255) NOT NULL,
+            ch      NUMERIC(20, 1)
+        ) ON COMMIT DROP
+    """))
+
+    if not stage.empty:
+        db.execute(
+            text("INSERT INTO stocks_movements_stage (isin, company, ch) VALUES (:isin, :company, :ch)"),
+            stage.to_dict(orient="records")
+        )
 
-            db.add(new_stock)
-            inserted += 1
+    updated = db.execute(text("""
+        UPDATE stocks_movements m
+        SET "Day_5" = m."Day_4",
+            "Day_4" = m."Day_3",
+            "Day_3" = m."Day_2",
+            "Day_2" = m."Day_1",
+            "Day_1" = s.ch,
+            company = s.company
+        FROM stocks_movements_stage s
+        WHERE m.isin = s.isin
+    """)).rowcount
+
+    inserted = db.execute(text("""
+        INSERT INTO stocks_movements (company, isin, "Day_1")
+        SELECT company, isin, ch
+        FROM stocks_movements_stage
+        ON CONFLICT (isin) DO NOTHING
+    """)).rowcount
 
     db.commit()
 
@@ -222,6 +237,27 @@ def get_stock_movements(db: Session = Depends(get_db)):
         } for s in stocks
     ]
 
+# ------------------------
+# GET many stocks by ISIN (keyed map, null when unknown)
+# ------------------------
+@router.get("/stock/batch")
+def get_stocks_by_isins(isins: List[str] = Query(...), db: Session = Depends(get_db)):
+    keys = parse_keys(isins)
+
+    result = {k: None for k in keys}
+    for stock in db.query(Stocks_Movements).filter(any_of(Stocks_Movements.isin, keys)):
+        result[stock.isin] = {
+            "company": stock.company,
+            "isin": stock.isin,
+            "Day_1": clean_val(stock.Day_1),
+            "Day_2": clean_val(stock.Day_2),
+            "Day_3": clean_val(stock.Day_3),
+            "Day_4": clean_val(stock.Day_4),
+            "Day_5": clean_val(stock.Day_5),
+        }
+
+    return result
+
 # ------------------------
 # GET a single stock by ISIN
 # ------------------------
@@ -271,6 +307,67 @@ def add_portfolio_stock(data: PortfolioCreate, db: Session = Depends(get_db)):
 def get_portfolio(userid: int, db: Session = Depends(get_db)):
     return db.query(PortfolioStocs).filter(PortfolioStocs.userid == userid).all()
 
+# ------------------------
+# Portfolio view: holdings + movements + heatmap quote + stock track, one query
+# ------------------------
+@router.get("/portfolio/{userid}/view")
+def get_portfolio_view(userid: int, db: Session = Depends(get_db)):
+    quote = (
+        select(
+            cast(HeatmapCompany.CMP, Float).label("cmp"),
+            cast(HeatmapCompany.MCAP, Float).label("mcap"),
+            cast(HeatmapCompany.P_E, Float).label("p_e"),
+        )
+        .where(HeatmapCompany.ISIN == PortfolioStocs.isin, partitions.is_latest(HeatmapCompany))
+        .order_by(HeatmapCompany.pk_id.desc())
+        .limit(1)
+        .lateral("quote")
+    )
+
+    track = (
+        select(*TRACK_COLUMNS)
+        .where(StockTrack.isin == PortfolioStocs.isin, partitions.is_latest(StockTrack))
+        .order_by(StockTrack.id.desc())
+        .limit(1)
+        .lateral("track")
+    )
+
+    stmt = (
+        select(
+            PortfolioStocs.id,
+            PortfolioStocs.userid,
+            PortfolioStocs.company,
+            PortfolioStocs.isin,
+            PortfolioStocs.added_at,
+            *[cast(getattr(Stocks_Movements, d), Float).label(d) for d in DAY_COLUMNS],
+            quote.c.cmp,
+            quote.c.mcap,
+            quote.c.p_e,
+            *[track.c[c.key] for c in TRACK_COLUMNS],
+        )
+        .select_from(PortfolioStocs)
+        .outerjoin(Stocks_Movements, Stocks_Movements.isin == PortfolioStocs.isin)
+        .outerjoin(quote, true())
+        .outerjoin(track, true())
+        .where(PortfolioStocs.userid == userid)
+        .order_by(PortfolioStocs.added_at)
+    )
+
+    holdings = []
+    for r in db.execute(stmt).mappings():
+        holdings.append({
+            "id": r["id"],
+            "userid": r["userid"],
+            "company": r["company"],
+            "isin": r["isin"],
+            "added_at": r["added_at"],
+            "movement": {d: r[d] for d in DAY_COLUMNS},
+            "quote": {"cmp": r["cmp"], "mcap": r["mcap"], "p_e": r["p_e"]},
+            "track": {c.key: r[c.key] for c in TRACK_COLUMNS},
+        })
+
+    return json_response({"userid": userid, "count": len(holdings), "holdings": holdings})
+
 # ------------------------
 # Delete a stock from user portfolio
 # ------------------------
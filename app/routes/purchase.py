@@ -3,7 +3,8 @@ from decimal import Decimal
 from fastapi import (
     APIRouter,
     Depends,
-    HTTPException
+    HTTPException,
+    Query
 )
 
 from sqlalchemy.orm import Session
@@ -35,6 +36,12 @@ from app.schemas.purchase import PaymentVerifyRequest
 from app.services.razorpay_service import (
     verify_signature
 )
+from app.services.entitlements import (
+    get_entitlements,
+    purchased_among,
+    invalidate
+)
+from app.utils.batch import parse_keys
 from app.core.config import settings
 router = APIRouter(
     prefix="/purchase",
@@ -107,23 +114,13 @@ def create_purchase(
         # 3. Check Already Purchased
         # -------------------------------------------------
 
-        already_purchased = []
-
-        for report in reports:
+        owned = purchased_among(db, current_user.userid, document_ids)
 
-            exists = (
-                db.query(PurchasedDocument)
-                .filter(
-                    PurchasedDocument.user_id == current_user.userid,
-                    PurchasedDocument.document_id == report.document_id
-                )
-                .first()
-            )
-
-            if exists:
-                already_purchased.append(
-                    report.document_id
-                )
+        already_purchased = [
+            report.document_id
+            for report in reports
+            if report.document_id in owned
+        ]
 
         if already_purchased:
 
@@ -286,6 +283,8 @@ def verify_payment(
         # ---------------------------------------------
         # 1. Find Purchase Order
         # ---------------------------------------------
+        # Row lock: the webhook's payment.captured grant takes the same
+        # lock, so verify and webhook never both insert the documents.
 
         order = (
             db.query(PurchaseOrder)
@@ -293,6 +292,7 @@ def verify_payment(
                 PurchaseOrder.razorpay_order_id == request.razorpay_order_id,
                 PurchaseOrder.user_id == current_user.userid
             )
+            .with_for_update()
             .first()
         )
 
@@ -345,31 +345,36 @@ def verify_payment(
         # 5. Save Purchased Documents
         # ---------------------------------------------
 
-        for item in request.documents:
+        document_ids = list(dict.fromkeys(
+            item.document_id for item in request.documents
+        ))
 
-            report = (
-                db.query(CompanyFile)
-                .filter(
-                    CompanyFile.document_id == item.document_id
-                )
-                .first()
+        reports = (
+            db.query(CompanyFile)
+            .filter(
+                CompanyFile.document_id.in_(document_ids)
             )
+            .all()
+        ) if document_ids else []
 
-            if not report:
-                continue
-
-            already_exists = (
-                db.query(PurchasedDocument)
+        already_owned = {
+            document_id
+            for (document_id,) in (
+                db.query(PurchasedDocument.document_id)
                 .filter(
                     PurchasedDocument.user_id == current_user.userid,
-                    PurchasedDocument.document_id == report.document_id
+                    PurchasedDocument.document_id.in_(document_ids)
                 )
-                .first()
             )
+        } if document_ids else set()
+
+        for report in reports:
 
-            if already_exists:
+            if report.document_id in already_owned:
                 continue
 
+            already_owned.add(report.document_id)
+
             purchased = PurchasedDocument(
                 purchase_order_id=order.id,
                 user_id=current_user.userid,
@@ -388,6 +393,8 @@ def verify_payment(
 
         db.commit()
 
+        invalidate(current_user.userid)
+
         return {
             "success": True,
             "message": "Payment verified successfully",
@@ -422,26 +429,7 @@ def check_purchase(
     try:
 
 
-        purchase = (
-
-            db.query(PurchasedDocument)
-
-            .filter(
-
-                PurchasedDocument.user_id
-                ==
-                current_user.userid,
-
-
-                PurchasedDocument.document_id
-                ==
-                document_id
-
-            )
-
-            .first()
-
-        )
+        owned = purchased_among(db, current_user.userid, [document_id])
 
 
         return {
@@ -452,7 +440,7 @@ def check_purchase(
             document_id,
 
             "purchased":
-            purchase is not None
+            document_id in owned
 
         }
 
@@ -468,6 +456,38 @@ def check_purchase(
 
         )
         
+# =====================================================
+# ENTITLEMENTS (bulk purchase check)
+# =====================================================
+
+@router.get("/entitlements")
+def get_user_entitlements(
+    document_ids: list[str] | None = Query(None),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    owned = get_entitlements(db, current_user.userid)
+
+    # Without document_ids: every purchased id. With them: a
+    # {document_id: purchased} map for just those ids (badge rendering).
+    if not document_ids:
+        return {
+            "success": True,
+            "total": len(owned),
+            "document_ids": sorted(owned)
+        }
+
+    keys = parse_keys(document_ids, name="document_ids")
+
+    return {
+        "success": True,
+        "purchased": {
+            document_id: document_id in owned
+            for document_id in keys
+        }
+    }
+
+
 @router.get("/history")
 def purchase_history(
 
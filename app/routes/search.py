@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.services import search_index
+from app.services.fastread import json_response
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+# ---------------- DB Dependency ----------------
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# ---------------- Company type-ahead ----------------
+@router.get("/companies")
+def search_companies(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=search_index.MAX_LIMIT),
+    db: Session = Depends(get_db),
+):
+    """
+    Ranked company matches across heatmap, IPO, report and IPO-tracker
+    data: exact name / symbol / ISIN, then name prefix, word prefix,
+    substring and finally typo-tolerant matches; larger MCAP first.
+    """
+    index = search_index.get_index(db)
+    data = index.search(q, limit)
+
+    return json_response({
+        "query": q,
+        "count": len(data),
+        "data": data,
+    })
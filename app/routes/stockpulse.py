@@ -2,8 +2,9 @@
 from uuid import uuid4
 from datetime import date
 from typing import List, Optional
-import numpy as np
-import pandas as pd
+from app.utils.lazy import lazy_import
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
 from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
@@ -11,8 +12,9 @@ from sqlalchemy import desc
 from sqlalchemy import and_
 from app.database import SessionLocal
 from app.models.stockpulse import StockPulseData, StockPulseUpload
-from app.schemas.stockpulse import StockPulseUploadSchema, StockPulseLatestResponse
+from app.schemas.stockpulse import StockPulseUploadSchema, StockPulseLatestResponse, StockPulseDataSchema
 from app.s3_utils import upload_file_to_s3, delete_file_from_s3, get_file_stream_from_s3
+from app.services.fastread import fetch_rows, json_response
 
 router = APIRouter(prefix="/stockpulse", tags=["StockPulse"])
 
@@ -26,7 +28,7 @@ def get_db():
 
 
 # -------------------- FILE READER --------------------
-def read_stockpulse_file(file_obj) -> pd.DataFrame:
+def read_stockpulse_file(file_obj) -> "pd.DataFrame":
     """Read CSV or Excel file from file-like object."""
     try:
         return pd.read_csv(file_obj, header=None)
@@ -198,16 +200,18 @@ def latest_stockpulse(db: Session = Depends(get_db)):
     if not latest:
         raise HTTPException(404, "No uploads found")
 
-    records = db.query(StockPulseData).filter(
+    records = fetch_rows(
+        db, StockPulseData,
         StockPulseData.data_date == latest.data_date,
         StockPulseData.type == latest.data_type,
-    ).all()
+        fields=list(StockPulseDataSchema.model_fields),
+    )
 
-    return {
+    return json_response({
         "data_date": latest.data_date,
         "type": latest.data_type,
         "records": records,
-    }
+    })
 from sqlalchemy import and_
 
 @router.get("/hotstocks")
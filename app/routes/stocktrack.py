@@ -1,14 +1,19 @@
 import io
 from datetime import date
 from uuid import uuid4
-from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException
+from typing import List
+from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException, Query
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-import pandas as pd
+from app.utils.lazy import lazy_import
+pd = lazy_import("pandas")
 
 from app.database import SessionLocal
 from app.models.stocktrack import StockTrack, StockTrackUpload
 from app.s3_utils import upload_file_to_s3, delete_file_from_s3, get_file_stream_from_s3
+from app.services import partitions
+from app.services.excel_reader import is_excel, read_excel
+from app.utils.batch import parse_keys, any_of
 
 router = APIRouter(prefix="/stocktrack", tags=["Stock Track"])
 
@@ -40,12 +45,12 @@ async def upload_stocktrack(
 
     # Read file
     try:
-        df = pd.read_excel(io.BytesIO(file_bytes), header=None)
-    except Exception:
-        try:
+        if is_excel(file_bytes):
+            df = read_excel(file_bytes)
+        else:
             df = pd.read_csv(io.StringIO(file_bytes.decode("utf-8")), header=None)
-        except Exception:
-            raise HTTPException(400, "Invalid file format")
+    except Exception:
+        raise HTTPException(400, "Invalid file format")
 
     headers = ["ID","ISIN", "WK52", "MULTI_YR", "CIRCUIT", "MOBILITY", "TREND",
                "WK_BUST", "MTH_BUST", "QTR_BUST", "YR_BUST"]
@@ -55,37 +60,28 @@ async def upload_stocktrack(
 
     df.columns = headers
 
-    # Delete existing data 
-    db.query(StockTrack).delete()
-    db.commit()
-
-    # Insert records
     records = []
     for _, row in df.iterrows():
         if not row["ISIN"]:
             continue
 
-        records.append(
-            StockTrack(
-                mkt_date=mkt_date,
-                isin=safe_strip(row["ISIN"]),
-                wk52=safe_strip(row["WK52"]),
-                multi_yr=safe_strip(row["MULTI_YR"]),
-                circuit=safe_strip(row["CIRCUIT"]),
-                mobility=safe_strip(row["MOBILITY"]),
-                trend=safe_strip(row["TREND"]),
-                wk_bust=safe_strip(row["WK_BUST"]),
-                mth_bust=safe_strip(row["MTH_BUST"]),
-                qtr_bust=safe_strip(row["QTR_BUST"]),
-                yr_bust=safe_strip(row["YR_BUST"]),
-            )
-        )
-
-    if records:
-        db.bulk_save_objects(records)
-        db.commit()
-
-    # Save upload record
+        records.append(dict(
+            isin=safe_strip(row["ISIN"]),
+            wk52=safe_strip(row["WK52"]),
+            multi_yr=safe_strip(row["MULTI_YR"]),
+            circuit=safe_strip(row["CIRCUIT"]),
+            mobility=safe_strip(row["MOBILITY"]),
+            trend=safe_strip(row["TREND"]),
+            wk_bust=safe_strip(row["WK_BUST"]),
+            mth_bust=safe_strip(row["MTH_BUST"]),
+            qtr_bust=safe_strip(row["QTR_BUST"]),
+            yr_bust=safe_strip(row["YR_BUST"]),
+        ))
+
+    # Replace this market date's partition only, with the upload record,
+    # in one transaction; earlier dates stay as history
+    partitions.replace_day(db, StockTrack, mkt_date, records)
+
     upload_row = StockTrackUpload(
         mkt_date=mkt_date,
         file_name=file.filename,
@@ -155,10 +151,8 @@ def delete_stocktrack_upload(upload_id: int, db: Session = Depends(get_db)):
     if not upload:
         raise HTTPException(404, "Upload not found")
 
-    # ✅ delete stock data using mkt_date
-    db.query(StockTrack).filter(
-        StockTrack.mkt_date == upload.mkt_date
-    ).delete(synchronize_session=False)
+    # ✅ delete stock data using mkt_date (drops that date's partition)
+    partitions.drop_day(db, StockTrack, upload.mkt_date)
 
     # ✅ delete file from S3
     if upload.file_path:
@@ -173,7 +167,7 @@ def delete_stocktrack_upload(upload_id: int, db: Session = Depends(get_db)):
 # -------------------- GET ALL STOCKS --------------------
 @router.get("/stocks")
 def get_all_stocks(db: Session = Depends(get_db)):
-    stocks = db.query(StockTrack).order_by(StockTrack.id).all()
+    stocks = db.query(StockTrack).filter(partitions.is_latest(StockTrack)).order_by(StockTrack.id).all()
     return [
         {
             "id": s.id,
@@ -194,11 +188,7 @@ def get_all_stocks(db: Session = Depends(get_db)):
 
 
 # -------------------- GET STOCK BY ISIN --------------------
-@router.get("/stocks/{isin}")
-def get_stock_by_isin(isin: str, db: Session = Depends(get_db)):
-    stock = db.query(StockTrack).filter(StockTrack.isin == isin).first()
-    if not stock:
-        raise HTTPException(status_code=404, detail="Stock not found")
+def stock_track_dict(stock):
     return {
         "id": stock.id,
         "mkt_date": stock.mkt_date,
@@ -215,3 +205,44 @@ def get_stock_by_isin(isin: str, db: Session = Depends(get_db)):
     }
 
 
+# -------------------- BATCH BY ISIN --------------------
+@router.get("/stocks/batch")
+def get_stocks_by_isins(isins: List[str] = Query(...), db: Session = Depends(get_db)):
+    keys = parse_keys(isins)
+
+    result = {k: None for k in keys}
+    for stock in db.query(StockTrack).filter(
+        any_of(StockTrack.isin, keys), partitions.is_latest(StockTrack)
+    ):
+        if result.get(stock.isin) is None:
+            result[stock.isin] = stock_track_dict(stock)
+
+    return result
+
+
+@router.get("/stocks/{isin}")
+def get_stock_by_isin(isin: str, db: Session = Depends(get_db)):
+    stock = db.query(StockTrack).filter(
+        StockTrack.isin == isin, partitions.is_latest(StockTrack)
+    ).first()
+    if not stock:
+        raise HTTPException(status_code=404, detail="Stock not found")
+    return stock_track_dict(stock)
+
+
+# -------------------- HISTORY BY ISIN --------------------
+@router.get("/stocks/{isin}/history")
+def get_stock_history(
+    isin: str,
+    start: date | None = None,
+    end: date | None = None,
+    db: Session = Depends(get_db)
+):
+    stocks = db.query(StockTrack).filter(
+        StockTrack.isin == isin, *partitions.between(StockTrack, start, end)
+    ).order_by(StockTrack.mkt_date).all()
+    if not stocks:
+        raise HTTPException(status_code=404, detail="Stock not found")
+    return [stock_track_dict(s) for s in stocks]
+
+
@@ -1,5 +1,6 @@
 # app/routes/volumemoving.py
 
+from typing import List
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query
 from sqlalchemy.orm import Session
 from datetime import date, timedelta, datetime
@@ -8,6 +9,7 @@ from sqlalchemy import func
 from app.models.volumemoving import VolumeMoving
 from app.database import SessionLocal
 from app.s3_utils import upload_file_to_s3, delete_file_from_s3, get_file_stream_from_s3
+from app.utils.batch import parse_keys, any_of
 import io
 router = APIRouter(prefix="/volumemoving", tags=["VolumeMoving"])
 
@@ -132,6 +134,31 @@ def upload_csv(file: UploadFile = File(...), db: Session = Depends(get_db)):
         db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
+# ----------------------
+# Get Last 2 Years Volume Data for many ISINs
+# ----------------------
+@router.get("/graph/isin/batch")
+def get_graph_data_by_isins(isins: List[str] = Query(...), db: Session = Depends(get_db)):
+
+    keys = parse_keys(isins)
+    two_years_ago = date.today() - timedelta(days=730)
+
+    rows = (
+        db.query(VolumeMoving.ISIN, VolumeMoving.TRN_DATE, VolumeMoving.CURVOL)
+        .filter(any_of(VolumeMoving.ISIN, keys))
+        .filter(VolumeMoving.TRN_DATE >= two_years_ago)
+        .order_by(VolumeMoving.ISIN, VolumeMoving.TRN_DATE)
+        .all()
+    )
+
+    result = {k: {"dates": [], "CURVOL": []} for k in keys}
+    for isin, trn_date, curvol in rows:
+        result[isin]["dates"].append(trn_date.isoformat())
+        result[isin]["CURVOL"].append(int(curvol))
+
+    return result
+
+
 # ----------------------
 # Get Last 2 Years Volume Data by ISIN
 # ----------------------
@@ -3,7 +3,8 @@ from datetime import date
 from typing import List
 from uuid import uuid4
 import math
-import pandas as pd
+from app.utils.lazy import lazy_import
+pd = lazy_import("pandas")
 from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Form
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
@@ -21,6 +22,8 @@ from app.s3_utils import (
     get_file_stream_from_s3,
     get_s3_file_url
 )
+from app.services.datasets import get_dataset
+from app.services.ingest import read_frame, parse_frame, replace_rows
 
 router = APIRouter(prefix="/VolumeTrade", tags=["VolumeTrade Data"])
 
@@ -39,36 +42,20 @@ TAB_MODEL_MAPPING = {
     "trade": VolumeTradetrade
 }
 
-COLUMN_MAPPING = {
-    "volume": [
-        "company","isin","mcap","cmp","volume","spurt","chper",
-        "five_dvma","twentyone_dvma","sixty_dvma",
-        "two_four_five_dvma","five_two_wkhv","five_two_wklv"
-    ],
-    "value": [
-        "company","isin","mcap","cmp","value","spurt","chper",
-        "five_dvma","twentyone_dvma","sixty_dvma",
-        "two_four_five_dvma","five_two_wkhv","five_two_wklv"
-    ],
-    "trade": [
-        "company","isin","mcap","cmp","trade","spurt","chper",
-        "five_dvma","twentyone_dvma","sixty_dvma",
-        "two_four_five_dvma","five_two_wkhv","five_two_wklv"
-    ]
+# Column order declared once in app/services/datasets.py
+DATASET_MAP = {
+    tab: get_dataset(f"volumetrade.{tab}")
+    for tab in TAB_MODEL_MAPPING
 }
 
+COLUMN_MAPPING = {tab: d.columns for tab, d in DATASET_MAP.items()}
+
 def clean_nan(val):
     return None if isinstance(val, float) and math.isnan(val) else val
 
 def read_file_bytes(file_bytes: bytes, data_type: str):
-    if file_bytes.startswith(b'\x50\x4B\x03\x04') or file_bytes[:2] == b'PK':  # Excel xlsx zip header
-        df = pd.read_excel(io.BytesIO(file_bytes), header=None)
-    else:
-        df = pd.read_csv(io.StringIO(file_bytes.decode("utf-8")), header=None)
-    if df.shape[1] != 13:
-        raise HTTPException(400, f"{data_type} file must have 13 columns")
-    df.columns = COLUMN_MAPPING[data_type]
-    return df.where(pd.notnull(df), None)
+    dataset = DATASET_MAP[data_type]
+    return parse_frame(read_frame(file_bytes, dataset), dataset)
 
 def generate_s3_key(data_type: str, filename: str):
     return f"volumetrade/{data_type}/{uuid4()}_{filename}"
@@ -86,15 +73,19 @@ async def upload_volume_trade(
         raise HTTPException(400, "Number of files and data_types must match")
 
     group_id = str(uuid4())
-    all_records = []
 
+    # Validate + parse every file before anything is written
+    parsed = []
     for file, data_type in zip(files, data_types):
         if data_type not in TAB_MODEL_MAPPING:
             raise HTTPException(400, f"Invalid data_type: {data_type}")
 
-        Model = TAB_MODEL_MAPPING[data_type]
         file_bytes = await file.read()
+        parsed.append((file, data_type, file_bytes, read_file_bytes(file_bytes, data_type)))
+
+    records_by_type = {}
 
+    for file, data_type, file_bytes, records in parsed:
         # Upload to S3
         s3_key = upload_file_to_s3(
             io.BytesIO(file_bytes),
@@ -112,34 +103,17 @@ async def upload_volume_trade(
         db.add(upload_record)
         db.flush()  # important (avoid commit inside loop)
 
-        # Read file data
-        df = read_file_bytes(file_bytes, data_type)
-
-        for _, row in df.iterrows():
-            all_records.append(
-                Model(
-                    data_date=data_date,
-                    **row.to_dict(),
-                    group_id=group_id
-                )
-            )
+        records_by_type.setdefault(data_type, []).extend(records)
 
     # ==============================
-    # 💣 DELETE OLD DATA FIRST
+    # 💣 DELETE OLD DATA + 🔥 INSERT NEW DATA
     # ==============================
-    for data_type in set(data_types):
-        Model = TAB_MODEL_MAPPING[data_type]
-
-        # OPTION 1 (ORM delete)
-        db.query(Model).delete(synchronize_session=False)
-
-        # OPTION 2 (FASTER - recommended)
-        # db.execute(text(f"TRUNCATE TABLE {Model.__tablename__} RESTART IDENTITY CASCADE"))
+    for data_type, records in records_by_type.items():
+        replace_rows(
+            db, DATASET_MAP[data_type], records,
+            data_date=data_date, group_id=group_id
+        )
 
-    # ==============================
-    # 🔥 INSERT NEW DATA
-    # ==============================
-    db.bulk_save_objects(all_records)
     db.commit()
 
     return {
@@ -236,24 +210,25 @@ async def update_upload_group(
 
         Model = TAB_MODEL_MAPPING[upload.data_type]
 
+        # Read new data (validates before the old file is dropped)
+        file_bytes = await new_file.read()
+        records = read_file_bytes(file_bytes, upload.data_type)
+
         # Delete old S3 file
         if upload.file_path:
             delete_file_from_s3(upload.file_path)
 
         # Upload new file
-        file_bytes = await new_file.read()
         s3_key = upload_file_to_s3(io.BytesIO(file_bytes), generate_s3_key(upload.data_type, new_file.filename))
         upload.file_name = new_file.filename
         upload.file_path = s3_key
 
-        # Delete old data
-        db.query(Model).filter(Model.group_id == group_id).delete(synchronize_session=False)
-
-        # Read new data
-        df = read_file_bytes(file_bytes, upload.data_type)
-        records = [Model(**row.to_dict(), data_date=upload.data_date, group_id=group_id)
-                   for _, row in df.iterrows()]
-        db.bulk_save_objects(records)
+        # Replace old data for this group
+        replace_rows(
+            db, DATASET_MAP[upload.data_type], records,
+            Model.group_id == group_id,
+            data_date=upload.data_date, group_id=group_id
+        )
 
     db.commit()
     return {"message": "Upload group updated successfully", "group_id": group_id}
@@ -1,5 +1,3 @@
-import json
-
 from fastapi import (
     APIRouter,
     Request,
@@ -12,16 +10,10 @@ from sqlalchemy.orm import Session
 
 from app.database import SessionLocal
 
-from app.models.purchase import (
-    PurchaseOrder,
-    PurchasedDocument
-)
-
-from app.models.file import CompanyFile
-
 from app.services.razorpay_service import (
     verify_webhook_signature
 )
+from app.services.payment_events import process_event
 
 
 router = APIRouter(
@@ -44,6 +36,8 @@ async def razorpay_webhook(
 
     x_razorpay_signature: str = Header(None),
 
+    x_razorpay_event_id: str = Header(None),
+
     db: Session = Depends(get_db)
 
 ):
@@ -99,139 +93,32 @@ async def razorpay_webhook(
 
 
         # -----------------------------------------
-        # 3. Parse Event
-        # -----------------------------------------
-
-
-        payload = json.loads(body)
-
-
-
-        event = payload.get(
-            "event"
-        )
-
-
-
-        # -----------------------------------------
-        # 4. Payment Captured
+        # 3. Log + Apply (one transaction)
         # -----------------------------------------
+        #
+        # Retries of an event already in webhook_events stop at the
+        # conflicting insert; payment.captured marks the order PAID and
+        # grants its documents, payment.failed marks it FAILED.
 
 
-        if event == "payment.captured":
-
-
-            payment = (
-
-                payload
-                ["payload"]
-                ["payment"]
-                ["entity"]
-
-            )
-
-
-            razorpay_payment_id = (
-                payment["id"]
-            )
-
-
-            razorpay_order_id = (
-                payment["order_id"]
-            )
-
-
-
-            order = (
-
-                db.query(PurchaseOrder)
-
-                .filter(
-
-                    PurchaseOrder.razorpay_order_id
-                    ==
-                    razorpay_order_id
-
-                )
-
-                .first()
-
-            )
-
-
-
-            if order:
+        applied = process_event(
 
+            db,
 
-                order.status = "PAID"
-
-
-                order.razorpay_payment_id = (
-                    razorpay_payment_id
-                )
-
-
-
-                db.commit()
-
-
-
-        # -----------------------------------------
-        # 5. Payment Failed
-        # -----------------------------------------
-
-
-        elif event == "payment.failed":
-
-
-            payment = (
-
-                payload
-                ["payload"]
-                ["payment"]
-                ["entity"]
-
-            )
-
-
-            razorpay_order_id = (
-                payment.get("order_id")
-            )
-
-
-
-            order = (
-
-                db.query(PurchaseOrder)
-
-                .filter(
-
-                    PurchaseOrder.razorpay_order_id
-                    ==
-                    razorpay_order_id
-
-                )
-
-                .first()
-
-            )
-
-
-
-            if order:
-
-
-                order.status = "FAILED"
+            body,
 
+            x_razorpay_event_id
 
-                db.commit()
+        )
 
 
 
         return {
 
 
-            "success": True
+            "success": True,
+
+            "duplicate": not applied
 
         }
 
@@ -261,4 +148,4 @@ async def razorpay_webhook(
 
             detail="Webhook processing failed"
 
-        )
\ No newline at end of file
+        )
@@ -1,18 +1,42 @@
 import io
-import boto3
+import threading
 from fastapi import UploadFile, HTTPException
 from botocore.exceptions import BotoCoreError, ClientError
 from app.config import S3_BUCKET, AWS_REGION, AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY
 import os
 import uuid
-from botocore.client import Config
+from app.core.metrics import instrument_s3
 
-s3 = boto3.client(
-    "s3",
-    aws_access_key_id=AWS_ACCESS_KEY_ID,
-    aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
-    region_name=AWS_REGION,
-config=Config(s3={'addressing_style': 'virtual'}, signature_version='s3v4'))
+_s3 = None
+_s3_lock = threading.Lock()
+
+
+def get_s3():
+    """boto3 S3 client, built on first use (boto3 is slow to import)."""
+    global _s3
+    if _s3 is None:
+        with _s3_lock:
+            if _s3 is None:
+                import boto3
+                from botocore.client import Config
+
+                _s3 = boto3.client(
+                    "s3",
+                    aws_access_key_id=AWS_ACCESS_KEY_ID,
+                    aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
+                    region_name=AWS_REGION,
+                config=Config(s3={'addressing_style': 'virtual'}, signature_version='s3v4'))
+                instrument_s3(_s3)
+    return _s3
+
+
+class _LazyS3:
+    # routers import `s3` directly; forward to the real client
+    def __getattr__(self, name):
+        return getattr(get_s3(), name)
+
+
+s3 = _LazyS3()
 
 def upload_file_to_s3(file_obj, folder: str, filename: str = None) -> str:
     import os, uuid
@@ -47,5 +47,8 @@ class ReportResponse(BaseModel):
     price: Decimal
     uploaded_at: datetime
 
+    # only set when the request carries a user token
+    purchased: bool | None = None
+
     class Config:
         from_attributes = True
\ No newline at end of file
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import codecs
+import csv
+import importlib.util
+import io
+from typing import Dict, List, Optional
+
+from app.utils.lazy import lazy_import
+pd = lazy_import("pandas")
+
+# pyarrow's multithreaded parser is several times faster than the C engine
+# on wide files; fall back transparently when it isn't installed. Only
+# probed here - pandas imports it on first use.
+CSV_ENGINE = "pyarrow" if importlib.util.find_spec("pyarrow") else "c"
+
+
+# Dataset dtype -> pandas dtype used while parsing.
+# Integers are read as float64 so "12.0" and blanks still parse;
+# the ingest converters narrow them afterwards.
+PANDAS_DTYPES = {
+    "int": "float64",
+    "float": "float64",
+    "str": "string",
+}
+
+
+def sniff_encoding(contents: bytes) -> str:
+    if contents.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    try:
+        contents.decode("utf-8")
+        return "utf-8"
+    except UnicodeDecodeError:
+        return "latin1"
+
+
+def count_columns(contents: bytes, encoding: str) -> int:
+    first_line = contents.split(b"\n", 1)[0].decode(encoding).rstrip("\r")
+    return len(next(csv.reader([first_line]), []))
+
+
+def read_csv(
+    contents: bytes,
+    columns: Optional[List[str]] = None,
+    dtypes: Optional[Dict[str, str]] = None,
+) -> pd.DataFrame:
+    """
+    Parse a headerless CSV in a single pass.
+
+    columns : names for the leading columns; extras become extra_<n>
+    dtypes  : column -> "int" | "float" | "str" (others are inferred)
+    """
+    encoding = sniff_encoding(contents)
+    width = count_columns(contents, encoding)
+
+    columns = list(columns or [])
+    names = columns[:width] + [f"extra_{i}" for i in range(width - len(columns))]
+
+    dtype = {
+        c: PANDAS_DTYPES[t]
+        for c, t in (dtypes or {}).items()
+        if c in names and t in PANDAS_DTYPES
+    }
+
+    kwargs = dict(header=None, names=names, encoding=encoding, engine=CSV_ENGINE)
+
+    try:
+        return pd.read_csv(io.BytesIO(contents), dtype=dtype or None, **kwargs)
+    except ValueError:
+        if not dtype:
+            raise
+        # a numeric column holds text ("-", "N.A." ...): keep the string
+        # hints and let the ingest converters coerce the rest
+        str_only = {c: t for c, t in dtype.items() if t == "string"}
+        return pd.read_csv(io.BytesIO(contents), dtype=str_only or None, **kwargs)
@@ -0,0 +1,104 @@
+"""
+Section cache for /dashboard/bootstrap.
+
+Each landing-page section (market date, market indicators, gainers /
+losers, ...) is produced by the same handler that serves its own
+endpoint, encoded to JSON once and kept for SECTION_TTL seconds. Its
+version is a hash of those bytes, so a client that already holds a
+section's version can skip it, and every worker agrees on the version
+for the same data.
+
+Sections refresh independently, each with its own session and lock, so
+one slow source (the live-news sync) never holds up the rest and a burst
+of page loads triggers at most one rebuild per section.
+"""
+import hashlib
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+import orjson
+from fastapi import HTTPException, Response
+from fastapi.encoders import jsonable_encoder
+
+from app.database import SessionLocal
+
+
+SECTION_TTL = float(os.getenv("DASHBOARD_SECTION_TTL", "30"))
+
+
+class Section:
+    __slots__ = ("version", "body", "error", "loaded_at")
+
+    def __init__(self, body: bytes, error: bool):
+        self.version = hashlib.sha1(body).hexdigest()[:16]
+        self.body = body
+        self.error = error
+        self.loaded_at = time.monotonic()
+
+
+def encode(result) -> bytes:
+    """A handler's return value as the JSON its own endpoint would send."""
+    if isinstance(result, Response):
+        return bytes(result.body)
+    return orjson.dumps(jsonable_encoder(result))
+
+
+def load(loader: Callable) -> Section:
+    db = SessionLocal()
+    try:
+        return Section(encode(loader(db)), error=False)
+    except HTTPException as e:
+        return Section(orjson.dumps({"status": e.status_code, "detail": e.detail}), error=True)
+    finally:
+        db.close()
+
+
+_sections: Dict[Tuple, Section] = {}
+_locks: Dict[Tuple, threading.Lock] = {}
+_locks_guard = threading.Lock()
+
+
+def get(key: Tuple, loader: Callable) -> Section:
+    section = _sections.get(key)
+    if section is not None and time.monotonic() - section.loaded_at < SECTION_TTL:
+        return section
+
+    with _locks_guard:
+        lock = _locks.setdefault(key, threading.Lock())
+
+    with lock:
+        section = _sections.get(key)
+        if section is None or time.monotonic() - section.loaded_at >= SECTION_TTL:
+            section = _sections[key] = load(loader)
+        return section
+
+
+def invalidate(name: Optional[str] = None) -> None:
+    for key in list(_sections):
+        if name is None or key[0] == name:
+            _sections.pop(key, None)
+
+
+def assemble(sections: Dict[str, Section], known: Dict[str, str]) -> bytes:
+    """
+    {"sections": {name: {"version", "data" | "error" | "unchanged": true}}}
+
+    Section bodies are already JSON, so they are spliced in rather than
+    decoded and re-encoded.
+    """
+    parts = []
+    for name, section in sections.items():
+        head = b'"version":' + orjson.dumps(section.version)
+
+        if known.get(name) == section.version:
+            value = head + b',"unchanged":true'
+        elif section.error:
+            value = head + b',"error":' + section.body
+        else:
+            value = head + b',"data":' + section.body
+
+        parts.append(orjson.dumps(name) + b":{" + value + b"}")
+
+    return b'{"sections":{' + b",".join(parts) + b"}}"
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+from app.utils.lazy import lazy_import
+pd = lazy_import("pandas")
+
+from app.services.ingest import Dataset, register, get_dataset  # noqa: F401
+
+from app.models.heatmap import Company, House, Industry, Sector
+from app.models.marketpulse import StockPulseTable, StockPulseIndex
+from app.models.mcapgainerloser import (
+    McapGainersLosers,
+    Upward_DownwardMobile,
+    Up_DownTrend
+)
+from app.models.volumetrade import (
+    VolumeTradevolume,
+    VolumeTradevalue,
+    VolumeTradetrade
+)
+
+
+# =========================
+# HEATMAP
+# =========================
+register(Dataset(
+    name="heatmap.company",
+    model=Company,
+    exact=False,
+    columns=[
+        "ID", "RANK", "COMPANY", "MCAP", "DAYCHCR", "CH", "FFLOAT", "FFRNK",
+        "WKCHCR", "WKCH", "MTHCHCR", "MTHCH", "QTRCHCR", "QTRCH",
+        "HYCHCR", "HYCH", "YRCHCR", "YRCH", "CMP", "PCL", "CH_RS",
+        "CH_PER", "OPEN", "HIGH", "LOW", "CLOSE", "VOL", "VALUE",
+        "TRADE", "ISIN", "SEC_ID", "ISCCODE", "INDUSTRY", "IND_RNK",
+        "IH_MCODE", "IH_MNAME", "HOU_RNK", "COMPANY_NAME", "BSE",
+        "NSE", "INDEX_STK", "RONW", "ROCE", "EPS", "CEPS", "P_E",
+        "P_CE", "DIV", "YLD", "DEBT_EQ",
+    ],
+))
+
+register(Dataset(
+    name="heatmap.house",
+    model=House,
+    exact=False,
+    columns=[
+        "ID", "RNK", "IH_PR", "IH_AF", "HOUSE", "COS", "MCAP", "DAYCHCR", "CH",
+        "FFLOAT", "FFRNK", "WKCHCR", "WKCH", "MTHCHCR", "MTHCH", "QTRCHCR",
+        "QTRCH", "HYCHCR", "HYCH", "YRCHCR", "YRCH",
+    ],
+))
+
+register(Dataset(
+    name="heatmap.industry",
+    model=Industry,
+    exact=False,
+    columns=[
+        "ID", "RNK", "INDUSTRY", "COS", "MCAP", "DAYCHCR", "CH", "FFLOAT",
+        "FFRNK", "WKCHCR", "WKCH", "MTHCHCR", "MTHCH", "QTRCHCR", "QTRCH",
+        "HYCHCR", "HYCH", "YRCHCR", "YRCH", "SECID", "ISCCODE",
+    ],
+))
+
+register(Dataset(
+    name="heatmap.sector",
+    model=Sector,
+    exact=False,
+    columns=[
+        "ID", "RNK", "SECTOR", "COS", "MCAP", "DAYCHCR", "CH", "FFLOAT",
+        "FFRNK", "WKCHCR", "WKCH", "MTHCHCR", "MTHCH", "QTRCHCR", "QTRCH",
+        "HYCHCR", "HYCH", "YRCHCR", "YRCH", "SECID",
+    ],
+))
+
+
+# =========================
+# MARKET PULSE
+# =========================
+def int_or_zero(series: pd.Series) -> pd.Series:
+    return pd.to_numeric(series, errors="coerce").fillna(0).astype("int64")
+
+
+MARKETPULSE_NUMERIC = [
+    "MCAP", "FFLT", "DMA_5", "DMA_21", "DMA_60", "DMA_245",
+    "STOCKS", "ADV", "DEC", "UNCHG", "VOL",
+    "WK52H_MCAP", "WK52L_MCAP", "WK52H_VOL", "WK52L_VOL",
+    "DVMA_5", "DVMA_21", "DVMA_60", "DVMA_245"
+]
+
+register(Dataset(
+    name="marketpulse.stockpulse_tbl",
+    model=StockPulseTable,
+    exact=False,
+    skip=("ID",),
+    columns=[
+        "TYPE", "MCAP", "DMA_5", "DMA_21", "DMA_60", "DMA_245",
+        "WK52H_MCAP", "WK52HDT", "WK52L_MCAP", "WK52LDT",
+        "VOL", "DVMA_5", "DVMA_21", "DVMA_60", "DVMA_245",
+        "WK52H_VOL", "WK52HVDT", "WK52L_VOL", "WK52LVDT"
+    ],
+    parsers={c: int_or_zero for c in MARKETPULSE_NUMERIC},
+))
+
+register(Dataset(
+    name="marketpulse.stockpulse_index",
+    model=StockPulseIndex,
+    exact=False,
+    skip=("ID",),
+    columns=[
+        "ID", "TYPE", "TRN_DATE", "MCAP", "FFLT",
+        "DMA_5", "DMA_21", "DMA_60", "DMA_245",
+        "STOCKS", "ADV", "DEC", "UNCHG", "VOL"
+    ],
+    # left for postgres to parse, as before
+    dtypes={"TRN_DATE": "raw"},
+    parsers={c: int_or_zero for c in MARKETPULSE_NUMERIC},
+))
+
+
+# =========================
+# GAINERS / LOSERS
+# =========================
+register(Dataset(
+    name="gainloss.mcap_movers",
+    model=McapGainersLosers,
+    label="mcap_movers",
+    columns=[
+        "COMPANY", "ISIN", "CMP", "MCAP_CR", "CH_CR", "CH_PER",
+        "VOL_NOS", "VOL_CH_PER", "DAY_HIGH", "DAY_LOW",
+        "60DMA", "60DMA_PER", "245DMA", "245DMA_PER", "52WKH", "52WKL"
+    ],
+    rename={
+        "60DMA": "DMA_60",
+        "60DMA_PER": "DMA_PER_60",
+        "245DMA": "DMA_245",
+        "245DMA_PER": "DMA_PER_245",
+        "52WKH": "WKH_52",
+        "52WKL": "WKL_52",
+    },
+))
+
+register(Dataset(
+    name="gainloss.up_down_mobile",
+    model=Upward_DownwardMobile,
+    label="up_down_mobile",
+    columns=["COMPANY", "ISIN", "CMP", "START", "DAYS", "CH_PER", "PERDAY"],
+))
+
+register(Dataset(
+    name="gainloss.up_down_trend",
+    model=Up_DownTrend,
+    label="up_down_trend",
+    columns=["COMPANY", "ISIN", "CMP", "5DMA", "21DMA", "60DMA", "245DMA", "CH_PER"],
+    rename={
+        "5DMA": "DMA_5",
+        "21DMA": "DMA_21",
+        "60DMA": "DMA_60",
+        "245DMA": "DMA_245",
+    },
+))
+
+
+# =========================
+# VOLUME / VALUE / TRADE
+# =========================
+VOLUMETRADE_TAIL = [
+    "spurt", "chper",
+    "five_dvma", "twentyone_dvma", "sixty_dvma",
+    "two_four_five_dvma", "five_two_wkhv", "five_two_wklv"
+]
+
+for tab, Model in (
+    ("volume", VolumeTradevolume),
+    ("value", VolumeTradevalue),
+    ("trade", VolumeTradetrade),
+):
+    register(Dataset(
+        name=f"volumetrade.{tab}",
+        model=Model,
+        label=tab,
+        columns=["company", "isin", "mcap", "cmp", tab] + VOLUMETRADE_TAIL,
+    ))
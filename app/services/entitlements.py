@@ -0,0 +1,89 @@
+"""
+Per-user set of purchased document ids.
+
+Loaded with one query the first time a user is seen and kept in process
+memory for the listing / badge endpoints. Payment verification and the
+webhook invalidate the user's entry; the TTL bounds how stale another
+worker's copy can get. Checks that decide whether to take a payment use
+purchased_among, which always reads the database.
+"""
+import time
+from threading import Lock
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.purchase import PurchasedDocument
+
+
+ENTITLEMENT_TTL = 300  # seconds
+MAX_CACHED_USERS = 10000
+
+_cache: Dict[int, Tuple[float, FrozenSet[str]]] = {}
+_lock = Lock()
+
+
+def load_entitlements(db: Session, user_id: int) -> FrozenSet[str]:
+    rows = db.execute(
+        select(PurchasedDocument.document_id)
+        .where(PurchasedDocument.user_id == user_id)
+    )
+    return frozenset(document_id for (document_id,) in rows)
+
+
+def purchased_among(db: Session, user_id: int, document_ids: Iterable[str]) -> FrozenSet[str]:
+    """
+    Which of document_ids the user owns, read from the database.
+
+    For checks that gate a payment; the cache is for display only.
+    """
+    rows = db.execute(
+        select(PurchasedDocument.document_id)
+        .where(
+            PurchasedDocument.user_id == user_id,
+            PurchasedDocument.document_id.in_(list(document_ids))
+        )
+    )
+    return frozenset(document_id for (document_id,) in rows)
+
+
+def get_entitlements(db: Session, user_id: int) -> FrozenSet[str]:
+    now = time.monotonic()
+
+    entry = _cache.get(user_id)
+    if entry and entry[0] > now:
+        return entry[1]
+
+    documents = load_entitlements(db, user_id)
+
+    with _lock:
+        if len(_cache) >= MAX_CACHED_USERS:
+            _cache.clear()
+        _cache[user_id] = (now + ENTITLEMENT_TTL, documents)
+
+    return documents
+
+
+def invalidate(user_id: Optional[int]) -> None:
+    if user_id is None:
+        return
+    with _lock:
+        _cache.pop(user_id, None)
+
+
+def annotate(db: Session, user_id: Optional[int], reports: Iterable):
+    """
+    Sets `purchased` on each CompanyFile for the list endpoints.
+    Anonymous requests leave it unset (None in the response).
+    """
+    reports = list(reports)
+
+    if user_id is None:
+        return reports
+
+    owned = get_entitlements(db, user_id)
+    for report in reports:
+        report.purchased = report.document_id in owned
+
+    return reports
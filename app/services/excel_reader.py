@@ -0,0 +1,300 @@
+from __future__ import annotations
+
+import io
+import zipfile
+from datetime import date, datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from xml.etree.ElementTree import iterparse
+
+from app.utils.lazy import lazy_import
+pd = lazy_import("pandas")
+
+# Upload workbooks are one plain sheet of values. pd.read_excel hands
+# every cell to openpyxl's reader (coordinates, styles, a Cell per value),
+# which dominates upload time on large files. The xlsx path here streams
+# the sheet XML once and keeps only values; anything it cannot make sense
+# of is re-read through openpyxl.
+
+_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+_ROW, _C, _V, _T, _R, _IS = (_MAIN + t for t in ("row", "c", "v", "t", "r", "is"))
+
+_ERROR_VALUES = {"#N/A", "#NAME?", "#DIV/0!", "#REF!", "#VALUE!", "#NUM!", "#NULL!"}
+
+
+def is_xlsx(contents: bytes) -> bool:
+    # xlsx is a zip archive
+    return contents[:2] == b"PK"
+
+
+def is_xls(contents: bytes) -> bool:
+    # legacy xls is an OLE2 compound file
+    return contents[:8] == b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+
+
+def is_excel(contents: bytes) -> bool:
+    return is_xlsx(contents) or is_xls(contents)
+
+
+# ---------------- xlsx parts ----------------
+def _first_sheet(book: zipfile.ZipFile) -> Tuple[str, bool]:
+    """Path of the first worksheet, and whether the book uses the 1904 epoch."""
+    with book.open("xl/workbook.xml") as f:
+        date1904, rel_id = False, None
+        for _, el in iterparse(f):
+            if el.tag == _MAIN + "workbookPr":
+                date1904 = el.get("date1904") in ("1", "true")
+            elif el.tag == _MAIN + "sheet" and rel_id is None:
+                rel_id = el.get(_REL + "id")
+
+    with book.open("xl/_rels/workbook.xml.rels") as f:
+        for _, el in iterparse(f):
+            if el.tag == _PKG_REL + "Relationship" and el.get("Id") == rel_id:
+                target = el.get("Target")
+                return (target[1:] if target.startswith("/") else "xl/" + target), date1904
+
+    raise KeyError("workbook has no worksheet")
+
+
+def _shared_strings(book: zipfile.ZipFile) -> List[str]:
+    if "xl/sharedStrings.xml" not in book.namelist():
+        return []
+
+    strings = []
+    with book.open("xl/sharedStrings.xml") as f:
+        for _, el in iterparse(f):
+            if el.tag == _MAIN + "si":
+                strings.append(_text(el))
+                el.clear()
+    return strings
+
+
+def _text(el) -> str:
+    # plain <t>, or rich-text runs <r><t>; phonetic runs (<rPh>) are skipped
+    parts = []
+    for child in el:
+        if child.tag == _T:
+            parts.append(child.text or "")
+        elif child.tag == _R:
+            t = child.find(_T)
+            if t is not None:
+                parts.append(t.text or "")
+    return "".join(parts)
+
+
+def _date_styles(book: zipfile.ZipFile) -> set:
+    """Indexes of the cell formats that display numbers as dates."""
+    if "xl/styles.xml" not in book.namelist():
+        return set()
+
+    from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format
+
+    custom: Dict[int, str] = {}
+    xfs: List[int] = []
+    in_cell_xfs = False
+
+    with book.open("xl/styles.xml") as f:
+        for event, el in iterparse(f, events=("start", "end")):
+            if el.tag == _MAIN + "cellXfs":
+                in_cell_xfs = event == "start"
+            elif event == "end" and el.tag == _MAIN + "numFmt":
+                custom[int(el.get("numFmtId"))] = el.get("formatCode") or ""
+            elif event == "start" and in_cell_xfs and el.tag == _MAIN + "xf":
+                xfs.append(int(el.get("numFmtId") or 0))
+
+    return {
+        i for i, fmt in enumerate(xfs)
+        if is_date_format(custom.get(fmt) or BUILTIN_FORMATS.get(fmt) or "")
+    }
+
+
+_COLUMNS: Dict[str, int] = {}
+
+
+def _column(ref: str) -> int:
+    letters = ref.rstrip("0123456789")
+    index = _COLUMNS.get(letters)
+    if index is None:
+        index = 0
+        for ch in letters:
+            index = index * 26 + ord(ch) - 64
+        index = _COLUMNS[letters] = index - 1
+    return index
+
+
+# ---------------- Row sources ----------------
+def _xlsx_rows(contents: bytes) -> Iterator[Sequence]:
+    from openpyxl.utils.datetime import MAC_EPOCH, WINDOWS_EPOCH, from_excel
+
+    with zipfile.ZipFile(io.BytesIO(contents)) as book:
+        sheet, date1904 = _first_sheet(book)
+        strings = _shared_strings(book)
+        date_styles = _date_styles(book)
+        epoch = MAC_EPOCH if date1904 else WINDOWS_EPOCH
+
+        expected = 1
+        with book.open(sheet) as f:
+            for _, el in iterparse(f):
+                if el.tag != _ROW:
+                    continue
+
+                # rows with nothing in them are not written at all
+                number = int(el.get("r") or expected)
+                for _ in range(expected, number):
+                    yield ()
+                expected = number + 1
+
+                row: list = []
+                for c in el.iter(_C):
+                    ref = c.get("r")
+                    if ref:
+                        index = _column(ref)
+                        if index > len(row):
+                            row.extend([None] * (index - len(row)))
+
+                    kind = c.get("t", "n")
+                    if kind == "inlineStr":
+                        inline = c.find(_IS)
+                        row.append(_text(inline) if inline is not None else None)
+                        continue
+
+                    v = c.find(_V)
+                    v = v.text if v is not None else None
+                    if v is None:
+                        value = None
+                    elif kind == "n":
+                        value = float(v)
+                        if int(c.get("s") or 0) in date_styles:
+                            value = from_excel(value, epoch)
+                    elif kind == "s":
+                        value = strings[int(v)]
+                    elif kind == "str":
+                        value = v
+                    elif kind == "b":
+                        value = v == "1"
+                    elif kind == "d":
+                        value = datetime.fromisoformat(v)
+                    else:  # "e"
+                        value = None
+                    row.append(value)
+
+                el.clear()
+                yield row
+
+
+def _openpyxl_rows(contents: bytes) -> Iterator[Sequence]:
+    import openpyxl
+
+    book = openpyxl.load_workbook(io.BytesIO(contents), read_only=True, data_only=True, keep_links=False)
+    try:
+        sheet = book.worksheets[0]
+        # some writers store a wrong <dimension>; read what is really there
+        sheet.reset_dimensions()
+        yield from sheet.iter_rows(values_only=True)
+    finally:
+        book.close()
+
+
+def _cell(value):
+    # same normalisation as pandas' Excel readers
+    if value is None or value == "":
+        return None
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str) and value in _ERROR_VALUES:
+        return None
+    return value
+
+
+def _collect(rows: Iterable[Sequence]) -> Tuple[List[list], int]:
+    out: List[list] = []
+    width = 0
+    last_filled = 0
+
+    for raw in rows:
+        row = [_cell(v) for v in raw]
+        while row and row[-1] is None:
+            row.pop()
+        out.append(row)
+        if row:
+            width = max(width, len(row))
+            last_filled = len(out)
+
+    # trailing blank rows are formatting, not data
+    del out[last_filled:]
+    return out, width
+
+
+# ---------------- Reading ----------------
+def read_excel(
+    contents: bytes,
+    str_columns: Iterable[int] = (),
+    header: bool = False,
+) -> pd.DataFrame:
+    """
+    First sheet of an xlsx / xls file as a DataFrame, one pass over its rows.
+
+    str_columns : positions kept as text (e.g. codes with leading zeros)
+    header      : first row holds column names
+
+    Values and column types match pd.read_excel: numeric columns become
+    int64 / float64, date columns datetime64, anything else object.
+    Legacy xls goes through pd.read_excel.
+    """
+    str_columns = set(str_columns)
+
+    if is_xls(contents):
+        return pd.read_excel(
+            io.BytesIO(contents),
+            header=0 if header else None,
+            dtype={i: str for i in str_columns} or None,
+        )
+
+    try:
+        rows, width = _collect(_xlsx_rows(contents))
+    except (KeyError, ValueError, IndexError, zipfile.BadZipFile, SyntaxError):
+        rows, width = _collect(_openpyxl_rows(contents))
+
+    names: Optional[list] = None
+    if header and rows:
+        first = rows.pop(0)
+        names, counts = [], {}
+        for i in range(width):
+            name = first[i] if i < len(first) and first[i] is not None else f"Unnamed: {i}"
+            # repeated headers get .1, .2 ... exactly as pd.read_excel does
+            count = counts.get(name, 0)
+            while count > 0:
+                counts[name] = count + 1
+                name = f"{name}.{count}"
+                count = counts.get(name, 0)
+            counts[name] = count + 1
+            names.append(name)
+
+    # column-wise straight from the rows; short rows are padded with None
+    df = pd.DataFrame(
+        {
+            i: _typed([r[i] if i < len(r) else None for r in rows], i in str_columns)
+            for i in range(width)
+        },
+        index=pd.RangeIndex(len(rows)),
+    )
+    if names is not None:
+        df.columns = names
+    return df
+
+
+def _typed(values: list, as_str: bool) -> pd.Series:
+    series = pd.Series(values, dtype=object)
+
+    if as_str:
+        return series.where(series.isna(), series.astype(str))
+
+    if series.notna().any() and all(v is None or isinstance(v, (datetime, date)) for v in values):
+        return pd.to_datetime(series)
+
+    try:
+        return pd.to_numeric(series)
+    except (ValueError, TypeError):
+        return series
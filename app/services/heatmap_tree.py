@@ -0,0 +1,238 @@
+"""
+Precomputed heatmap treemap.
+
+Every heatmap upload rebuilds, inside the upload's transaction, the nested
+sector -> industry -> company hierarchy (plus house -> company) from the
+company / industry / sector / house tables and stores it as one orjson
+blob with an ETag. /heatmap/tree serves those bytes unchanged, so a page
+load is a single small, cacheable response instead of four full CSV
+re-parses and a browser-side group-by.
+
+Layout (kept short, it is sent on every page load):
+
+    {"periods": ["day", "wk", "mth", "qtr", "hy", "yr"],
+     "fields": ["id", "name", "isin", "nse", "mcap", "ch"],
+     "companies": [[id, name, isin, nse, mcap, [day, wk, ...]], ...],
+     "sectors": [{"id", "name", "mcap", "ch", "children": [
+                     {"id", "name", "mcap", "ch", "companies": [0, 5, ...]}]}],
+     "houses": [{"id", "name", "mcap", "ch", "companies": [...]}]}
+
+Each company is listed once, largest MCAP first; industries and houses
+refer to it by position. Group values come from the uploaded sector /
+industry / house rows; a group with no such row is rolled up from its
+companies.
+"""
+import hashlib
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import orjson
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.heatmap import Company, House, HeatmapTree, Industry, Sector
+from app.services import partitions
+from app.services.fastread import fetch_rows
+
+
+VERSION_CHECK_SECONDS = 30
+
+# (label, percent change column, absolute change in crores column)
+PERIODS = [
+    ("day", "CH", "DAYCHCR"),
+    ("wk", "WKCH", "WKCHCR"),
+    ("mth", "MTHCH", "MTHCHCR"),
+    ("qtr", "QTRCH", "QTRCHCR"),
+    ("hy", "HYCH", "HYCHCR"),
+    ("yr", "YRCH", "YRCHCR"),
+]
+
+COMPANY_FIELDS = (
+    "ID", "COMPANY", "ISIN", "NSE", "SEC_ID", "ISCCODE", "INDUSTRY", "IH_MNAME", "MCAP",
+) + tuple(c for _, pct, cr in PERIODS for c in (pct, cr))
+
+
+def _key(value) -> str:
+    return str(value).strip() if value is not None else ""
+
+
+def _house_key(value) -> str:
+    return _key(value).lower()
+
+
+def _changes(row: dict) -> list:
+    return [row.get(pct) for _, pct, _ in PERIODS]
+
+
+def _rollup(rows: List[dict]) -> dict:
+    """
+    Group MCAP and % changes from member rows: the summed absolute change
+    over the summed starting value, i.e. the MCAP-weighted change.
+    """
+    mcap = sum(r["MCAP"] or 0 for r in rows)
+    ch = []
+
+    for _, pct, cr in PERIODS:
+        moved = [r for r in rows if r.get(cr) is not None and r["MCAP"]]
+        delta = sum(r[cr] for r in moved)
+        base = sum(r["MCAP"] for r in moved) - delta
+        ch.append(round(delta / base * 100, 1) if moved and base else None)
+
+    return {"mcap": round(mcap, 2), "ch": ch}
+
+
+def _group(node_id, name, source: Optional[dict], members: List[dict]) -> dict:
+    if source is not None and source.get("MCAP") is not None:
+        values = {"mcap": source["MCAP"], "ch": _changes(source)}
+    else:
+        values = _rollup(members)
+
+    return {"id": node_id, "name": name, **values}
+
+
+def _leaf(row: dict) -> list:
+    return [row["ID"], row["COMPANY"], row["ISIN"], row["NSE"], row["MCAP"], _changes(row)]
+
+
+def _by_mcap(items: list, mcap=lambda n: n["mcap"]) -> list:
+    return sorted(items, key=lambda n: mcap(n) or 0, reverse=True)
+
+
+# -----------------------------
+# BUILD
+# -----------------------------
+def build_tree(db: Session) -> dict:
+    companies = fetch_rows(
+        db, Company, partitions.is_latest(Company),
+        fields=COMPANY_FIELDS, order_by=Company.pk_id,
+    )
+    sectors = {_key(r["SECID"]): r for r in fetch_rows(db, Sector)}
+    industries = {_key(r["ISCCODE"]): r for r in fetch_rows(db, Industry)}
+    houses = {_house_key(r["HOUSE"]): r for r in fetch_rows(db, House)}
+
+    companies = _by_mcap(companies, lambda r: r["MCAP"])
+    position = {id(row): i for i, row in enumerate(companies)}
+
+    def members(rows):
+        return sorted(position[id(r)] for r in rows)
+
+    by_industry: Dict[str, Dict[str, List[dict]]] = defaultdict(lambda: defaultdict(list))
+    by_house: Dict[str, List[dict]] = defaultdict(list)
+
+    for row in companies:
+        by_industry[_key(row["SEC_ID"])][_key(row["ISCCODE"])].append(row)
+        if _house_key(row["IH_MNAME"]):
+            by_house[_house_key(row["IH_MNAME"])].append(row)
+
+    sector_nodes = []
+    for sec_id, groups in by_industry.items():
+        industry_nodes = []
+        in_sector = []
+
+        for code, rows in groups.items():
+            industry = industries.get(code)
+            name = (industry or {}).get("INDUSTRY") or rows[0]["INDUSTRY"] or code
+            node = _group(code, name, industry, rows)
+            node["companies"] = members(rows)
+            industry_nodes.append(node)
+            in_sector.extend(rows)
+
+        sector = sectors.get(sec_id)
+        name = (sector or {}).get("SECTOR") or sec_id
+        node = _group(sec_id, name, sector, in_sector)
+        node["children"] = _by_mcap(industry_nodes)
+        sector_nodes.append(node)
+
+    house_nodes = []
+    for key, rows in by_house.items():
+        house = houses.get(key)
+        name = (house or {}).get("HOUSE") or rows[0]["IH_MNAME"].strip()
+        node = _group((house or {}).get("ID"), name, house, rows)
+        node["companies"] = members(rows)
+        house_nodes.append(node)
+
+    return {
+        "periods": [label for label, _, _ in PERIODS],
+        "fields": ["id", "name", "isin", "nse", "mcap", "ch"],
+        "companies": [_leaf(r) for r in companies],
+        "sectors": _by_mcap(sector_nodes),
+        "houses": _by_mcap(house_nodes),
+    }
+
+
+def rebuild(db: Session) -> HeatmapTree:
+    """
+    Builds and stores the tree in the caller's transaction (so it commits
+    together with the upload that changed the data) and drops older trees.
+    """
+    tree = build_tree(db)
+    tree["built_at"] = datetime.utcnow()
+
+    payload = orjson.dumps(tree, option=orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z)
+
+    entry = HeatmapTree(
+        built_at=tree["built_at"],
+        etag=hashlib.sha1(payload).hexdigest(),
+        payload=payload,
+    )
+    db.add(entry)
+    db.flush()
+
+    db.query(HeatmapTree).filter(HeatmapTree.id < entry.id).delete(synchronize_session=False)
+    return entry
+
+
+# -----------------------------
+# READ (per-worker cache)
+# -----------------------------
+_cached: Optional[tuple] = None  # (id, etag, payload)
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def get_tree(db: Session) -> tuple:
+    """(etag, payload) of the latest stored tree, building one if none exists."""
+    global _cached, _checked_at
+
+    now = time.monotonic()
+    cached = _cached
+
+    if cached is not None and now - _checked_at < VERSION_CHECK_SECONDS:
+        return cached[1], cached[2]
+
+    with _lock:
+        if _cached is not None and now - _checked_at < VERSION_CHECK_SECONDS:
+            return _cached[1], _cached[2]
+
+        latest = db.execute(
+            select(HeatmapTree.id, HeatmapTree.etag)
+            .order_by(HeatmapTree.id.desc())
+            .limit(1)
+        ).first()
+
+        if latest is None:
+            entry = rebuild(db)
+            _cached = (entry.id, entry.etag, entry.payload)
+            db.commit()
+
+        elif _cached is None or _cached[0] != latest.id:
+            # re-read with the payload: a newer upload may have replaced it
+            row = db.execute(
+                select(HeatmapTree.id, HeatmapTree.etag, HeatmapTree.payload)
+                .order_by(HeatmapTree.id.desc())
+                .limit(1)
+            ).first()
+            # psycopg2 hands bytea back as a memoryview
+            _cached = (row.id, row.etag, bytes(row.payload))
+
+        _checked_at = now
+        return _cached[1], _cached[2]
+
+
+def invalidate() -> None:
+    global _cached
+    with _lock:
+        _cached = None
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from app.utils.lazy import lazy_import
+pd = lazy_import("pandas")
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.services.csv_reader import read_csv
+from app.services.excel_reader import is_excel, read_excel
+
+
+# ---------------- Dataset declaration ----------------
+@dataclass
+class Dataset:
+    """
+    Headerless upload file -> table mapping.
+
+    columns : file column order
+    rename  : file column -> model attribute (defaults to the same name)
+    dtypes  : file column -> "int" | "float" | "str" | "date" | "raw"
+              (defaults to the type of the mapped model column)
+    parsers : file column -> Series -> Series, overrides the dtype
+    skip    : file columns that are read but never stored
+    exact   : column count must match exactly, otherwise extras are dropped
+    """
+    name: str
+    model: type
+    columns: List[str]
+    rename: Dict[str, str] = field(default_factory=dict)
+    dtypes: Dict[str, str] = field(default_factory=dict)
+    parsers: Dict[str, Callable[[pd.Series], pd.Series]] = field(default_factory=dict)
+    skip: tuple = ()
+    exact: bool = True
+    label: Optional[str] = None
+
+    def attr(self, column: str) -> str:
+        return self.rename.get(column, column)
+
+    def stored_columns(self) -> List[str]:
+        model_attrs = set(self.model.__mapper__.columns.keys())
+        return [
+            c for c in self.columns
+            if c not in self.skip and self.attr(c) in model_attrs
+        ]
+
+    def dtype(self, column: str) -> str:
+        if column in self.dtypes:
+            return self.dtypes[column]
+
+        attr = self.attr(column)
+        if attr not in self.model.__mapper__.columns:
+            return "raw"
+
+        return python_type_to_dtype(self.model.__mapper__.columns[attr].type)
+
+
+def python_type_to_dtype(sa_type) -> str:
+    try:
+        py_type = sa_type.python_type
+    except NotImplementedError:
+        return "raw"
+
+    if py_type is int:
+        return "int"
+    if py_type is str:
+        return "str"
+    if py_type.__name__ in ("float", "Decimal"):
+        return "float"
+    if py_type.__name__ == "date":
+        return "date"
+    return "raw"
+
+
+# ---------------- Registry ----------------
+DATASETS: Dict[str, Dataset] = {}
+
+
+def register(dataset: Dataset) -> Dataset:
+    DATASETS[dataset.name] = dataset
+    return dataset
+
+
+def get_dataset(name: str) -> Dataset:
+    dataset = DATASETS.get(name)
+    if not dataset:
+        raise HTTPException(400, f"Unknown dataset: {name}")
+    return dataset
+
+
+# ---------------- Reading ----------------
+def read_frame(contents: bytes, dataset: Dataset) -> pd.DataFrame:
+    label = dataset.label or dataset.name
+
+    if not contents or not contents.strip():
+        raise HTTPException(400, f"{label} file is empty")
+
+    try:
+        if is_excel(contents):
+            str_positions = [
+                i for i, c in enumerate(dataset.columns)
+                if dataset.dtype(c) == "str"
+            ]
+            df = read_excel(contents, str_columns=str_positions)
+        else:
+            dtypes = {c: dataset.dtype(c) for c in dataset.stored_columns()}
+            df = read_csv(contents, dataset.columns, dtypes)
+    except pd.errors.EmptyDataError:
+        raise HTTPException(400, f"{label} file has no data")
+    except Exception as e:
+        raise HTTPException(400, f"Failed to read {label} file: {e}")
+
+    expected = len(dataset.columns)
+
+    if dataset.exact and df.shape[1] != expected:
+        raise HTTPException(400, f"{label} file must have exactly {expected} columns")
+
+    if df.shape[1] < expected:
+        raise HTTPException(400, f"{label} file must have at least {expected} columns")
+
+    df = df.iloc[:, :expected]
+    df.columns = dataset.columns
+    return df
+
+
+# ---------------- Parsing ----------------
+def to_int(series: pd.Series) -> pd.Series:
+    return pd.to_numeric(series, errors="coerce").round().astype("Int64")
+
+
+def to_float(series: pd.Series) -> pd.Series:
+    return pd.to_numeric(series, errors="coerce")
+
+
+def to_str(series: pd.Series) -> pd.Series:
+    return series.astype("string").str.strip()
+
+
+def to_date(series: pd.Series) -> pd.Series:
+    return pd.to_datetime(series, errors="coerce").dt.date
+
+
+CONVERTERS = {
+    "int": to_int,
+    "float": to_float,
+    "str": to_str,
+    "date": to_date,
+}
+
+
+def parse_frame(df: pd.DataFrame, dataset: Dataset) -> List[dict]:
+    """Convert a frame column-by-column and return model-keyed records."""
+    columns = dataset.stored_columns()
+    out = {}
+
+    for col in columns:
+        parser = dataset.parsers.get(col) or CONVERTERS.get(dataset.dtype(col))
+        out[dataset.attr(col)] = parser(df[col]) if parser else df[col]
+
+    keys = list(out)
+    values = [to_python(series) for series in out.values()]
+
+    return [dict(zip(keys, row)) for row in zip(*values)]
+
+
+def to_python(series: pd.Series) -> list:
+    """Column -> list of plain Python values, missing as None."""
+    if series.hasnans:
+        series = series.astype(object).where(series.notna(), None)
+    return series.tolist()
+
+
+# ---------------- Loading ----------------
+def replace_rows(
+    db: Session,
+    dataset: Dataset,
+    records: List[dict],
+    *filters,
+    **extra
+) -> int:
+    """
+    Delete the dataset's rows (optionally filtered) and bulk insert the
+    new records in the caller's transaction. Extra keyword values are
+    stamped on every record (group_id, data_date, ...).
+    """
+    Model = dataset.model
+
+    if extra:
+        for r in records:
+            r.update(extra)
+
+    db.query(Model).filter(*filters).delete(synchronize_session=False)
+
+    if records:
+        db.bulk_insert_mappings(Model, records)
+
+    return len(records)
+
+
+def ingest(
+    db: Session,
+    dataset: Dataset,
+    contents: bytes,
+    *filters,
+    **extra
+) -> int:
+    """read -> validate -> parse -> replace, for the common case."""
+    df = read_frame(contents, dataset)
+    records = parse_frame(df, dataset)
+    return replace_rows(db, dataset, records, *filters, **extra)
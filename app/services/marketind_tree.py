@@ -0,0 +1,134 @@
+"""
+Materialised /marketindicator/latest/ response.
+
+The homepage market-indicator widget is a tab -> section -> rows tree
+over one mkt_date of StockData. It only changes when a file is uploaded,
+so upload_single_data builds it once, in the upload's transaction, and
+stores the encoded response in market_indicator_tree keyed by mkt_date
+(version = the upload that built it). Serving it is one indexed
+lookup; the bytes go out unchanged.
+
+The tree table mirrors StockData: an upload replaces both, and deleting
+an upload's date removes its tree.
+"""
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+
+import orjson
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.marketind import MarketIndicatorTree, MarketIndicatorUpload, StockData
+from app.services.fastread import row_encoder
+
+
+TAB_MAP = {1: "Returns", 2: "Indices", 3: "Currencies", 4: "World P/E Ratio", 5: "Commodities"}
+
+TAB_SECTIONS = {
+    1: ["India  Stocks", "Bullion", "Forex vs INR", "Crude"],
+    2: ["BRICS", "Asia/Pacific", "America/Europe"],
+    3: ["INR vs.", "USD vs."],
+    4: ["Country"],
+    5: ["Metals (Kg)", "Agro-Cons (100 Kg)", "Agro-Indu (100 Kg)", "Energy (Rs)"]
+}
+
+FIELDS = ("name", "yr_ago", "curnt", "ch", "H_ID", "S_ID", "IDX_ID")
+
+
+def is_header_row(row: dict) -> bool:
+    numeric_fields = [row["yr_ago"], row["curnt"], row["ch"], row["S_ID"], row["IDX_ID"]]
+    return all(f is None or f == 0 for f in numeric_fields)
+
+
+def build_tree(db: Session, mkt_date: date) -> Dict[str, Any]:
+    enc = row_encoder(StockData, FIELDS)
+    stocks = enc.encode(db.execute(
+        enc.select(StockData.mkt_date == mkt_date).order_by(StockData.H_ID, StockData.ID)
+    ))
+
+    uploads = db.execute(
+        select(MarketIndicatorUpload.id, MarketIndicatorUpload.file_name, MarketIndicatorUpload.file_path)
+        .where(MarketIndicatorUpload.mkt_date == mkt_date)
+    )
+    uploaded_files = [
+        {
+            "id": u.id,
+            "file_name": u.file_name,
+            "file_path": ("/" + u.file_path.replace("\\", "/")) if u.file_path else None
+        } for u in uploads
+    ]
+
+    result: Dict[str, List[Dict[str, Any]]] = {}
+    current_section_per_tab: Dict[str, Dict[str, Any]] = {}
+
+    for stock in stocks:
+        tab_name = TAB_MAP.get(stock["H_ID"], f"Unknown H_ID {stock['H_ID']}")
+        if tab_name not in result:
+            result[tab_name] = []
+
+        stock_name = (stock["name"] or "").strip()
+        sections_for_tab = TAB_SECTIONS.get(stock["H_ID"], [])
+        is_header = stock_name in sections_for_tab or is_header_row(stock)
+
+        if is_header:
+            section = {"title": stock_name, "rows": []}
+            result[tab_name].append(section)
+            current_section_per_tab[tab_name] = section
+        else:
+            current_section = current_section_per_tab.get(tab_name)
+            if not current_section:
+                current_section = {"title": "(No Title)", "rows": []}
+                result[tab_name].append(current_section)
+                current_section_per_tab[tab_name] = current_section
+            current_section["rows"].append([stock[f] for f in FIELDS])
+
+    return {
+        "latest_mkt_date": mkt_date,
+        "total_records": len(stocks),
+        "stocks_by_tab": result,
+        "uploaded_files": uploaded_files
+    }
+
+
+def store(db: Session, mkt_date: date, version: int) -> MarketIndicatorTree:
+    """Replaces every stored tree with this date's, in the caller's transaction."""
+    payload = orjson.dumps(build_tree(db, mkt_date))
+
+    db.query(MarketIndicatorTree).delete(synchronize_session=False)
+
+    tree = MarketIndicatorTree(
+        mkt_date=mkt_date,
+        version=version,
+        built_at=datetime.utcnow(),
+        payload=payload,
+    )
+    db.add(tree)
+    db.flush()
+    return tree
+
+
+def latest(db: Session) -> Optional[tuple]:
+    """(mkt_date, version, payload) of the latest tree, or None."""
+    row = db.execute(
+        select(MarketIndicatorTree.mkt_date, MarketIndicatorTree.version, MarketIndicatorTree.payload)
+        .order_by(MarketIndicatorTree.mkt_date.desc())
+        .limit(1)
+    ).first()
+
+    if row is not None:
+        # psycopg2 hands bytea back as a memoryview
+        return row.mkt_date, row.version, bytes(row.payload)
+
+    # data loaded before trees existed: build it once from StockData
+    latest_date = db.scalar(select(func.max(StockData.mkt_date)))
+    if latest_date is None:
+        return None
+
+    version = db.scalar(
+        select(func.max(MarketIndicatorUpload.id))
+        .where(MarketIndicatorUpload.mkt_date == latest_date)
+    ) or 0
+
+    payload = store(db, latest_date, version).payload
+    db.commit()
+    return latest_date, version, payload
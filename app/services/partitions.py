@@ -0,0 +1,259 @@
+"""
+Daily range partitions for snapshot datasets.
+
+Tables that hold one snapshot per day (heatmap companies, gainers /
+losers, stock track) are declared with
+
+    __table_args__ = ({"postgresql_partition_by": "RANGE (data_date)"},)
+
+and keep every day's rows, one partition per day (<table>_pYYYYMMDD).
+An upload replaces only its own day: the partition is created on first
+use and truncated on a re-upload, so loading never rewrites or vacuums
+the rest of the history. Retention drops whole partitions older than
+RETENTION_DAYS, and "latest" / "on date X" reads filter on the key column
+so the planner touches one partition.
+
+On other dialects, or on a table that predates its partitioned
+declaration (see migrate), the same calls fall back to DELETE by day.
+"""
+import os
+import re
+from datetime import date, timedelta
+from typing import List, Optional
+
+from sqlalchemy import func, inspect, select, text
+from sqlalchemy.orm import Session
+
+
+# 0 keeps every day
+RETENTION_DAYS = int(os.getenv("PARTITION_RETENTION_DAYS", "400"))
+
+_RANGE_KEY = re.compile(r"RANGE\s*\(\s*\"?(\w+)\"?\s*\)", re.I)
+_DAY_SUFFIX = re.compile(r"_p(\d{8})$")
+
+
+# -----------------------------
+# DECLARATION
+# -----------------------------
+def key_column(Model):
+    """The DATE column a model is range-partitioned on."""
+    spec = Model.__table__.dialect_options["postgresql"]["partition_by"]
+    match = _RANGE_KEY.match(spec or "")
+    if not match:
+        raise ValueError(f"{Model.__tablename__} is not range-partitioned")
+    return Model.__table__.columns[match.group(1)]
+
+
+def _key(Model):
+    """The mapped attribute for the key column (for filters and records)."""
+    column = key_column(Model)
+    for prop in Model.__mapper__.column_attrs:
+        if prop.columns[0] is column:
+            return getattr(Model, prop.key)
+    raise ValueError(f"{column.name} is not mapped on {Model.__name__}")
+
+
+def partition_name(Model, day: date) -> str:
+    return f"{Model.__tablename__}_p{day:%Y%m%d}"
+
+
+def _quote(db, name: str) -> str:
+    return db.get_bind().dialect.identifier_preparer.quote(name)
+
+
+def is_partitioned(db, Model) -> bool:
+    """True when the live table is a PostgreSQL partitioned table."""
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    kind = db.execute(
+        text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:name)"),
+        {"name": Model.__tablename__},
+    ).scalar()
+    return kind == "p"
+
+
+# -----------------------------
+# READS
+# -----------------------------
+def latest_day(db: Session, Model) -> Optional[date]:
+    return db.scalar(select(func.max(_key(Model))))
+
+
+def is_latest(Model):
+    """Filter to the newest day; PostgreSQL prunes to its partition at run time."""
+    key = _key(Model)
+    return key == select(func.max(key)).correlate(None).scalar_subquery()
+
+
+def on_day(Model, day: date):
+    return _key(Model) == day
+
+
+def between(Model, start: Optional[date], end: Optional[date]) -> list:
+    key = _key(Model)
+    criteria = []
+    if start is not None:
+        criteria.append(key >= start)
+    if end is not None:
+        criteria.append(key <= end)
+    return criteria
+
+
+def days(db: Session, Model) -> List[date]:
+    """Stored days, newest first (from the catalog when partitioned)."""
+    if is_partitioned(db, Model):
+        found = (_DAY_SUFFIX.search(name) for name in _partitions(db, Model))
+        return sorted((_day(m.group(1)) for m in found if m), reverse=True)
+
+    key = _key(Model)
+    return list(db.scalars(select(key).distinct().order_by(key.desc())))
+
+
+# -----------------------------
+# WRITES (caller's transaction)
+# -----------------------------
+def ensure_partition(db: Session, Model, day: date) -> Optional[str]:
+    if not is_partitioned(db, Model):
+        return None
+
+    name = partition_name(Model, day)
+    db.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {_quote(db, name)} "
+        f"PARTITION OF {_quote(db, Model.__tablename__)} "
+        f"FOR VALUES FROM ('{day.isoformat()}') TO ('{(day + timedelta(days=1)).isoformat()}')"
+    ))
+    return name
+
+
+def clear_day(db: Session, Model, day: date) -> None:
+    """Empties one day: TRUNCATE of its partition, or DELETE by day."""
+    name = ensure_partition(db, Model, day)
+    if name is not None:
+        db.execute(text(f"TRUNCATE TABLE {_quote(db, name)}"))
+    else:
+        db.query(Model).filter(on_day(Model, day)).delete(synchronize_session=False)
+
+
+def drop_day(db: Session, Model, day: date) -> None:
+    if is_partitioned(db, Model):
+        db.execute(text(f"DROP TABLE IF EXISTS {_quote(db, partition_name(Model, day))}"))
+    else:
+        db.query(Model).filter(on_day(Model, day)).delete(synchronize_session=False)
+
+
+def replace_day(db: Session, Model, day: date, records: List[dict], **extra) -> int:
+    """
+    Replace one day's rows with `records` (key column and extra keyword
+    values stamped on each), then apply retention. Other days are left
+    untouched.
+    """
+    stamp = {_key(Model).key: day, **extra}
+    for r in records:
+        r.update(stamp)
+
+    clear_day(db, Model, day)
+
+    if records:
+        db.bulk_insert_mappings(Model, records)
+
+    apply_retention(db, Model)
+    return len(records)
+
+
+def apply_retention(db: Session, Model, keep_days: int = RETENTION_DAYS) -> List[date]:
+    """Drops days more than keep_days before the newest one; returns them."""
+    if keep_days <= 0:
+        return []
+
+    newest = latest_day(db, Model)
+    if newest is None:
+        return []
+    cutoff = newest - timedelta(days=keep_days)
+
+    if not is_partitioned(db, Model):
+        db.query(Model).filter(_key(Model) < cutoff).delete(synchronize_session=False)
+        return []
+
+    dropped = []
+    for name in _partitions(db, Model):
+        match = _DAY_SUFFIX.search(name)
+        if not match:
+            continue
+        day = _day(match.group(1))
+        if day < cutoff:
+            db.execute(text(f"DROP TABLE IF EXISTS {_quote(db, name)}"))
+            dropped.append(day)
+    return dropped
+
+
+def _day(suffix: str) -> date:
+    return date(int(suffix[:4]), int(suffix[4:6]), int(suffix[6:]))
+
+
+def _partitions(db: Session, Model) -> List[str]:
+    return list(db.scalars(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = to_regclass(:name)"
+    ), {"name": Model.__tablename__}))
+
+
+# -----------------------------
+# MIGRATION (init_db)
+# -----------------------------
+def migrate(engine, Model, fill: str) -> bool:
+    """
+    Converts an existing plain table into its partitioned declaration.
+
+    `fill` is a SQL expression over the old rows (aliased `t`) giving each
+    row's day, e.g. "t.mkt_date" or a lookup on the upload table. Rows
+    without a day are dropped; surrogate ids are renumbered. Returns True
+    when a table was converted. A missing or already partitioned table,
+    or a non-PostgreSQL engine, is left for create_all.
+    """
+    if engine.dialect.name != "postgresql":
+        return False
+
+    table = Model.__tablename__
+    legacy = f"{table}_unpartitioned"
+    key = key_column(Model).name
+
+    with engine.begin() as conn:
+        kind = conn.execute(
+            text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:name)"), {"name": table}
+        ).scalar()
+        if kind != "r":
+            return False
+
+        q = conn.dialect.identifier_preparer.quote
+        existing = {c["name"] for c in inspect(conn).get_columns(table)}
+        serial = {c.name for c in Model.__table__.primary_key.columns if c.autoincrement is True}
+        copied = [
+            c.name for c in Model.__table__.columns
+            if c.name in existing and c.name != key and c.name not in serial
+        ]
+
+        conn.execute(text(
+            f"CREATE TABLE {q(legacy)} AS SELECT t.*, ({fill}) AS partition_day FROM {q(table)} t"
+        ))
+        conn.execute(text(f"DROP TABLE {q(table)}"))
+        Model.__table__.create(conn)
+
+        for (day,) in conn.execute(text(
+            f"SELECT DISTINCT partition_day FROM {q(legacy)} WHERE partition_day IS NOT NULL"
+        )):
+            name = partition_name(Model, day)
+            conn.execute(text(
+                f"CREATE TABLE {q(name)} PARTITION OF {q(table)} "
+                f"FOR VALUES FROM ('{day.isoformat()}') TO ('{(day + timedelta(days=1)).isoformat()}')"
+            ))
+
+        columns = ", ".join(q(c) for c in copied)
+        conn.execute(text(
+            f"INSERT INTO {q(table)} ({columns}, {q(key)}) "
+            f"SELECT {columns}, partition_day FROM {q(legacy)} WHERE partition_day IS NOT NULL"
+        ))
+        conn.execute(text(f"DROP TABLE {q(legacy)}"))
+
+    return True
+
@@ -0,0 +1,171 @@
+"""
+Razorpay webhook processing.
+
+Every delivery is first written to webhook_events with
+ON CONFLICT (event_id) DO NOTHING. A retry of an event we already have
+stops right there; a new event applies its state change in the same
+transaction, so the log row and the order/entitlement changes commit
+together or not at all.
+"""
+import hashlib
+from typing import Optional
+
+import orjson
+from sqlalchemy import and_, exists, literal, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.purchase import (
+    PurchaseOrder,
+    PurchasedDocument,
+    PurchaseOrderItem,
+    WebhookEvent
+)
+from app.services.entitlements import invalidate
+
+
+CAPTURED = "payment.captured"
+FAILED = "payment.failed"
+
+
+def event_key(body: bytes, event_id: Optional[str] = None) -> str:
+    # Razorpay resends the identical body on retry, so the body hash is a
+    # stable fallback when the event id header is absent
+    return event_id or hashlib.sha256(body).hexdigest()
+
+
+def record_event(db: Session, event_id: str, event: str, payment: dict, body: bytes) -> bool:
+    """Returns False when this event id was already logged."""
+    stmt = (
+        insert(WebhookEvent)
+        .values(
+            event_id=event_id,
+            event=event,
+            razorpay_order_id=payment.get("order_id"),
+            razorpay_payment_id=payment.get("id"),
+            payload=body.decode("utf-8", "replace")
+        )
+        .on_conflict_do_nothing(index_elements=["event_id"])
+        .returning(WebhookEvent.id)
+    )
+    return db.execute(stmt).first() is not None
+
+
+def mark_paid(db: Session, razorpay_order_id: str, razorpay_payment_id: str) -> Optional[int]:
+    """
+    Marks the order PAID and grants its items. Returns the order's user id
+    (None when the order is unknown).
+
+    The UPDATE takes the order row lock that /purchase/verify also
+    holds (SELECT ... FOR UPDATE), so the two serialize on the same
+    order; the grant INSERT then runs on a fresh snapshot and skips
+    documents verify already granted.
+    """
+    paid = db.execute(
+        update(PurchaseOrder)
+        .where(PurchaseOrder.razorpay_order_id == razorpay_order_id)
+        .values(
+            status="PAID",
+            razorpay_payment_id=razorpay_payment_id
+        )
+        .returning(PurchaseOrder.id, PurchaseOrder.user_id)
+    ).first()
+
+    if paid is None:
+        return None
+
+    order_id, user_id = paid
+
+    already_granted = exists().where(
+        and_(
+            PurchasedDocument.user_id == user_id,
+            PurchasedDocument.document_id == PurchaseOrderItem.document_id
+        )
+    )
+
+    grants = (
+        select(
+            PurchaseOrderItem.purchase_order_id,
+            literal(user_id),
+            PurchaseOrderItem.document_id,
+            PurchaseOrderItem.company,
+            PurchaseOrderItem.isin,
+            PurchaseOrderItem.year,
+            PurchaseOrderItem.document_type,
+            PurchaseOrderItem.price
+        )
+        .where(
+            PurchaseOrderItem.purchase_order_id == order_id,
+            ~already_granted
+        )
+        .distinct()
+    )
+
+    db.execute(
+        insert(PurchasedDocument).from_select(
+            [
+                "purchase_order_id",
+                "user_id",
+                "document_id",
+                "company",
+                "isin",
+                "year",
+                "document_type",
+                "price"
+            ],
+            grants
+        )
+    )
+
+    return user_id
+
+
+def mark_failed(db: Session, razorpay_order_id: str) -> None:
+    # A failed attempt can arrive after a later successful one; never
+    # downgrade a PAID order
+    db.execute(
+        update(PurchaseOrder)
+        .where(
+            PurchaseOrder.razorpay_order_id == razorpay_order_id,
+            PurchaseOrder.status != "PAID"
+        )
+        .values(status="FAILED")
+    )
+
+
+def process_event(db: Session, body: bytes, event_id: Optional[str] = None) -> bool:
+    """
+    Logs and applies one verified webhook body. Returns False for a
+    duplicate delivery (nothing applied).
+    """
+    payload = orjson.loads(body)
+    event = payload.get("event") or ""
+
+    payment = (
+        payload.get("payload", {})
+        .get("payment", {})
+        .get("entity", {})
+    )
+
+    try:
+        if not record_event(db, event_key(body, event_id), event, payment, body):
+            db.rollback()
+            return False
+
+        user_id = None
+
+        if event == CAPTURED and payment.get("order_id"):
+            user_id = mark_paid(db, payment["order_id"], payment.get("id"))
+
+        elif event == FAILED and payment.get("order_id"):
+            mark_failed(db, payment["order_id"])
+
+        db.commit()
+
+    except Exception:
+        db.rollback()
+        raise
+
+    invalidate(user_id)
+
+    return True
@@ -0,0 +1,138 @@
+"""
+Buffered last-seen heartbeats.
+
+/auth/update-last-seen only records the timestamp in process memory. A
+background task flushes the pending timestamps every PRESENCE_FLUSH_SECONDS
+with a single UPDATE ... FROM (VALUES ...), so heartbeats cost no
+per-request transaction and each user's row is written at most once per
+flush interval.
+
+Readers combine the stored last_seen with anything still pending here;
+other workers' heartbeats become visible after their next flush, which is
+well inside the online window.
+"""
+import asyncio
+import os
+from datetime import datetime, timedelta
+from threading import Lock
+from typing import Dict, Optional
+
+from sqlalchemy import DateTime, Integer, column, or_, update, values
+
+from app.database import SessionLocal
+from app.models.auth import User
+
+
+PRESENCE_FLUSH_SECONDS = float(os.getenv("PRESENCE_FLUSH_SECONDS", "30"))
+FLUSH_CHUNK = 5000  # users per statement (2 bind params each)
+ONLINE_WINDOW = timedelta(seconds=int(os.getenv("PRESENCE_ONLINE_SECONDS", "300")))
+
+_pending: Dict[int, datetime] = {}
+_lock = Lock()
+_task: Optional[asyncio.Task] = None
+
+
+def touch(userid: int, now: Optional[datetime] = None) -> None:
+    now = now or datetime.utcnow()
+    with _lock:
+        if _pending.get(userid, now) <= now:
+            _pending[userid] = now
+
+
+def forget(userid: int) -> None:
+    with _lock:
+        _pending.pop(userid, None)
+
+
+def pending_count() -> int:
+    return len(_pending)
+
+
+def last_seen(user) -> Optional[datetime]:
+    pending = _pending.get(user.userid)
+    if pending and (user.last_seen is None or pending > user.last_seen):
+        return pending
+    return user.last_seen
+
+
+def is_online(user, now: Optional[datetime] = None) -> bool:
+    if not user.is_online:
+        return False
+
+    seen = last_seen(user)
+    if seen is None:
+        return False
+
+    return seen >= (now or datetime.utcnow()) - ONLINE_WINDOW
+
+
+def _bulk_update(items):
+    beats = values(
+        column("userid", Integer),
+        column("last_seen", DateTime),
+        name="beats"
+    ).data(items)
+
+    return (
+        update(User)
+        .where(
+            User.userid == beats.c.userid,
+            or_(User.last_seen.is_(None), User.last_seen < beats.c.last_seen)
+        )
+        .values(last_seen=beats.c.last_seen)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def flush() -> int:
+    """Writes and clears pending heartbeats. Returns the number of users."""
+    global _pending
+
+    with _lock:
+        batch, _pending = _pending, {}
+
+    if not batch:
+        return 0
+
+    items = list(batch.items())
+
+    db = SessionLocal()
+    try:
+        for i in range(0, len(items), FLUSH_CHUNK):
+            db.execute(_bulk_update(items[i:i + FLUSH_CHUNK]))
+        db.commit()
+    except Exception:
+        db.rollback()
+        # put the batch back (newer heartbeats win) for the next attempt
+        with _lock:
+            for userid, seen in batch.items():
+                if _pending.get(userid, seen) <= seen:
+                    _pending[userid] = seen
+        raise
+    finally:
+        db.close()
+
+    return len(batch)
+
+
+async def _flush_loop():
+    while True:
+        await asyncio.sleep(PRESENCE_FLUSH_SECONDS)
+        try:
+            await asyncio.to_thread(flush)
+        except Exception as e:
+            print("PRESENCE FLUSH ERROR:", str(e))
+
+
+def start() -> None:
+    global _task
+    if _task is None:
+        _task = asyncio.get_running_loop().create_task(_flush_loop())
+
+
+async def stop() -> None:
+    global _task
+    if _task is not None:
+        _task.cancel()
+        _task = None
+    await asyncio.to_thread(flush)
@@ -0,0 +1,174 @@
+"""
+Corporate-action text parsing.
+
+Same results as the per-row helpers that used to live in
+app/routes/actions.py, but with every pattern compiled once, the purpose
+rules folded into a single regex and repeated strings (purposes, company
+names, dates) memoized.
+"""
+import re
+from datetime import datetime
+from functools import lru_cache
+
+
+CACHE_SIZE = 65536
+
+DATE_FORMATS = [
+    "%d-%b-%y",
+    "%Y-%m-%d",
+    "%d-%m-%Y",
+    "%d/%m/%Y",
+]
+
+
+# -----------------------------
+# PATTERNS
+# -----------------------------
+WHITESPACE = re.compile(r"\s+")
+COMPANY_SUFFIX = re.compile(r"\b(ltd\.?|limited)\b")
+RATIO = re.compile(r"(\d+\s*:\s*\d+)")
+NUMBER = re.compile(r"(\d+(?:\.\d+)?)")
+
+# One pass over the purpose text. Every rule is a lookahead anchored at
+# the start, so the alternation is tried in the same priority order as
+# the original if-chain while each rule still matches anywhere in the text.
+PURPOSE = re.compile(
+    r"^(?:"
+    # Rights 1:9 @ Premium 91
+    r"(?=.*?Rights?\s+(?P<rights_ratio>\d+\s*:\s*\d+)\s*@\s*Premium\s+(?P<rights_premium>[\d.]+))"
+    # Right Issue of Equity Shares
+    r"|(?=.*?(?P<rights_issue>Right\s+Issue\s+of\s+Equity\s+Shares))"
+    # Stock Split
+    r"|(?=.*?From\s+R(?:s|e)\.?\s*(?P<split_from>[\d.]+).*?To\s+R(?:s|e)\.?\s*(?P<split_to>[\d.]+))"
+    # Bonus only
+    r"|(?=(?P<bonus_only>bonus)$)"
+    # Bonus Ratio
+    r"|(?=.*?(?P<bonus_ratio>\d+\s*:\s*\d+))"
+    # Dividend / Final Dividend / Special Dividend
+    r"|(?=(?P<div_kind>Final Dividend|Special Dividend|Interim Dividend|Dividend)"
+    r"\s*-\s*R(?:s|e)\.?\s*-?\s*(?P<div_value>[\d.]+))"
+    r")",
+    re.IGNORECASE,
+)
+
+
+# -----------------------------
+# PURPOSE SPLITTER
+# -----------------------------
+def split_purpose_and_value(text):
+
+    if not text:
+        return None, None, None
+
+    return _split_purpose(str(text))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _split_purpose(text: str):
+
+    text = WHITESPACE.sub(" ", text).strip()
+
+    m = PURPOSE.match(text)
+    if not m:
+        return text, None, None
+
+    g = m.groupdict()
+
+    if g["rights_ratio"]:
+        return "Rights", g["rights_ratio"].replace(" ", ""), g["rights_premium"]
+
+    if g["rights_issue"]:
+        return "Rights", None, None
+
+    if g["split_from"]:
+        return "Stock Split", f"{g['split_from']} to {g['split_to']}", None
+
+    if g["bonus_only"]:
+        return "Bonus", None, None
+
+    if g["bonus_ratio"]:
+        return "Bonus", g["bonus_ratio"].replace(" ", ""), None
+
+    return g["div_kind"].strip(), g["div_value"].strip(), None
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def normalize_purpose(purpose):
+    purpose = (purpose or "").strip().lower()
+
+    if "bonus" in purpose:
+        return "bonus"
+
+    if "split" in purpose:
+        return "stock split"
+
+    if "dividend" in purpose:
+        return "dividend"
+
+    if "buy back" in purpose or "buyback" in purpose:
+        return "share buyback"
+
+    return purpose
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def normalize_purpose_value(value):
+
+    if not value:
+        return ""
+
+    value = str(value).strip().lower()
+
+    ratio = RATIO.search(value)
+    if ratio:
+        return ratio.group(1).replace(" ", "")
+
+    number = NUMBER.search(value)
+    if number:
+        return str(float(number.group(1)))
+
+    return value
+
+
+# -----------------------------
+# COMPANY NORMALIZE
+# -----------------------------
+@lru_cache(maxsize=CACHE_SIZE)
+def normalize_company(name: str):
+
+    if not name:
+        return None
+
+    name = name.strip().lower()
+
+    name = COMPANY_SUFFIX.sub('', name)
+
+    name = WHITESPACE.sub(' ', name).strip()
+
+    return name
+
+
+# -----------------------------
+# DATE PARSER
+# -----------------------------
+def parse_date(date_value):
+
+    if not date_value:
+        return None
+
+    return _parse_date(str(date_value).strip())
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse_date(value: str):
+
+    if value in ["", "-"]:
+        return None
+
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            pass
+
+    return None
@@ -1,14 +1,25 @@
-import razorpay
-
 from app.core.config import settings
+from app.utils.lazy import lazy_import
 
 
-client = razorpay.Client(
-    auth=(
-        settings.RAZORPAY_KEY_ID,
-        settings.RAZORPAY_KEY_SECRET
-    )
-)
+razorpay = lazy_import("razorpay")
+
+_client = None
+
+
+def get_client():
+    """Razorpay client, built on first use."""
+    global _client
+
+    if _client is None:
+        _client = razorpay.Client(
+            auth=(
+                settings.RAZORPAY_KEY_ID,
+                settings.RAZORPAY_KEY_SECRET
+            )
+        )
+
+    return _client
 
 from uuid import uuid4
 
@@ -24,7 +35,7 @@ def create_order(
 
     receipt = f"INV-{uuid4().hex[:12].upper()}"
 
-    order = client.order.create(
+    order = get_client().order.create(
         {
             "amount": int(amount * 100),
             "currency": currency,
@@ -47,7 +58,7 @@ def verify_signature(
 
     try:
 
-        client.utility.verify_payment_signature(
+        get_client().utility.verify_payment_signature(
             {
                 "razorpay_order_id": razorpay_order_id,
                 "razorpay_payment_id": razorpay_payment_id,
@@ -73,7 +84,7 @@ def verify_signature(
 
     try:
 
-        client.utility.verify_payment_signature(
+        get_client().utility.verify_payment_signature(
             {
                 "razorpay_order_id": razorpay_order_id,
                 "razorpay_payment_id": razorpay_payment_id,
@@ -90,12 +101,12 @@ def verify_signature(
 def fetch_payment(
     payment_id: str
 ):
-    return client.payment.fetch(payment_id)
+    return get_client().payment.fetch(payment_id)
 
 def fetch_order(
     order_id: str
 ):
-    return client.order.fetch(order_id)
+    return get_client().order.fetch(order_id)
 
 
 def refund_payment(
@@ -114,7 +125,7 @@ def refund_payment(
     if amount:
         data["amount"] = amount
 
-    return client.payment.refund(
+    return get_client().payment.refund(
         payment_id,
         data
     )
@@ -126,7 +137,7 @@ def verify_webhook_signature(
 ):
     try:
 
-        client.utility.verify_webhook_signature(
+        get_client().utility.verify_webhook_signature(
             body,
             signature,
             settings.RAZORPAY_WEBHOOK_SECRET
@@ -0,0 +1,244 @@
+"""
+Screener expressions over the company universe.
+
+    P_E < 20 AND ROCE > 15 AND MCAP >= 5000
+    (YRCH > 0 OR QTRCH > 5) AND NOT DEBT_EQ > 1
+    SEC_ID = '12' AND INDEX_STK = 1
+
+Grammar (keywords case-insensitive, fields case-insensitive):
+
+    expr       := and_expr (OR and_expr)*
+    and_expr   := not_expr (AND not_expr)*
+    not_expr   := NOT not_expr | '(' expr ')' | comparison
+    comparison := FIELD op (NUMBER | 'text')
+    op         := < | <= | > | >= | = | == | != | <>
+
+An expression is compiled once into a tree of closures that evaluate
+vectorised over the universe columns; compiled plans are cached by
+expression text. NULLs follow SQL: a row matches only when the whole
+expression is true, never when it is unknown.
+"""
+import operator
+import re
+from functools import lru_cache
+from typing import Callable, List, Tuple
+
+from app.models.heatmap import Company
+from app.services.universe import CompanyUniverse, NUMERIC_TYPES, np
+
+
+MAX_EXPRESSION_LENGTH = 500
+
+# table columns rather than mapper attributes: reading the mapper here
+# would configure every model before the others are imported
+NUMERIC_FIELDS = {
+    c.key.upper(): c.key
+    for c in Company.__table__.columns
+    if isinstance(c.type, NUMERIC_TYPES) and c.key != "pk_id"
+}
+
+TEXT_FIELDS = {
+    c.key.upper(): c.key
+    for c in Company.__table__.columns
+    if not isinstance(c.type, NUMERIC_TYPES)
+}
+
+TOKEN = re.compile(
+    r"\s*(?:"
+    r"(?P<num>-?\d+(?:\.\d+)?)"
+    r"|'(?P<str>[^']*)'"
+    r"|(?P<op><=|>=|<>|!=|==|<|>|=)"
+    r"|(?P<paren>[()])"
+    r"|(?P<word>[A-Za-z_][A-Za-z0-9_]*)"
+    r")"
+)
+
+Mask = Callable[[CompanyUniverse], Tuple["np.ndarray", "np.ndarray"]]
+
+OPERATORS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "=": operator.eq,
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<>": operator.ne,
+}
+
+
+class ScreenerError(ValueError):
+    pass
+
+
+# -----------------------------
+# TOKENIZER
+# -----------------------------
+def tokenize(text: str) -> List[Tuple[str, str]]:
+    tokens = []
+    pos = 0
+    text = text.strip()
+
+    while pos < len(text):
+        m = TOKEN.match(text, pos)
+        if not m or m.end() == pos:
+            raise ScreenerError(f"Unexpected input at position {pos}: {text[pos:pos + 10]!r}")
+
+        kind = m.lastgroup
+        value = m.group(kind)
+
+        if kind == "word" and value.upper() in ("AND", "OR", "NOT"):
+            kind, value = "kw", value.upper()
+
+        tokens.append((kind, value))
+        pos = m.end()
+
+    return tokens
+
+
+# -----------------------------
+# PARSER -> CLOSURES
+# -----------------------------
+class Parser:
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.i = 0
+
+    def peek(self):
+        return self.tokens[self.i] if self.i < len(self.tokens) else (None, None)
+
+    def take(self, kind=None, value=None):
+        tok = self.peek()
+        if tok[0] is None or (kind and tok[0] != kind) or (value and tok[1] != value):
+            want = value or {"word": "field", "op": "operator"}.get(kind, "value")
+            got = repr(tok[1]) if tok[0] else "end of expression"
+            raise ScreenerError(f"Expected {want}, got {got}")
+        self.i += 1
+        return tok
+
+    def parse(self) -> Mask:
+        node = self.expr()
+        if self.peek()[0] is not None:
+            raise ScreenerError(f"Unexpected {self.peek()[1]!r}")
+        return node
+
+    def expr(self) -> Mask:
+        node = self.and_expr()
+        while self.peek() == ("kw", "OR"):
+            self.take()
+            node = _or(node, self.and_expr())
+        return node
+
+    def and_expr(self) -> Mask:
+        node = self.not_expr()
+        while self.peek() == ("kw", "AND"):
+            self.take()
+            node = _and(node, self.not_expr())
+        return node
+
+    def not_expr(self) -> Mask:
+        if self.peek() == ("kw", "NOT"):
+            self.take()
+            return _not(self.not_expr())
+
+        if self.peek() == ("paren", "("):
+            self.take()
+            node = self.expr()
+            self.take("paren", ")")
+            return node
+
+        return self.comparison()
+
+    def comparison(self) -> Mask:
+        _, name = self.take("word")
+        _, op = self.take("op")
+        kind, value = self.take()
+
+        field = name.upper()
+
+        if field in NUMERIC_FIELDS:
+            if kind != "num":
+                raise ScreenerError(f"{name} needs a number")
+            return _numeric(NUMERIC_FIELDS[field], op, float(value))
+
+        if field in TEXT_FIELDS:
+            if kind not in ("str", "num") or op not in ("=", "==", "!=", "<>"):
+                raise ScreenerError(f"{name} supports only = / != against a value")
+            return _text(TEXT_FIELDS[field], op, value)
+
+        raise ScreenerError(f"Unknown field {name}")
+
+
+# Each node returns (true, known) masks: SQL three-valued logic, where a
+# comparison against NULL is unknown and NOT unknown is still unknown.
+def _numeric(column: str, op: str, value: float) -> Mask:
+    compare = OPERATORS[op]
+
+    def evaluate(u: CompanyUniverse):
+        col = u.numeric[column]
+        known = ~np.isnan(col)
+        return compare(col, value) & known, known
+    return evaluate
+
+
+def _text(column: str, op: str, value: str) -> Mask:
+    compare = OPERATORS[op]
+
+    def evaluate(u: CompanyUniverse):
+        col = u.text[column]
+        known = col != ""
+        return compare(col, value) & known, known
+    return evaluate
+
+
+def _and(a: Mask, b: Mask) -> Mask:
+    def evaluate(u: CompanyUniverse):
+        (t1, k1), (t2, k2) = a(u), b(u)
+        return t1 & t2, (k1 & k2) | (k1 & ~t1) | (k2 & ~t2)
+    return evaluate
+
+
+def _or(a: Mask, b: Mask) -> Mask:
+    def evaluate(u: CompanyUniverse):
+        (t1, k1), (t2, k2) = a(u), b(u)
+        return t1 | t2, (k1 & k2) | t1 | t2
+    return evaluate
+
+
+def _not(a: Mask) -> Mask:
+    def evaluate(u: CompanyUniverse):
+        t, k = a(u)
+        return ~t & k, k
+    return evaluate
+
+
+@lru_cache(maxsize=1024)
+def compile_expression(text: str) -> Mask:
+    if len(text) > MAX_EXPRESSION_LENGTH:
+        raise ScreenerError(f"Expression longer than {MAX_EXPRESSION_LENGTH} characters")
+
+    tokens = tokenize(text)
+    if not tokens:
+        raise ScreenerError("Empty expression")
+
+    return Parser(tokens).parse()
+
+
+def sort_key(sort: str) -> Tuple[str, bool]:
+    """'-MCAP' / 'MCAP' / 'mcap:desc' -> (column, descending)."""
+    descending = sort.startswith("-") or sort.lower().endswith(":desc")
+    name = sort.lstrip("-+").split(":")[0].upper()
+
+    if name not in NUMERIC_FIELDS:
+        raise ScreenerError(f"Cannot sort on {sort}")
+
+    return NUMERIC_FIELDS[name], descending
+
+
+def screen(universe: CompanyUniverse, expression: str, sort: str, offset: int, limit: int):
+    mask, _ = compile_expression(expression.strip())(universe)
+    column, descending = sort_key(sort)
+
+    positions = universe.order(column, mask=mask, descending=descending, nulls=True)
+    return len(positions), universe.take(positions[offset:offset + limit])
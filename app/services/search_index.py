@@ -0,0 +1,306 @@
+"""
+Type-ahead company index.
+
+One in-memory index over every place a company name lives: the heatmap
+company table (short name, full name, NSE / BSE symbols, ISIN), IPO data
+(co_name), research reports (company) and the IPO tracker (CO_NAME).
+Rows for the same ISIN, or with the same normalised name, are merged
+into one entry.
+
+Lookups, best first:
+
+    exact     a name / symbol / ISIN equals the query
+    prefix    a name starts with the query
+    word      a later word of a name starts with the query ("motors")
+    infix     the query appears anywhere (trigram candidates, then checked)
+    fuzzy     most of the query's trigrams appear (typos), 4+ characters
+
+Ties go to the larger MCAP (fuzzy: to more shared trigrams first). The index is rebuilt when an upload route
+calls invalidate(), when the source tables change size (checked every
+VERSION_CHECK_SECONDS) and at least every MAX_AGE_SECONDS.
+"""
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Set
+
+from sqlalchemy import func, null, select
+from sqlalchemy.orm import Session
+
+from app.models.file import CompanyFile
+from app.models.heatmap import Company
+from app.models.ipo import DataUpload
+from app.models.ipotrack import IpoTrack
+from app.services import partitions
+
+
+VERSION_CHECK_SECONDS = 30
+MAX_AGE_SECONDS = 600
+MAX_QUERY_LENGTH = 64
+FUZZY_MIN_LENGTH = 4
+FUZZY_MIN_SHARE = 0.6
+MEMO_PREFIX_LENGTH = 2
+MAX_LIMIT = 50
+
+EXACT, PREFIX, WORD, INFIX, FUZZY = range(5)
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+_LEGAL_SUFFIX = re.compile(r"( (ltd|limited|pvt|private|co|company|corp|corporation|inc))+$")
+
+
+def normalize(text) -> str:
+    return _NON_ALNUM.sub(" ", str(text or "").lower()).strip()
+
+
+def merge_key(text) -> str:
+    """Name key for merging rows that carry no ISIN: 'X Ltd.' == 'X Limited'."""
+    key = normalize(text)
+    return _LEGAL_SUFFIX.sub("", key) or key
+
+
+def trigrams(text: str) -> Set[str]:
+    padded = f" {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class Entry:
+    __slots__ = ("name", "isin", "nse", "bse", "mcap", "sources", "aliases")
+
+    def __init__(self):
+        self.name = None
+        self.isin = None
+        self.nse = None
+        self.bse = None
+        self.mcap = None
+        self.sources: Set[str] = set()
+        self.aliases: Set[str] = set()
+
+    def as_dict(self, match: int) -> dict:
+        return {
+            "name": self.name,
+            "isin": self.isin,
+            "nse": self.nse,
+            "bse": self.bse,
+            "mcap": self.mcap,
+            "sources": sorted(self.sources),
+            "match": ("exact", "prefix", "word", "infix", "fuzzy")[match],
+        }
+
+
+class SearchIndex:
+
+    def __init__(self, version, entries: List[Entry]):
+        self.version = version
+        self.built_at = time.monotonic()
+        self.entries = entries
+
+        # sorted (key, entry, tier) for bisect prefix scans; each alias is
+        # keyed in full (PREFIX) and from every later word start (WORD)
+        keyed = []
+        for i, entry in enumerate(entries):
+            for alias in entry.aliases:
+                keyed.append((alias, i, PREFIX))
+                for m in re.finditer(" ", alias):
+                    keyed.append((alias[m.end():], i, WORD))
+        keyed.sort()
+
+        self.keys = [k for k, _, _ in keyed]
+        self.owners = [(i, tier) for _, i, tier in keyed]
+
+        self.exact: Dict[str, List[int]] = defaultdict(list)
+        self.grams: Dict[str, List[int]] = defaultdict(list)
+        self.haystack: List[str] = []
+
+        for i, entry in enumerate(entries):
+            for alias in entry.aliases:
+                self.exact[alias].append(i)
+            self.haystack.append("|".join(sorted(entry.aliases)))
+
+            grams = set()
+            for alias in entry.aliases:
+                grams |= trigrams(alias)
+            for gram in grams:
+                self.grams[gram].append(i)
+
+        self.memo: Dict[str, List[tuple]] = {}
+
+        # tie-break position: larger MCAP first
+        self.rank = {
+            i: r for r, i in enumerate(
+                sorted(range(len(entries)), key=lambda i: -(entries[i].mcap or 0))
+            )
+        }
+
+    def search(self, query: str, limit: int = 10) -> List[dict]:
+        q = normalize(query)[:MAX_QUERY_LENGTH]
+        if not q:
+            return []
+
+        # one- and two-letter queries hit thousands of keys; their ranking
+        # never changes for this index, so keep it
+        if len(q) <= MEMO_PREFIX_LENGTH:
+            ranked = self.memo.get(q)
+            if ranked is None:
+                ranked = self.memo[q] = self._ranked(q, MAX_LIMIT)
+        else:
+            ranked = self._ranked(q, limit)
+
+        return [self.entries[i].as_dict(tier) for i, tier in ranked[:limit]]
+
+    def _ranked(self, q: str, limit: int) -> List[tuple]:
+        best: Dict[int, int] = {}
+        score: Dict[int, int] = {}
+
+        for i in self.exact.get(q, ()):
+            best[i] = EXACT
+
+        lo = bisect_left(self.keys, q)
+        hi = bisect_left(self.keys, q + "\x7f", lo)
+        for i, tier in self.owners[lo:hi]:
+            if best.get(i, FUZZY + 1) > tier:
+                best[i] = tier
+
+        if len(best) < limit and len(q) >= 3:
+            # interior trigrams only: an infix need not start at a word
+            postings = [self.grams.get(q[j:j + 3], ()) for j in range(len(q) - 2)]
+
+            if all(postings):
+                candidates = set(min(postings, key=len)).intersection(*postings)
+                for i in candidates:
+                    if i not in best and q in self.haystack[i]:
+                        best[i] = INFIX
+
+            if not best and len(q) >= FUZZY_MIN_LENGTH:
+                grams = trigrams(q)
+                hits = Counter(i for g in grams for i in self.grams.get(g, ()))
+                need = FUZZY_MIN_SHARE * len(grams)
+                for i, n in hits.items():
+                    if n >= need:
+                        best[i] = FUZZY
+                        score[i] = n
+
+        rank = self.rank
+        return sorted(
+            best.items(),
+            key=lambda kv: (kv[1], -score.get(kv[0], 0), rank[kv[0]])
+        )[:limit]
+
+
+# -----------------------------
+# BUILD
+# -----------------------------
+def _clean(value) -> Optional[str]:
+    value = str(value).strip() if value is not None else ""
+    return value or None
+
+
+def build(db: Session, version=None) -> SearchIndex:
+    by_isin: Dict[str, Entry] = {}
+    by_name: Dict[str, Entry] = {}
+    entries: List[Entry] = []
+
+    def entry_for(isin, name) -> Entry:
+        entry = (isin and by_isin.get(isin)) or by_name.get(merge_key(name))
+        if entry is None:
+            entry = Entry()
+            entries.append(entry)
+        if isin and entry.isin is None:
+            entry.isin = isin
+            by_isin[isin] = entry
+        return entry
+
+    def add(entry: Entry, source: str, *aliases):
+        entry.sources.add(source)
+        for alias in aliases:
+            key = normalize(alias)
+            if key:
+                entry.aliases.add(key)
+                by_name.setdefault(merge_key(alias), entry)
+
+    # heatmap first: it carries symbols and MCAP, and its names win
+    rows = db.execute(select(
+        Company.ISIN, Company.COMPANY, Company.COMPANY_NAME,
+        Company.NSE, Company.BSE, Company.MCAP,
+    ).where(partitions.is_latest(Company)))
+    for isin, short, full, nse, bse, mcap in rows:
+        isin = _clean(isin)
+        entry = entry_for(isin, full or short)
+        entry.name = entry.name or _clean(full) or _clean(short)
+        entry.nse = entry.nse or _clean(nse)
+        entry.bse = entry.bse or _clean(bse)
+        entry.mcap = float(mcap) if mcap is not None else entry.mcap
+        add(entry, "heatmap", short, full, nse, bse, isin)
+
+    sources = [
+        ("ipo", select(DataUpload.isin, DataUpload.co_name).distinct()),
+        ("reports", select(CompanyFile.isin, CompanyFile.company).distinct()),
+        ("ipotrack", select(null(), IpoTrack.CO_NAME).distinct()),
+    ]
+    for source, stmt in sources:
+        for isin, name in db.execute(stmt):
+            isin, name = _clean(isin), _clean(name)
+            if not (isin or name):
+                continue
+            entry = entry_for(isin, name)
+            entry.name = entry.name or name or isin
+            add(entry, source, name, isin)
+
+    return SearchIndex(version, entries)
+
+
+def current_version(db: Session) -> tuple:
+    """Row counts and max ids of the source tables, in one round trip."""
+    parts = []
+    for Model, pk, *where in (
+        # company keeps history: only its latest day is indexed
+        (Company, Company.pk_id, partitions.is_latest(Company)),
+        (DataUpload, DataUpload.id),
+        (CompanyFile, CompanyFile.id),
+        (IpoTrack, IpoTrack.ID),
+    ):
+        parts.append(select(func.count()).select_from(Model).where(*where).scalar_subquery())
+        parts.append(select(func.max(pk)).where(*where).scalar_subquery())
+
+    return tuple(db.execute(select(*parts)).one())
+
+
+# -----------------------------
+# PER-WORKER CACHE
+# -----------------------------
+_index: Optional[SearchIndex] = None
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def get_index(db: Session) -> SearchIndex:
+    global _index, _checked_at
+
+    now = time.monotonic()
+    index = _index
+
+    if index is not None and now - _checked_at < VERSION_CHECK_SECONDS:
+        return index
+
+    with _lock:
+        if _index is not None and now - _checked_at < VERSION_CHECK_SECONDS:
+            return _index
+
+        version = current_version(db)
+
+        if (
+            _index is None
+            or _index.version != version
+            or now - _index.built_at > MAX_AGE_SECONDS
+        ):
+            _index = build(db, version)
+
+        _checked_at = now
+        return _index
+
+
+def invalidate() -> None:
+    global _index
+    with _lock:
+        _index = None
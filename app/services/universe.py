@@ -0,0 +1,187 @@
+"""
+In-memory columnar snapshot of the heatmap company table.
+
+The universe is the latest day of the company table, a few thousand
+rows replaced once a day by /heatmap/upload/, so each worker keeps it as NumPy columns and answers
+search / sector / house / index filters, sorts and top-N without a
+query. The snapshot is keyed on the latest CompanyUpload id: the
+uploading worker drops its copy immediately, other workers notice the
+new id within VERSION_CHECK_SECONDS.
+"""
+import re
+import threading
+import time
+from typing import Dict, List, Optional
+
+from sqlalchemy import Integer, Numeric, SmallInteger, BigInteger, func, select
+from sqlalchemy.orm import Session
+
+from app.models.heatmap import Company, CompanyUpload
+from app.services import partitions
+from app.services.fastread import row_encoder
+from app.utils.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+
+VERSION_CHECK_SECONDS = 30
+
+NUMERIC_TYPES = (Numeric, Integer, SmallInteger, BigInteger)
+
+SEARCH_COLUMNS = ("COMPANY", "COMPANY_NAME", "NSE", "BSE", "ISIN")
+
+
+class CompanyUniverse:
+
+    def __init__(self, version, rows: List[dict]):
+        self.version = version
+        self.rows = rows
+        self.size = len(rows)
+
+        self.numeric: Dict[str, "np.ndarray"] = {}
+        self.text: Dict[str, "np.ndarray"] = {}
+
+        for attr in Company.__mapper__.column_attrs:
+            values = [row[attr.key] for row in rows]
+
+            if isinstance(attr.columns[0].type, NUMERIC_TYPES):
+                self.numeric[attr.key] = np.array(
+                    [np.nan if v is None else v for v in values],
+                    dtype=np.float64
+                )
+            else:
+                self.text[attr.key] = np.array(
+                    ["" if v is None else str(v) for v in values],
+                    dtype=str
+                )
+
+        # The five search columns of every row, lower-cased, joined into one
+        # string; a substring search is a single C-level scan whose match
+        # offsets map back to rows through `starts`.
+        parts = [
+            "\x1f".join(str(row[c] or "") for c in SEARCH_COLUMNS).lower()
+            for row in rows
+        ]
+        self.haystack = "\n".join(parts)
+        self.starts = np.cumsum([0] + [len(p) + 1 for p in parts[:-1]]) if parts else np.zeros(0, dtype=np.int64)
+        self.house_key = np.char.lower(np.char.strip(self.text["IH_MNAME"]))
+
+    # -----------------------------
+    # FILTERS
+    # -----------------------------
+    def mask(
+        self,
+        search: Optional[str] = None,
+        sector: Optional[str] = None,
+        house: Optional[str] = None,
+        index: Optional[int] = None,
+    ):
+        mask = np.ones(self.size, dtype=bool)
+
+        if search and search.strip():
+            mask &= self.search_mask(search.strip().lower())
+
+        if sector:
+            mask &= self.text["SEC_ID"] == sector
+
+        if house:
+            mask &= self.house_key == house.strip().lower()
+
+        if index is not None:
+            mask &= self.numeric["INDEX_STK"] == index
+
+        return mask
+
+    def search_mask(self, term: str):
+        found = np.zeros(self.size, dtype=bool)
+
+        if "\n" in term or "\x1f" in term:
+            return found
+
+        hits = [m.start() for m in re.finditer(re.escape(term), self.haystack)]
+        if hits:
+            found[np.searchsorted(self.starts, hits, side="right") - 1] = True
+
+        return found
+
+    # -----------------------------
+    # ORDERING
+    # -----------------------------
+    def order(self, column: str, mask=None, descending: bool = True,
+              limit: Optional[int] = None, nulls: bool = False):
+        """
+        Row positions sorted on a numeric column. NULLs are dropped, or
+        appended after the ranked rows when nulls=True.
+        """
+        values = self.numeric[column]
+        missing = np.isnan(values)
+
+        keep = ~missing
+        if mask is not None:
+            keep &= mask
+            missing &= mask
+
+        idx = np.flatnonzero(keep)
+        keys = -values[idx] if descending else values[idx]
+
+        if limit is not None and limit < len(idx):
+            part = np.argpartition(keys, limit)[:limit]
+            idx, keys = idx[part], keys[part]
+
+        ranked = idx[np.argsort(keys, kind="stable")]
+
+        if nulls:
+            ranked = np.concatenate([ranked, np.flatnonzero(missing)])
+            if limit is not None:
+                ranked = ranked[:limit]
+
+        return ranked
+
+    def take(self, positions) -> List[dict]:
+        rows = self.rows
+        return [rows[i] for i in positions]
+
+
+_universe: Optional[CompanyUniverse] = None
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def current_version(db: Session):
+    return db.scalar(select(func.max(CompanyUpload.id)))
+
+
+def build(db: Session, version=None) -> CompanyUniverse:
+    enc = row_encoder(Company)
+    rows = enc.encode(db.execute(
+        enc.select(partitions.is_latest(Company), order_by=Company.pk_id)
+    ))
+    return CompanyUniverse(version, rows)
+
+
+def get_universe(db: Session) -> CompanyUniverse:
+    global _universe, _checked_at
+
+    now = time.monotonic()
+    universe = _universe
+
+    if universe is not None and now - _checked_at < VERSION_CHECK_SECONDS:
+        return universe
+
+    with _lock:
+        if _universe is not None and now - _checked_at < VERSION_CHECK_SECONDS:
+            return _universe
+
+        version = current_version(db)
+
+        if _universe is None or _universe.version != version:
+            _universe = build(db, version)
+
+        _checked_at = now
+        return _universe
+
+
+def invalidate() -> None:
+    global _universe
+    with _lock:
+        _universe = None
@@ -0,0 +1,47 @@
+from typing import Dict, Iterable, List
+
+from fastapi import HTTPException
+from sqlalchemy import String, any_, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY
+
+MAX_BATCH_KEYS = 200
+
+
+def parse_keys(values: List[str], name: str = "isins") -> List[str]:
+    """
+    Accepts repeated (?isins=A&isins=B) and/or comma separated (?isins=A,B)
+    values. Returns them stripped and de-duplicated, in request order.
+    """
+    keys = []
+    seen = set()
+
+    for value in values or []:
+        for key in value.split(","):
+            key = key.strip()
+            if key and key not in seen:
+                seen.add(key)
+                keys.append(key)
+
+    if not keys:
+        raise HTTPException(status_code=400, detail=f"No {name} given")
+
+    if len(keys) > MAX_BATCH_KEYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_BATCH_KEYS} {name} per request"
+        )
+
+    return keys
+
+
+def any_of(column, keys: List[str]):
+    """column = ANY(:keys) with the whole list bound as one array parameter."""
+    return column == any_(bindparam(None, keys, type_=ARRAY(String)))
+
+
+def group_rows(rows: Iterable, key, keys: List[str]) -> Dict[str, list]:
+    """Keyed map with every requested key present (empty list when missing)."""
+    out = {k: [] for k in keys}
+    for row in rows:
+        out.setdefault(key(row), []).append(row)
+    return out
@@ -74,16 +74,12 @@ def verify_access_token(token: str):
 
     try:
 
-        print("VERIFY TOKEN START")
-
         payload = jwt.decode(
             token,
             SECRET_KEY,
             algorithms=["HS256"]
         )
 
-        print("DECODED PAYLOAD:", payload)
-
 
         user_id = payload.get("sub")
 
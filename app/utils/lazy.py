@@ -0,0 +1,57 @@
+import importlib
+import importlib.util
+import sys
+import threading
+import types
+
+
+class _LazyModule(types.ModuleType):
+    """
+    Stand-in for a module until its first attribute access.
+
+    The real import runs under a per-module lock and then the stand-in
+    takes over the module's namespace, so concurrent first uses (request
+    threads racing the startup preload) all wait for one complete import.
+    importlib's LazyLoader is not safe for this: threads arriving while
+    it executes the module see a half-initialised namespace.
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazy_lock"] = threading.Lock()
+
+    def __getattr__(self, attr):
+        with self.__dict__["_lazy_lock"]:
+            module = importlib.import_module(self.__name__)
+            self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+
+def lazy_import(name: str):
+    """
+    Module object whose real import runs on first attribute access.
+
+    Used for the heavy scientific / client libraries (pandas, numpy,
+    PyMuPDF, requests, razorpay, boto3) so importing a router does not
+    pay for them; app.core.startup warms them in the background once the
+    worker is serving.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+
+    if importlib.util.find_spec(name) is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+
+    return _LazyModule(name)
+
+
+def is_loaded(name: str) -> bool:
+    """True once the module has really been imported."""
+    module = sys.modules.get(name)
+    spec = getattr(module, "__spec__", None)
+    return module is not None and not getattr(spec, "_initializing", False)
+
+
+def load(name: str):
+    """Finishes importing a lazily used module (any attribute access does)."""
+    return importlib.import_module(name)
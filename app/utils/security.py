@@ -1,9 +1,115 @@
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from fastapi import HTTPException
 from passlib.hash import argon2
 
+from app.core.config import settings
+
+
+# argon2 is deliberately CPU and memory heavy. It runs in a small process
+# pool so a login burst cannot hold the GIL / request threadpool that the
+# read endpoints share. At most PASSWORD_HASH_MAX_PENDING calls may be
+# queued or running; beyond that callers get a 503 at once rather than
+# holding a threadpool thread while they wait for a slot.
+
+ARGON2_PARAMS = {
+    "rounds": settings.ARGON2_TIME_COST,
+    "memory_cost": settings.ARGON2_MEMORY_COST,
+    "parallelism": settings.ARGON2_PARALLELISM,
+}
+
+_pool = None
+_pool_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(settings.PASSWORD_HASH_MAX_PENDING)
+
+_stats_lock = threading.Lock()
+_stats = {
+    "pending": 0,
+    "peak_pending": 0,
+    "completed": 0,
+    "rejected": 0,
+    "total_ms": 0.0,
+}
+
+
+# -------------------------
+# Worker side (runs in the pool processes)
+# -------------------------
+def _hash(password: str, params: dict) -> str:
+    return argon2.using(**params).hash(password)
+
+
+def _verify(password: str, hashed: str) -> bool:
+    return argon2.verify(password, hashed)
+
+
+# -------------------------
+# Pool
+# -------------------------
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(
+                    max_workers=settings.PASSWORD_HASH_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+    return _pool
+
+
+def _run(fn, *args):
+    if not _slots.acquire(blocking=False):
+        with _stats_lock:
+            _stats["rejected"] += 1
+        raise HTTPException(
+            status_code=503,
+            detail="Too many authentication requests, please retry"
+        )
+
+    with _stats_lock:
+        _stats["pending"] += 1
+        _stats["peak_pending"] = max(_stats["peak_pending"], _stats["pending"])
+
+    start = time.perf_counter()
+    try:
+        return _get_pool().submit(fn, *args).result()
+    finally:
+        elapsed = (time.perf_counter() - start) * 1000
+        with _stats_lock:
+            _stats["pending"] -= 1
+            _stats["completed"] += 1
+            _stats["total_ms"] += elapsed
+        _slots.release()
+
+
+def pool_stats() -> dict:
+    with _stats_lock:
+        stats = dict(_stats)
+
+    total_ms = stats.pop("total_ms")
+    stats["avg_ms"] = round(total_ms / stats["completed"], 2) if stats["completed"] else 0.0
+    stats["workers"] = settings.PASSWORD_HASH_WORKERS
+    stats["max_pending"] = settings.PASSWORD_HASH_MAX_PENDING
+
+    return stats
+
+
+def shutdown_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
 # Hash password
 def hash_password(password: str) -> str:
-    return argon2.hash(password)
+    return _run(_hash, password, ARGON2_PARAMS)
 
 # Verify password
 def verify_password(password: str, hashed: str) -> bool:
-    return argon2.verify(password, hashed)
\ No newline at end of file
+    return _run(_verify, password, hashed)
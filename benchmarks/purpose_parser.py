@@ -0,0 +1,243 @@
+"""
+Benchmark: corporate-action purpose/date parsing.
+
+Compares app.services.purpose_parser against the per-row helpers that
+used to live in app/routes/actions.py, checks both give identical output
+and prints timings.
+
+    python -m benchmarks.purpose_parser                 # synthetic 200k rows
+    python -m benchmarks.purpose_parser --rows 1000000
+    python -m benchmarks.purpose_parser --csv CA_file.csv
+"""
+import argparse
+import csv
+import random
+import re
+import time
+from datetime import date, datetime, timedelta
+
+from app.services import purpose_parser as fast
+
+
+# -----------------------------
+# REFERENCE (previous implementation, unchanged)
+# -----------------------------
+def legacy_normalize_purpose(purpose):
+    purpose = (purpose or "").strip().lower()
+
+    if "bonus" in purpose:
+        return "bonus"
+
+    if "split" in purpose:
+        return "stock split"
+
+    if "dividend" in purpose:
+        return "dividend"
+
+    if "buy back" in purpose or "buyback" in purpose:
+        return "share buyback"
+
+    return purpose
+
+
+def legacy_parse_date(date_value):
+
+    if not date_value or str(date_value).strip() in ["", "-"]:
+        return None
+
+    formats = [
+        "%d-%b-%y",
+        "%Y-%m-%d",
+        "%d-%m-%Y",
+        "%d/%m/%Y",
+    ]
+
+    for fmt in formats:
+        try:
+            return datetime.strptime(str(date_value).strip(), fmt).date()
+        except:
+            pass
+
+    return None
+
+
+def legacy_normalize_company(name: str):
+
+    if not name:
+        return None
+
+    name = name.strip().lower()
+
+    name = re.sub(r'\b(ltd\.?|limited)\b', '', name)
+
+    name = re.sub(r'\s+', ' ', name).strip()
+
+    return name
+
+
+def legacy_split_purpose_and_value(text):
+
+    if not text:
+        return None, None, None
+
+    text = str(text)
+    text = re.sub(r"\s+", " ", text).strip()
+
+    rights_ratio = re.search(
+        r'Rights?\s+(\d+\s*:\s*\d+)\s*@\s*Premium\s+([\d.]+)',
+        text,
+        re.IGNORECASE
+    )
+
+    if rights_ratio:
+        return (
+            "Rights",
+            rights_ratio.group(1).replace(" ", ""),
+            rights_ratio.group(2)
+        )
+
+    if re.search(
+        r'Right\s+Issue\s+of\s+Equity\s+Shares',
+        text,
+        re.IGNORECASE
+    ):
+        return ("Rights", None, None)
+
+    split_match = re.search(
+        r"From\s+R(?:s|e)\.?\s*([\d.]+).*?To\s+R(?:s|e)\.?\s*([\d.]+)",
+        text,
+        re.IGNORECASE
+    )
+
+    if split_match:
+        return (
+            "Stock Split",
+            f"{split_match.group(1)} to {split_match.group(2)}",
+            None
+        )
+
+    if text.lower() == "bonus":
+        return ("Bonus", None, None)
+
+    bonus_match = re.search(r"(\d+\s*:\s*\d+)", text)
+
+    if bonus_match:
+        return ("Bonus", bonus_match.group(1).replace(" ", ""), None)
+
+    div_match = re.search(
+        r"^(Final Dividend|Special Dividend|Interim Dividend|Dividend)\s*-\s*R(?:s|e)\.?\s*-?\s*([\d.]+)(?:\s*Per\s*Share)?",
+        text,
+        re.IGNORECASE
+    )
+
+    if div_match:
+        return (div_match.group(1).strip(), div_match.group(2).strip(), None)
+
+    return text.strip(), None, None
+
+
+# -----------------------------
+# SAMPLE DATA
+# -----------------------------
+PURPOSES = [
+    "Dividend - Rs 2 Per Share",
+    "Final Dividend - Rs. - 12.50",
+    "Interim Dividend - Re 0.50 Per Share",
+    "Special  Dividend - Rs 5",
+    "Bonus 1:1",
+    "Bonus issue 2 : 1",
+    "BONUS",
+    "Stock  Split From Rs.10/- to Rs.2/-",
+    "Face Value Split (Sub-Division) - From Re 1/- Per Share To Re 0.50/- Per Share",
+    "Rights 1:9 @ Premium 91",
+    "Right Issue of Equity Shares",
+    "Buy Back of Shares",
+    "Annual General Meeting",
+    "Interest Payment",
+    "",
+    "-",
+]
+
+COMPANY_WORDS = ["Tata", "Reliance", "Infosys", "Bharat", "Adani", "Hindustan",
+                 "Power", "Steel", "Motors", "Finance", "Industries", "Chemicals"]
+SUFFIXES = [" Ltd", " Ltd.", " Limited", " LIMITED", "", "  ltd"]
+
+
+def sample_rows(n, seed=7):
+    rnd = random.Random(seed)
+    start = date(2020, 1, 1)
+
+    def some_date():
+        d = start + timedelta(days=rnd.randrange(2500))
+        fmt = rnd.choice(["%d-%b-%y", "%Y-%m-%d", "%d-%m-%Y", "%d/%m/%Y"])
+        return rnd.choice([d.strftime(fmt), d.strftime(fmt), "", "-", "31-02-2024"])
+
+    companies = [
+        " ".join(rnd.sample(COMPANY_WORDS, 2)) + rnd.choice(SUFFIXES)
+        for _ in range(3000)
+    ]
+
+    for _ in range(n):
+        yield {
+            "Company Name": rnd.choice(companies),
+            "Purpose": rnd.choice(PURPOSES),
+            "Ex Date": some_date(),
+        }
+
+
+def load_csv(path):
+    with open(path, newline="", encoding="utf-8", errors="ignore") as f:
+        return list(csv.DictReader(f))
+
+
+# -----------------------------
+# RUN
+# -----------------------------
+def timed(label, fn):
+    t = time.perf_counter()
+    out = fn()
+    elapsed = time.perf_counter() - t
+    print(f"  {label:<28} {elapsed * 1000:9.1f} ms")
+    return out, elapsed
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=200_000)
+    ap.add_argument("--csv", help="exchange corporate-action CSV to use instead of synthetic rows")
+    args = ap.parse_args()
+
+    rows = load_csv(args.csv) if args.csv else list(sample_rows(args.rows))
+    purposes = [r.get("Purpose", "") for r in rows]
+    companies = [r.get("Company Name", "") for r in rows]
+    dates = [r.get("Ex Date") for r in rows]
+
+    print(f"{len(rows)} rows")
+
+    checks = [
+        ("split_purpose_and_value", purposes,
+         legacy_split_purpose_and_value, fast.split_purpose_and_value),
+        ("normalize_purpose", purposes,
+         legacy_normalize_purpose, fast.normalize_purpose),
+        ("normalize_company", companies,
+         legacy_normalize_company, fast.normalize_company),
+    ]
+
+    for name, values, old, new in checks:
+        print(name)
+        expected, t_old = timed("legacy", lambda: [old(v) for v in values])
+        got, t_new = timed("compiled + memoized", lambda: [new(v) for v in values])
+        assert got == expected, f"{name}: output differs"
+        print(f"  speedup x{t_old / t_new:.1f}")
+
+    print("parse_date")
+    expected, t_old = timed("legacy", lambda: [legacy_parse_date(v) for v in dates])
+    got, t_new = timed("memoized scalar", lambda: [fast.parse_date(v) for v in dates])
+    assert got == expected, "parse_date: output differs"
+    print(f"  speedup x{t_old / t_new:.1f}")
+
+    print("outputs identical")
+
+
+if __name__ == "__main__":
+    main()
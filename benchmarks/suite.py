@@ -0,0 +1,279 @@
+"""
+Baseline benchmark: uploads and hot reads against a scratch database.
+
+Loads the synthetic files from benchmarks.synthetic through the real
+upload endpoints, then hits the read endpoints the site leans on. Runs
+in-process (FastAPI TestClient) against the PostgreSQL named by the usual
+DB_* variables, with S3 replaced by moto. For every case it records
+
+    ingest   rows, seconds, rows/sec, queries
+    reads    p50 / p99 latency, queries per request (from Server-Timing)
+
+plus the peak RSS of the process, and writes them as JSON. Given a
+previous run as --baseline, it exits 1 when a case is more than
+--tolerance slower (or issues more queries) than before.
+
+The suite writes to the database, so it refuses to run unless DB_NAME
+looks like a scratch database ("bench" or "test" in the name) or --force
+is given.
+
+    createdb investlive_bench
+    DB_NAME=investlive_bench python -m benchmarks.suite --out baseline.json
+    DB_NAME=investlive_bench python -m benchmarks.suite --baseline baseline.json
+
+Needs moto (pip install "moto[s3]").
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import resource
+import sys
+import time
+from datetime import date
+
+from benchmarks import synthetic
+from benchmarks.webhook_replay import percentile
+
+
+_SERVER_TIMING_QUERIES = re.compile(r'db;dur=[\d.]+;desc="(\d+) queries"')
+
+
+def queries(response) -> int:
+    match = _SERVER_TIMING_QUERIES.search(response.headers.get("server-timing", ""))
+    return int(match.group(1)) if match else 0
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if platform.system() == "Darwin" else peak / 1024
+
+
+# -----------------------------
+# ENVIRONMENT
+# -----------------------------
+def prepare_env(force: bool):
+    os.environ.setdefault("S3_BUCKET", "investlive-bench")
+    os.environ.setdefault("AWS_REGION", "ap-south-1")
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+    os.environ.setdefault("PRELOAD_HEAVY_MODULES", "0")
+
+    name = os.getenv("DB_NAME", "")
+    if not force and not ("bench" in name or "test" in name):
+        sys.exit(f"DB_NAME={name!r} does not look like a scratch database; use --force to run anyway")
+
+
+def mock_s3():
+    try:
+        import moto
+    except ImportError:
+        sys.exit('moto is required for the S3 stand-in: pip install "moto[s3]"')
+
+    # moto 5 folded the per-service mocks into mock_aws
+    mock = moto.mock_aws() if hasattr(moto, "mock_aws") else moto.mock_s3()
+    mock.start()
+
+    import boto3
+    region = os.environ["AWS_REGION"]
+    boto3.client("s3", region_name=region).create_bucket(
+        Bucket=os.environ["S3_BUCKET"],
+        CreateBucketConfiguration={"LocationConstraint": region},
+    )
+    return mock
+
+
+def app_client():
+    import app.init_db  # noqa: F401  (creates / migrates tables on import)
+    from fastapi.testclient import TestClient
+    from app.main import app
+    return TestClient(app)
+
+
+# -----------------------------
+# INGEST
+# -----------------------------
+def ingest_cases(u: synthetic.Universe):
+    day = u.day.isoformat()
+    return [
+        ("heatmap.company", "/heatmap/upload/",
+         {"data_date": day, "data_type": "company"},
+         "file", "heatmap_company.csv", synthetic.heatmap_company(u)),
+        ("ipo", "/IPO/upload",
+         {"upload_date": day, "data_type": "ipo"},
+         "files", "ipo.csv", synthetic.ipo(u)),
+        ("stockpulse", "/stockpulse/upload",
+         {"data_date": day, "data_type": "stockpulse"},
+         "files", "stockpulse.csv", synthetic.stockpulse(u)),
+        ("corporate_actions", "/corporate-action/upload",
+         {"mkt_date": day},
+         "file", "corporate_actions.csv", synthetic.corporate_actions(u)),
+        ("pr_mvg", "/pricemoving/upload", {},
+         "file", "pr_mvg.csv", synthetic.pr_mvg(u)),
+        ("vol_mvg", "/volumemoving/upload", {},
+         "file", "vol_mvg.csv", synthetic.vol_mvg(u)),
+    ]
+
+
+def run_ingest(client, u: synthetic.Universe) -> dict:
+    results = {}
+    for name, path, form, field, filename, body in ingest_cases(u):
+        rows = body.count(b"\n") - (1 if name in ("ipo", "corporate_actions") else 0)
+
+        start = time.perf_counter()
+        r = client.post(path, data=form, files={field: (filename, body, "text/csv")})
+        elapsed = time.perf_counter() - start
+
+        if r.status_code >= 400:
+            raise SystemExit(f"{name}: upload failed ({r.status_code}) {r.text[:300]}")
+
+        results[name] = {
+            "rows": rows,
+            "seconds": round(elapsed, 3),
+            "rows_per_sec": round(rows / elapsed, 1),
+            "queries": queries(r),
+        }
+        print(f"  {name:<20} {rows:>8} rows {elapsed:8.2f}s {rows / elapsed:>10.0f} rows/s "
+              f"{queries(r):>6} queries")
+    return results
+
+
+# -----------------------------
+# HOT READS
+# -----------------------------
+def read_cases(u: synthetic.Universe):
+    top = min(u.companies, key=lambda c: c.rank)
+    word = top.short.split()[0]
+    return [
+        ("heatmap.search", f"/heatmap/company/data/?search={word}"),
+        ("heatmap.top_mcap", "/heatmap/company/top-mcap"),
+        ("heatmap.tree", "/heatmap/tree"),
+        ("heatmap.screener", "/heatmap/screener?q=MCAP%3E1000"),
+        ("heatmap.history", f"/heatmap/company/history/{top.isin}"),
+        ("search.companies", f"/search/companies?q={word[:3]}"),
+        ("ipo.latest", "/IPO/latest"),
+        ("stockpulse.latest", "/stockpulse/latest"),
+        ("stockpulse.hotstocks", "/stockpulse/hotstocks"),
+        ("corporate_action.actions", "/corporate-action/actions"),
+        ("pricemoving.graph", f"/pricemoving/graph/isin/{top.isin}"),
+        ("volumemoving.graph", f"/volumemoving/graph/isin/{top.isin}"),
+        ("dashboard.bootstrap", "/dashboard/bootstrap"),
+    ]
+
+
+def run_reads(client, u: synthetic.Universe, iterations: int) -> dict:
+    results = {}
+    for name, path in read_cases(u):
+        timings, counts, status = [], [], None
+        for _ in range(iterations):
+            start = time.perf_counter()
+            r = client.get(path)
+            timings.append((time.perf_counter() - start) * 1000)
+            counts.append(queries(r))
+            status = r.status_code
+
+        results[name] = {
+            "status": status,
+            "p50_ms": round(percentile(timings, 0.50), 2),
+            "p99_ms": round(percentile(timings, 0.99), 2),
+            "queries": max(counts),
+        }
+        print(f"  {name:<26} {status} p50={results[name]['p50_ms']:8.2f}ms "
+              f"p99={results[name]['p99_ms']:8.2f}ms {max(counts):>4} queries")
+    return results
+
+
+# -----------------------------
+# BASELINE
+# -----------------------------
+def regressions(current: dict, baseline: dict, tolerance: float) -> list:
+    found = []
+
+    def check(section, name, metric, higher_is_worse=True):
+        old = baseline.get(section, {}).get(name, {}).get(metric)
+        new = current[section][name].get(metric)
+        if not old or new is None:
+            return
+        ratio = new / old if higher_is_worse else old / new
+        if ratio > 1 + tolerance:
+            found.append(f"{section}.{name}.{metric}: {old} -> {new}")
+
+    for name in current["ingest"]:
+        check("ingest", name, "rows_per_sec", higher_is_worse=False)
+    for name in current["reads"]:
+        check("reads", name, "p50_ms")
+        check("reads", name, "p99_ms")
+
+    for section in ("ingest", "reads"):
+        for name, values in current[section].items():
+            old = baseline.get(section, {}).get(name, {}).get("queries")
+            if old is not None and values["queries"] > old:
+                found.append(f"{section}.{name}.queries: {old} -> {values['queries']}")
+
+    old_rss = baseline.get("peak_rss_mb")
+    if old_rss and current["peak_rss_mb"] > old_rss * (1 + tolerance):
+        found.append(f"peak_rss_mb: {old_rss} -> {current['peak_rss_mb']}")
+
+    return found
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--companies", type=int, default=5000)
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--iterations", type=int, default=50, help="requests per read endpoint")
+    ap.add_argument("--out", help="write results to this JSON file")
+    ap.add_argument("--baseline", help="previous results to compare against")
+    ap.add_argument("--tolerance", type=float, default=0.25)
+    ap.add_argument("--force", action="store_true", help="run against any DB_NAME")
+    args = ap.parse_args()
+
+    prepare_env(args.force)
+    mock = mock_s3()
+    try:
+        client = app_client()
+
+        # the upload parser's column list must match the generator's
+        from app.routes.heatmap import COLUMN_MAP
+        assert COLUMN_MAP["company"] == synthetic.HEATMAP_COMPANY_COLUMNS
+
+        u = synthetic.Universe(args.companies, args.seed)
+        print(f"{args.companies} companies, seed {args.seed}")
+
+        print("ingest")
+        ingest = run_ingest(client, u)
+        print(f"reads ({args.iterations} each)")
+        reads = run_reads(client, u, args.iterations)
+    finally:
+        mock.stop()
+
+    results = {
+        "date": date.today().isoformat(),
+        "companies": args.companies,
+        "seed": args.seed,
+        "iterations": args.iterations,
+        "ingest": ingest,
+        "reads": reads,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+    print(f"peak RSS {results['peak_rss_mb']} MB")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        found = regressions(results, baseline, args.tolerance)
+        for line in found:
+            print(f"REGRESSION {line}")
+        if found:
+            sys.exit(1)
+        print(f"no regressions beyond {args.tolerance:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+"""
+Synthetic upload files, shaped like the real ones.
+
+Every generator takes a Universe - one seeded set of listed companies, so
+ISINs, symbols and codes line up across datasets the way they do in
+production - and returns the bytes the upload endpoint expects:
+
+    heatmap_company   50 columns, no header        POST /heatmap/upload/
+    ipo               47 columns, header row       POST /IPO/upload
+    stockpulse        33 columns (col 31 unused)   POST /stockpulse/upload
+    corporate_actions exchange CSV with headers    POST /corporate-action/upload
+    pr_mvg            10 columns, one trading day  POST /pricemoving/upload
+    vol_mvg           6 columns, one trading day   POST /volumemoving/upload
+
+Same seed, same bytes.
+
+    python -m benchmarks.synthetic out/ --companies 5000
+"""
+import argparse
+import csv
+import io
+import os
+import random
+from datetime import date, timedelta
+
+
+WORDS = ["Tata", "Reliance", "Infosys", "Bharat", "Adani", "Hindustan", "Mahindra",
+         "Bajaj", "Godrej", "Shree", "Sun", "Asian", "United", "National", "Indo",
+         "Power", "Steel", "Motors", "Finance", "Industries", "Chemicals", "Textiles",
+         "Pharma", "Cements", "Foods", "Energy", "Paints", "Auto", "Infra", "Labs"]
+
+SECTORS = [("S01", "Banks"), ("S02", "IT"), ("S03", "Pharma"), ("S04", "Auto"),
+           ("S05", "FMCG"), ("S06", "Metals"), ("S07", "Energy"), ("S08", "Cement"),
+           ("S09", "Chemicals"), ("S10", "Textiles"), ("S11", "Realty"), ("S12", "Telecom")]
+
+HOUSES = ["Tata", "Reliance", "Adani", "Birla", "Bajaj", "Mahindra", "Godrej", "Murugappa",
+          "TVS", "Hinduja", "Wadia", "RPG"] + [""] * 12
+
+PURPOSES = ["Dividend - Rs 2.50 Per Share", "Interim Dividend - Rs 10 Per Share",
+            "Final Dividend - Rs 1.20 Per Share", "Bonus 1:1", "Bonus issue 2 : 1",
+            "Stock  Split From Rs.10/- to Rs.2/-", "Rights 1:9 @ Premium 91",
+            "Buy Back of Shares", "Annual General Meeting", "Interest Payment"]
+
+# app/services/datasets.py "heatmap.company"; the suite checks they still match
+HEATMAP_COMPANY_COLUMNS = [
+    "ID", "RANK", "COMPANY", "MCAP", "DAYCHCR", "CH", "FFLOAT", "FFRNK",
+    "WKCHCR", "WKCH", "MTHCHCR", "MTHCH", "QTRCHCR", "QTRCH",
+    "HYCHCR", "HYCH", "YRCHCR", "YRCH", "CMP", "PCL", "CH_RS",
+    "CH_PER", "OPEN", "HIGH", "LOW", "CLOSE", "VOL", "VALUE",
+    "TRADE", "ISIN", "SEC_ID", "ISCCODE", "INDUSTRY", "IND_RNK",
+    "IH_MCODE", "IH_MNAME", "HOU_RNK", "COMPANY_NAME", "BSE",
+    "NSE", "INDEX_STK", "RONW", "ROCE", "EPS", "CEPS", "P_E",
+    "P_CE", "DIV", "YLD", "DEBT_EQ",
+]
+
+IPO_COLUMNS = [
+    "ISIN", "CO_NAME", "IBR_NAME", "ISS_OPEN", "ISS_CLOSE", "ALLOTMENT_DATE", "REFUND_DT",
+    "DEMAT_DT", "TRADING_DT", "HIGH", "LOW", "OFF_PRICE", "FACE_VALUE", "ISS_AMT",
+    "ISS_QTY", "LISTED_PR", "LISTED_GAIN", "LISTED_DT", "MKT_LOT", "SUBS_TIMES", "EXCH",
+    "ISS_TYPE", "OFFER_TYPE", "OFFER_OBJECTIVE", "STATE", "SIGNED_BY", "INDUSTRY",
+    "LM1", "LM2", "LM3", "LM4", "LM5", "LM6", "LM7", "LM8", "LM9", "LM10", "LM11", "LM12",
+    "LM13", "LM14", "LM15", "MKTMKR1", "MKTMKR2", "MKTMKR3", "MKTMKR4", "MKTMKR5",
+]
+
+CORPORATE_ACTION_COLUMNS = [
+    "Security Code", "Security Name", "Company Name", "SERIES", "Ex Date", "Purpose",
+    "Record Date", "BC Start Date", "BC End Date", "ND Start Date", "ND End Date",
+    "Actual Payment Date", "FACE VALUE",
+]
+
+
+class Company:
+    __slots__ = ("rank", "isin", "short", "name", "nse", "bse", "cocode",
+                 "sector", "industry", "house", "mcap", "cmp")
+
+
+class Universe:
+
+    def __init__(self, size: int = 5000, seed: int = 7, day: date = date(2024, 1, 2)):
+        self.seed = seed
+        self.day = day
+        rnd = random.Random(seed)
+
+        self.companies = []
+        for i in range(size):
+            c = Company()
+            words = rnd.sample(WORDS, 2)
+            c.short = " ".join(words)[:20] + (f" {i}" if i >= len(WORDS) ** 2 // 2 else "")
+            c.name = f"{' '.join(words)} {rnd.choice(['Ltd', 'Limited', 'Industries Ltd'])}"
+            c.isin = f"INE{i:06d}{rnd.randrange(100):02d}{rnd.randrange(10)}"
+            c.nse = (words[0][:4] + words[1][:4]).upper()[:7] + f"{i % 1000:03d}"
+            c.bse = str(500000 + i)
+            c.cocode = f"{i:06d}"
+            c.sector = rnd.choice(SECTORS)
+            c.industry = f"{c.sector[0]}I{rnd.randrange(1, 6)}"
+            c.house = rnd.choice(HOUSES)
+            # market caps are roughly log-normal: a few giants, a long tail
+            c.mcap = round(rnd.lognormvariate(7, 2), 2)
+            c.cmp = round(rnd.lognormvariate(5, 1.2), 2)
+            self.companies.append(c)
+
+        for rank, c in enumerate(sorted(self.companies, key=lambda c: -c.mcap), 1):
+            c.rank = rank
+
+    def rng(self, name: str) -> random.Random:
+        """An independent, reproducible stream per generator."""
+        return random.Random(f"{self.seed}:{name}")
+
+
+def _csv(rows, header=None) -> bytes:
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator="\n")
+    if header:
+        writer.writerow(header)
+    writer.writerows(rows)
+    return out.getvalue().encode()
+
+
+def _maybe(rnd, value, missing=0.03):
+    return "" if rnd.random() < missing else value
+
+
+# -----------------------------
+# GENERATORS
+# -----------------------------
+def heatmap_company(u: Universe) -> bytes:
+    rnd = u.rng("heatmap_company")
+    rows = []
+
+    for i, c in enumerate(u.companies, 1):
+        ch = [round(rnd.gauss(0, s), 1) for s in (1.5, 3, 6, 10, 15, 25)]
+        cr = [round(c.mcap * p / (100 + p), 2) for p in ch]
+        pcl = round(c.cmp / (1 + ch[0] / 100), 2)
+        high = round(max(c.cmp, pcl) * (1 + rnd.random() / 50), 2)
+        low = round(min(c.cmp, pcl) * (1 - rnd.random() / 50), 2)
+        vol = round(rnd.lognormvariate(11, 2) / 1e5, 3)
+        eps = round(c.cmp / rnd.uniform(5, 80), 2)
+
+        values = {
+            "ID": i, "RANK": c.rank, "COMPANY": c.short, "MCAP": c.mcap,
+            "DAYCHCR": cr[0], "CH": ch[0],
+            "FFLOAT": round(c.mcap * rnd.uniform(0.2, 0.9), 2), "FFRNK": c.rank,
+            "WKCHCR": cr[1], "WKCH": ch[1], "MTHCHCR": cr[2], "MTHCH": ch[2],
+            "QTRCHCR": cr[3], "QTRCH": ch[3], "HYCHCR": cr[4], "HYCH": ch[4],
+            "YRCHCR": cr[5], "YRCH": ch[5],
+            "CMP": c.cmp, "PCL": pcl, "CH_RS": round(c.cmp - pcl, 2), "CH_PER": ch[0],
+            "OPEN": pcl, "HIGH": high, "LOW": low, "CLOSE": c.cmp,
+            "VOL": vol, "VALUE": round(vol * c.cmp, 3), "TRADE": rnd.randrange(10, 200000),
+            "ISIN": c.isin, "SEC_ID": c.sector[0], "ISCCODE": c.industry,
+            "INDUSTRY": f"{c.sector[1]} {c.industry[-2:]}", "IND_RNK": rnd.randrange(1, 200),
+            "IH_MCODE": round(rnd.random() * 1000, 6) if c.house else "",
+            "IH_MNAME": c.house, "HOU_RNK": rnd.randrange(1, 100) if c.house else "",
+            "COMPANY_NAME": c.name, "BSE": c.bse, "NSE": c.nse,
+            "INDEX_STK": 1 if c.rank <= 500 else 0,
+            "RONW": _maybe(rnd, round(rnd.gauss(14, 8), 2)),
+            "ROCE": _maybe(rnd, round(rnd.gauss(16, 9), 2)),
+            "EPS": eps, "CEPS": round(eps * rnd.uniform(1, 1.6), 2),
+            "P_E": _maybe(rnd, round(c.cmp / eps, 2) if eps else ""),
+            "P_CE": _maybe(rnd, round(rnd.uniform(3, 60), 2)),
+            "DIV": _maybe(rnd, round(rnd.uniform(0, 40), 2), 0.3),
+            "YLD": _maybe(rnd, round(rnd.uniform(0, 5), 2), 0.3),
+            "DEBT_EQ": _maybe(rnd, round(rnd.uniform(0, 3), 2)),
+        }
+        rows.append([values[col] for col in HEATMAP_COMPANY_COLUMNS])
+
+    return _csv(rows)
+
+
+def ipo(u: Universe, rows: int = 2500) -> bytes:
+    rnd = u.rng("ipo")
+    managers = [f"{w} Capital" for w in WORDS[:20]]
+    out = []
+
+    for c in rnd.sample(u.companies, min(rows, len(u.companies))):
+        opened = u.day - timedelta(days=rnd.randrange(30, 365 * 15))
+        price = round(rnd.uniform(10, 1500))
+        listed = round(price * rnd.uniform(0.7, 2.2), 2)
+        lms = rnd.sample(managers, rnd.randrange(1, 6))
+        values = {
+            "ISIN": c.isin, "CO_NAME": c.name, "IBR_NAME": f"{rnd.choice(WORDS)} Registry",
+            "ISS_OPEN": opened, "ISS_CLOSE": opened + timedelta(days=3),
+            "ALLOTMENT_DATE": opened + timedelta(days=6), "REFUND_DT": opened + timedelta(days=7),
+            "DEMAT_DT": opened + timedelta(days=7), "TRADING_DT": opened + timedelta(days=8),
+            "HIGH": price, "LOW": round(price * 0.95), "OFF_PRICE": price, "FACE_VALUE": 10,
+            "ISS_AMT": round(rnd.lognormvariate(6, 1.3), 2),
+            "ISS_QTY": rnd.randrange(10 ** 5, 10 ** 8),
+            "LISTED_PR": listed, "LISTED_GAIN": round((listed / price - 1) * 100, 2),
+            "LISTED_DT": opened + timedelta(days=8), "MKT_LOT": rnd.choice([1, 10, 25, 50, 100]),
+            "SUBS_TIMES": round(rnd.lognormvariate(2, 1.5), 2),
+            "EXCH": rnd.choice(["NSE,BSE", "NSE", "BSE"]),
+            "ISS_TYPE": rnd.choice(["Book Building", "Fixed Price"]),
+            "OFFER_TYPE": rnd.choice(["Fresh Issue", "Offer for Sale", "Fresh Issue + OFS"]),
+            "OFFER_OBJECTIVE": "Capital expenditure and general corporate purposes",
+            "STATE": rnd.choice(["Maharashtra", "Gujarat", "Karnataka", "Delhi", "Tamil Nadu"]),
+            "SIGNED_BY": "Managing Director", "INDUSTRY": c.sector[1],
+        }
+        for n in range(1, 16):
+            values[f"LM{n}"] = lms[n - 1] if n <= len(lms) else ""
+        for n in range(1, 6):
+            values[f"MKTMKR{n}"] = ""
+
+        out.append([
+            v.isoformat() if isinstance(v, date) else v
+            for v in (values[col] for col in IPO_COLUMNS)
+        ])
+
+    return _csv(out, IPO_COLUMNS)
+
+
+def stockpulse(u: Universe) -> bytes:
+    rnd = u.rng("stockpulse")
+    rows = []
+
+    def some_date(days):
+        return (u.day - timedelta(days=rnd.randrange(days))).isoformat()
+
+    for c in u.companies:
+        cmp = c.cmp
+        dma = [round(cmp * rnd.uniform(0.8, 1.2), 2) for _ in range(4)]
+        vol = rnd.randrange(1000, 10 ** 7)
+        dvma = [round(vol * rnd.uniform(0.5, 1.5)) for _ in range(4)]
+        rows.append([
+            c.bse, c.nse, c.cocode, c.isin, 10, cmp, *dma,
+            round(cmp * 1.3, 2), some_date(365), round(cmp * 0.7, 2), some_date(365),
+            vol, *dvma,
+            vol * 3, some_date(365), vol // 4, some_date(365),
+            round(cmp * 2, 2), some_date(3650), round(cmp * 0.3, 2), some_date(3650),
+            round(cmp * 2.5, 2), some_date(3650), round(cmp * 0.2, 2), some_date(3650),
+            "",  # column 31: present in the exchange file, dropped on upload
+            rnd.choice([0, 20, 40, 60, 80, 100]),
+        ])
+
+    return _csv(rows)
+
+
+def corporate_actions(u: Universe, rows: int = 20000) -> bytes:
+    rnd = u.rng("corporate_actions")
+    out = []
+
+    def some_date():
+        return rnd.choice(["", "-", (u.day + timedelta(days=rnd.randrange(-400, 60))).strftime("%d-%b-%y")])
+
+    for _ in range(rows):
+        c = rnd.choice(u.companies)
+        ex = u.day + timedelta(days=rnd.randrange(-400, 60))
+        out.append([
+            c.bse, c.nse, c.name, rnd.choice(["EQ", "EQ", "EQ", "BE", "SM"]),
+            ex.strftime("%d-%b-%y"), rnd.choice(PURPOSES),
+            (ex + timedelta(days=1)).strftime("%d-%b-%y"),
+            some_date(), some_date(), some_date(), some_date(), some_date(),
+            rnd.choice(["1", "2", "5", "10"]),
+        ])
+
+    return _csv(out, CORPORATE_ACTION_COLUMNS)
+
+
+def pr_mvg(u: Universe, day: date = None) -> bytes:
+    day = day or u.day
+    rnd = u.rng(f"pr_mvg:{day}")
+    rows = []
+
+    for c in u.companies:
+        cmp = round(c.cmp * rnd.uniform(0.9, 1.1), 2)
+        rows.append([
+            c.bse, c.short[:30], c.cocode, c.isin, cmp,
+            *(round(cmp * rnd.uniform(0.85, 1.15), 2) for _ in range(4)),
+            day.isoformat(),
+        ])
+
+    return _csv(rows)
+
+
+def vol_mvg(u: Universe, day: date = None) -> bytes:
+    day = day or u.day
+    rnd = u.rng(f"vol_mvg:{day}")
+    rows = [
+        [c.bse, c.short[:30], c.cocode, c.isin, rnd.randrange(1000, 10 ** 7), day.strftime("%d-%m-%Y")]
+        for c in u.companies
+    ]
+    return _csv(rows)
+
+
+FILES = {
+    "heatmap_company.csv": heatmap_company,
+    "ipo.csv": ipo,
+    "stockpulse.csv": stockpulse,
+    "corporate_actions.csv": corporate_actions,
+    "pr_mvg.csv": pr_mvg,
+    "vol_mvg.csv": vol_mvg,
+}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("out_dir")
+    ap.add_argument("--companies", type=int, default=5000)
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    u = Universe(args.companies, args.seed)
+    os.makedirs(args.out_dir, exist_ok=True)
+
+    for name, generate in FILES.items():
+        data = generate(u)
+        with open(os.path.join(args.out_dir, name), "wb") as f:
+            f.write(data)
+        lines = data.count(b"\n")
+        print(f"  {name:<24} {lines:>8} lines {len(data) / 1024:>10.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
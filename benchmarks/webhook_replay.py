@@ -0,0 +1,138 @@
+"""
+Replay harness: Razorpay webhook retry storms.
+
+Signs synthetic payment.captured / payment.failed bodies with the webhook
+secret and posts them to a running server, re-sending every event
+--retries times from --concurrency threads (the way Razorpay bursts
+retries). Prints latency percentiles split into first deliveries and
+duplicates.
+
+    uvicorn app.main:app &
+    python -m benchmarks.webhook_replay --order-id order_XXXX
+    python -m benchmarks.webhook_replay --events 200 --retries 20 --concurrency 32
+
+Events for unknown order ids are still logged (and deduplicated), so the
+harness can be pointed at an empty database.
+"""
+import argparse
+import hashlib
+import hmac
+import json
+import os
+import random
+import statistics
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from uuid import uuid4
+
+
+def build_event(order_id: str, failed: bool = False):
+    event = "payment.failed" if failed else "payment.captured"
+
+    body = json.dumps({
+        "entity": "event",
+        "event": event,
+        "payload": {
+            "payment": {
+                "entity": {
+                    "id": f"pay_{uuid4().hex[:14]}",
+                    "order_id": order_id,
+                    "status": "failed" if failed else "captured",
+                }
+            }
+        },
+        "created_at": int(time.time()),
+    }).encode()
+
+    return f"evt_{uuid4().hex[:14]}", body
+
+
+def sign(body: bytes, secret: str) -> str:
+    return hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def post(url: str, event_id: str, body: bytes, signature: str):
+    req = urllib.request.Request(
+        url,
+        data=body,
+        method="POST",
+        headers={
+            "Content-Type": "application/json",
+            "X-Razorpay-Signature": signature,
+            "X-Razorpay-Event-Id": event_id,
+        },
+    )
+
+    start = time.perf_counter()
+    with urllib.request.urlopen(req) as resp:
+        result = json.loads(resp.read())
+    return time.perf_counter() - start, result.get("duplicate", False)
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def report(name, timings):
+    if not timings:
+        return
+    ms = [t * 1000 for t in timings]
+    print(
+        f"{name:<12} n={len(ms):<6} "
+        f"mean={statistics.mean(ms):7.2f}ms "
+        f"p50={percentile(ms, 0.50):7.2f}ms "
+        f"p95={percentile(ms, 0.95):7.2f}ms "
+        f"p99={percentile(ms, 0.99):7.2f}ms"
+    )
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--url", default="http://127.0.0.1:8000/webhook/razorpay")
+    ap.add_argument("--secret", default=os.getenv("RAZORPAY_WEBHOOK_SECRET", ""))
+    ap.add_argument("--order-id", action="append", help="existing razorpay order id (repeatable)")
+    ap.add_argument("--events", type=int, default=50)
+    ap.add_argument("--retries", type=int, default=10, help="deliveries per event")
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--failed-ratio", type=float, default=0.1)
+    args = ap.parse_args()
+
+    if not args.secret:
+        ap.error("--secret or RAZORPAY_WEBHOOK_SECRET is required")
+
+    order_ids = args.order_id or [f"order_{uuid4().hex[:14]}" for _ in range(args.events)]
+
+    deliveries = []
+    for i in range(args.events):
+        event_id, body = build_event(
+            order_ids[i % len(order_ids)],
+            failed=random.random() < args.failed_ratio
+        )
+        signature = sign(body, args.secret)
+        deliveries.extend([(event_id, body, signature)] * args.retries)
+
+    random.shuffle(deliveries)
+
+    first, duplicate = [], []
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        for elapsed, is_duplicate in pool.map(lambda d: post(args.url, *d), deliveries):
+            (duplicate if is_duplicate else first).append(elapsed)
+    wall = time.perf_counter() - start
+
+    print(f"{len(deliveries)} deliveries ({args.events} events x {args.retries}) in {wall:.2f}s "
+          f"-> {len(deliveries) / wall:.0f} req/s")
+    report("applied", first)
+    report("duplicate", duplicate)
+
+    if len(first) != args.events:
+        print(f"WARNING: {len(first)} deliveries applied, expected exactly {args.events}")
+
+
+if __name__ == "__main__":
+    main()